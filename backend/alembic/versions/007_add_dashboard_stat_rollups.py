@@ -0,0 +1,32 @@
+"""add dashboard stat rollups
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows are seeded lazily by the dashboard on first read
+    op.create_table(
+        'dashboard_stat_rollups',
+        sa.Column('metric', sa.String(length=100), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('period_start', sa.DateTime(), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('metric')
+    )
+
+
+def downgrade():
+    op.drop_table('dashboard_stat_rollups')
@@ -0,0 +1,59 @@
+"""add careerbot session message counters
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Add denormalized sidebar columns
+    op.add_column('careerbot_sessions', sa.Column('message_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('careerbot_sessions', sa.Column('last_message_preview', sa.String(length=255), nullable=True))
+    
+    # Backfill message counts
+    op.execute("""
+        UPDATE careerbot_sessions cs
+        SET message_count = counts.message_count
+        FROM (
+            SELECT session_id, COUNT(*) AS message_count
+            FROM careerbot_conversations
+            GROUP BY session_id
+        ) counts
+        WHERE counts.session_id = cs.id
+    """)
+    
+    # Backfill preview from the latest message of each session
+    op.execute("""
+        UPDATE careerbot_sessions cs
+        SET last_message_preview = LEFT(latest.message, 255)
+        FROM (
+            SELECT DISTINCT ON (session_id) session_id, message
+            FROM careerbot_conversations
+            ORDER BY session_id, created_at DESC, id DESC
+        ) latest
+        WHERE latest.session_id = cs.id
+    """)
+    
+    # Sidebar query: WHERE user_id = ? ORDER BY last_message_at DESC
+    op.create_index(
+        'ix_careerbot_sessions_user_id_last_message_at',
+        'careerbot_sessions',
+        ['user_id', sa.text('last_message_at DESC')],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_careerbot_sessions_user_id_last_message_at', table_name='careerbot_sessions')
+    op.drop_column('careerbot_sessions', 'last_message_preview')
+    op.drop_column('careerbot_sessions', 'message_count')
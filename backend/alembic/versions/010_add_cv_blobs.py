@@ -0,0 +1,38 @@
+"""add cv blobs
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cv_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('storage_key', sa.String(length=500), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False, server_default='application/pdf'),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('sha256')
+    )
+
+    # Existing PDFs keep their on-disk path and are served as before until re-uploaded
+    op.add_column('user_resumes', sa.Column('cv_pdf_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_user_resumes_cv_pdf_sha256'), 'user_resumes', ['cv_pdf_sha256'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_user_resumes_cv_pdf_sha256'), table_name='user_resumes')
+    op.drop_column('user_resumes', 'cv_pdf_sha256')
+    op.drop_table('cv_blobs')
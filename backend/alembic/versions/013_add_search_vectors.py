@@ -0,0 +1,63 @@
+"""add full-text search vectors
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+# table -> (column, weight) pairs, as in models.*_SEARCH_FIELDS
+SEARCH_FIELDS = {
+    'courses': (('title', 'A'), ('platform', 'B'), ('description', 'C')),
+    'jobs': (('title', 'A'), ('company_name', 'B'), ('description', 'C'), ('requirements', 'C')),
+    'local_opportunities': (
+        ('title', 'A'), ('organization', 'B'), ('target_track', 'B'), ('category', 'B'), ('description', 'C')
+    ),
+}
+
+
+def _document(fields, row=''):
+    return ' || '.join(
+        f"setweight(to_tsvector('english', coalesce({row}{column}, '')), '{weight}')"
+        for column, weight in fields
+    )
+
+
+def upgrade():
+    for table, fields in SEARCH_FIELDS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {_document(fields, 'NEW.')};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {', '.join(column for column, _ in fields)} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+        """)
+
+        # Backfill existing rows, then index
+        op.execute(f"UPDATE {table} SET search_vector = {_document(fields)}")
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], postgresql_using='gin')
+
+
+def downgrade():
+    for table in SEARCH_FIELDS:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_trigger ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+        op.drop_column(table, 'search_vector')
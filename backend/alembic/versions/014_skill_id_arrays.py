@@ -0,0 +1,132 @@
+"""store skill lists as jsonb arrays of skill ids
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19
+
+"""
+import json
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+# (table, column, catalog whose ETags must change)
+SKILL_COLUMNS = (
+    ('jobs', 'required_skills', 'jobs'),
+    ('courses', 'related_skills', 'courses'),
+    ('local_opportunities', 'required_skills', None),
+    ('user_resumes', 'skills', None),
+)
+
+
+def _parse(value):
+    """Old values: JSON arrays of ids and/or names, or comma-separated strings"""
+    try:
+        parsed = json.loads(value)
+        return parsed if isinstance(parsed, list) else [parsed]
+    except (json.JSONDecodeError, TypeError):
+        return value.split(',')
+
+
+def _skill_id(conn, skills, value):
+    """Map an old list entry to a skill id, creating skills for unknown names"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int) or str(value).strip().isdigit():
+        skill_id = int(value)
+        return skill_id if skill_id in skills['ids'] else None
+
+    name = str(value).strip()
+    if not name:
+        return None
+    if name.lower() not in skills['by_name']:
+        slug = base_slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'skill'
+        counter = 1
+        while slug in skills['slugs']:
+            slug = f"{base_slug}-{counter}"
+            counter += 1
+        skill_id = conn.execute(
+            sa.text(
+                "INSERT INTO skills (name, slug, category, description, is_active) "
+                "VALUES (:name, :slug, 'Other', :description, true) RETURNING id"
+            ),
+            {'name': name, 'slug': slug, 'description': f"Imported from catalog skill lists: {name}"}
+        ).scalar()
+        skills['by_name'][name.lower()] = skill_id
+        skills['ids'].add(skill_id)
+        skills['slugs'].add(slug)
+        skills['created'] += 1
+    return skills['by_name'][name.lower()]
+
+
+def upgrade():
+    conn = op.get_bind()
+    is_postgres = conn.dialect.name == 'postgresql'
+
+    rows = conn.execute(sa.text("SELECT id, name, slug FROM skills")).fetchall()
+    skills = {
+        'ids': {row[0] for row in rows},
+        'by_name': {row[1].lower(): row[0] for row in rows},
+        'slugs': {row[2] for row in rows},
+        'created': 0,
+    }
+
+    for table, column, _ in SKILL_COLUMNS:
+        # Normalize in Python first: names become ids, unknown ids are dropped
+        normalized = []
+        for row_id, value in conn.execute(
+            sa.text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")
+        ).fetchall():
+            ids = []
+            for entry in _parse(value):
+                skill_id = _skill_id(conn, skills, entry)
+                if skill_id is not None and skill_id not in ids:
+                    ids.append(skill_id)
+            normalized.append({'row_id': row_id, 'value': json.dumps(ids) if ids else None})
+
+        if is_postgres:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING NULL")
+            update = f"UPDATE {table} SET {column} = CAST(:value AS JSONB) WHERE id = :row_id"
+        else:
+            update = f"UPDATE {table} SET {column} = :value WHERE id = :row_id"
+        if normalized:
+            conn.execute(sa.text(update), normalized)
+
+        if is_postgres:
+            op.create_index(
+                f'ix_{table}_{column}', table, [column],
+                postgresql_using='gin', postgresql_ops={column: 'jsonb_path_ops'}
+            )
+
+    # Serialized skill lists changed, so cached catalog responses are stale
+    catalogs = [catalog for _, _, catalog in SKILL_COLUMNS if catalog]
+    if skills['created']:
+        catalogs.append('skills')
+    for catalog in catalogs:
+        updated = conn.execute(
+            sa.text("UPDATE catalog_versions SET version = version + 1 WHERE name = :name"), {'name': catalog}
+        ).rowcount
+        if not updated:
+            conn.execute(sa.text("INSERT INTO catalog_versions (name, version) VALUES (:name, 1)"), {'name': catalog})
+
+    if skills['created']:
+        print(f"Created {skills['created']} skills for skill names that were not in the skills table")
+
+
+def downgrade():
+    conn = op.get_bind()
+    for table, column, _ in SKILL_COLUMNS:
+        if conn.dialect.name == 'postgresql':
+            op.drop_index(f'ix_{table}_{column}', table_name=table)
+            op.alter_column(
+                table, column, type_=sa.Text(), existing_type=postgresql.JSONB(),
+                postgresql_using=f'{column}::text'
+            )
@@ -0,0 +1,73 @@
+"""add composite and partial indexes for hot queries
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19
+
+Chosen from EXPLAIN plans of the hot queries (python -m benchmarks.query_plans):
+user_skills and admin lookups were sequential scans, CareerBot history pages
+sorted every message of the user, and the active job board sorted a bitmap scan.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    is_postgres = conn.dialect.name == 'postgresql'
+
+    # user_skills had no key; drop duplicate (user_id, skill_id) rows before adding one
+    if is_postgres:
+        op.execute("""
+            DELETE FROM user_skills a
+            USING user_skills b
+            WHERE a.ctid < b.ctid AND a.user_id = b.user_id AND a.skill_id = b.skill_id
+        """)
+    else:
+        op.execute("""
+            DELETE FROM user_skills
+            WHERE rowid NOT IN (SELECT MIN(rowid) FROM user_skills GROUP BY user_id, skill_id)
+        """)
+    op.create_index('ix_user_skills_user_id_skill_id', 'user_skills', ['user_id', 'skill_id'], unique=True)
+    op.create_index('ix_user_skills_skill_id', 'user_skills', ['skill_id'], unique=False)
+
+    # History pages: WHERE user_id = ? [AND session_id = ?] ORDER BY session_id, created_at, id
+    op.create_index(
+        'ix_careerbot_conversations_history',
+        'careerbot_conversations',
+        ['user_id', 'session_id', 'created_at', 'id'],
+        unique=False
+    )
+    # Both are prefixes of a composite index now
+    op.drop_index('ix_careerbot_conversations_user_id', table_name='careerbot_conversations')
+    op.drop_index('ix_careerbot_sessions_user_id', table_name='careerbot_sessions')
+
+    # Admin lookups: WHERE role = 'ADMIN'
+    op.create_index(
+        'ix_users_admin_id', 'users', ['id'], unique=False,
+        postgresql_where=sa.text("role = 'ADMIN'"), sqlite_where=sa.text("role = 'ADMIN'")
+    )
+
+    # Public job board and course catalog pages: WHERE is_active ORDER BY id
+    if is_postgres:
+        op.create_index('ix_jobs_active_id', 'jobs', ['id'], unique=False, postgresql_where=sa.text('is_active = true'))
+        op.create_index('ix_courses_active_id', 'courses', ['id'], unique=False, postgresql_where=sa.text('is_active = true'))
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_courses_active_id', table_name='courses')
+        op.drop_index('ix_jobs_active_id', table_name='jobs')
+    op.drop_index('ix_users_admin_id', table_name='users')
+    op.create_index('ix_careerbot_sessions_user_id', 'careerbot_sessions', ['user_id'], unique=False)
+    op.create_index('ix_careerbot_conversations_user_id', 'careerbot_conversations', ['user_id'], unique=False)
+    op.drop_index('ix_careerbot_conversations_history', table_name='careerbot_conversations')
+    op.drop_index('ix_user_skills_skill_id', table_name='user_skills')
+    op.drop_index('ix_user_skills_user_id_skill_id', table_name='user_skills')
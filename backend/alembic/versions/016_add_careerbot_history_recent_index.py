@@ -0,0 +1,31 @@
+"""add index for CareerBot history across sessions
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19
+
+History without a session_id is ordered by (created_at, id) across all of
+the user's sessions; ix_careerbot_conversations_history leads with
+session_id, so those pages would sort every message of the user.
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_careerbot_conversations_user_recent',
+        'careerbot_conversations',
+        ['user_id', 'created_at', 'id'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_careerbot_conversations_user_recent', table_name='careerbot_conversations')
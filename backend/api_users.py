@@ -60,7 +60,7 @@ async def get_current_user(authorization: Optional[str] = Header(None), db: Sess
 # ==================== Authentication Routes ====================
 
 @router.post("/register", response_model=UserLoginResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, db: Session = Depends(get_db)):
     """
     Register a new user
     
@@ -68,7 +68,7 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
         JWT token and user profile on success
     """
     # Register user
-    new_user = UserService.register_user(db, user_data)
+    new_user = await UserService.register_user(db, user_data)
     
     # Create access token
     access_token = create_access_token(
@@ -83,7 +83,7 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=UserLoginResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: Session = Depends(get_db)):
     """
     Authenticate user and return JWT token
     
@@ -91,7 +91,7 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
         JWT token and user profile on success
     """
     # Authenticate user
-    user = UserService.authenticate_user(db, credentials.email, credentials.password)
+    user = await UserService.authenticate_user(db, credentials.email, credentials.password)
     
     # Create access token
     access_token = create_access_token(
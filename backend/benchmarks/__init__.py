@@ -0,0 +1,16 @@
+"""
+Benchmarks for SkillSync backend hot paths
+
+End-to-end suite (HTTP scenarios, baselines, regression check):
+    python -m benchmarks --help
+
+Focused micro-benchmarks run as modules, e.g. `python -m benchmarks.opportunity_index`,
+`python -m benchmarks.serialization`, `python -m benchmarks.skill_index`,
+`python -m benchmarks.skill_extractor` or `python -m benchmarks.startup`
+
+Login flood (logins per second, 503 shedding, catalog latency during the flood):
+    python -m benchmarks.login_throughput
+
+Query-plan regression check (fails on sequential scans of hot queries):
+    python -m benchmarks.query_plans
+"""
@@ -0,0 +1,252 @@
+"""
+Benchmark fixtures
+Isolated environment, deterministic seed data and a stubbed Gemini client
+
+`configure_environment` must run before the app (or `database`) is
+imported, since the engine is created from DATABASE_URL at import time.
+"""
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+DEFAULT_DATABASE_URL = f"sqlite:///{Path(tempfile.gettempdir()) / 'skillsync_bench.db'}"
+BENCH_PASSWORD = "benchmark-password"
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+
+SKILLS = [
+    ("Python", "Programming"), ("JavaScript", "Programming"), ("React", "Frontend"),
+    ("Node.js", "Backend"), ("SQL", "Data"), ("PostgreSQL", "Data"), ("Machine Learning", "Data"),
+    ("Data Analysis", "Data"), ("Excel", "Business"), ("Communication", "Soft Skills"),
+    ("Graphic Design", "Design"), ("Figma", "Design"), ("Java", "Programming"), ("C++", "Programming"),
+    ("Digital Marketing", "Marketing"), ("Content Writing", "Marketing"), ("Customer Service", "Business"),
+    ("Accounting", "Finance"), ("Networking", "Infrastructure"), ("Linux", "Infrastructure"),
+    ("Docker", "Infrastructure"), ("Project Management", "Business"), ("Sales", "Business"),
+    ("Photoshop", "Design"), ("Django", "Backend"), ("Flutter", "Mobile"),
+]
+TRACKS = ["Frontend", "Backend", "Data Science", "Cybersecurity", "Design", "Marketing", "Finance"]
+GROUPS = ["All Youth", "Women", "Rural Youth", "Low-Income", None]
+
+
+def configure_environment(database_url: str = DEFAULT_DATABASE_URL, workdir: Optional[Path] = None) -> Path:
+    """
+    Point the app at the benchmark database and a scratch blob store.
+
+    Returns:
+        Scratch directory used for uploads
+    """
+    workdir = Path(workdir or tempfile.mkdtemp(prefix="skillsync_bench_"))
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["BLOB_STORE_BACKEND"] = "local"
+    os.environ["BLOB_STORE_ROOT"] = str(workdir / "uploads")
+    os.environ["BLOB_STAGING_DIR"] = str(workdir / "uploads" / "tmp")
+    # Only checked for presence; every model call goes to the stub below
+    os.environ["GEMINI_API_KEY"] = "benchmark"
+    return workdir
+
+
+def reset_database(database_url: str):
+    """Start from an empty database (deletes the SQLite file, drops all tables otherwise)"""
+    if database_url.startswith("sqlite:///"):
+        path = Path(database_url[len("sqlite:///"):])
+        if path.exists():
+            path.unlink()
+        return
+
+    from sqlalchemy import text
+    from database import Base, engine
+    import models  # noqa: F401  (registers every table on Base.metadata)
+
+    Base.metadata.drop_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+
+# ==================== Gemini stub ====================
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubModel:
+    """Stands in for genai.GenerativeModel; answers by prompt type after a fixed delay"""
+
+    def __init__(self, name: str, latency: float):
+        self.name = name
+        self.latency = latency
+
+    def generate_content(self, contents, **kwargs):
+        prompt = contents[0] if isinstance(contents, list) else contents
+        if self.latency:
+            time.sleep(self.latency)
+        return StubResponse(_stub_reply(str(prompt)))
+
+
+class StubGenAI:
+    """Stands in for the configured google.generativeai module"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def GenerativeModel(self, name: str, **kwargs):
+        return StubModel(name, self.latency)
+
+    def upload_file(self, path):
+        return SimpleNamespace(name=f"files/{Path(path).name}")
+
+    def delete_file(self, name):
+        pass
+
+
+def _stub_reply(prompt: str) -> str:
+    if "Analyze the provided CV PDF" in prompt:
+        return json.dumps({
+            "personal_summary": "Data-minded developer with three years of backend experience.",
+            "experiences": [{
+                "title": "Backend Developer", "company": "Acme", "location": "Dhaka",
+                "start_date": "2022", "end_date": None, "current": True,
+                "description": "Built REST APIs and reporting pipelines.",
+            }],
+            "education": [{
+                "degree": "BSc", "institution": "State University", "field": "Computer Science",
+                "graduation_year": "2021", "gpa": None,
+            }],
+            "skills": ["Python", "SQL", "Docker"],
+            "tools": ["FastAPI", "PostgreSQL"],
+            "projects": [{"name": "Job board", "description": "Side project", "technologies": "React, FastAPI", "link": None}],
+        })
+    if "SCORING CRITERIA" in prompt:
+        return json.dumps({
+            "match_score": 72, "match_level": "good",
+            "matching_skills": ["Python"], "missing_skills": ["Docker"],
+            "skill_gaps": [{"skill": "Docker", "importance": "important", "learning_effort": "moderate"}],
+            "strengths": ["Backend experience"], "concerns": ["Limited DevOps exposure"],
+            "recommendation": "Apply after a short container course.",
+            "experience_match": "matches expectations", "career_alignment": 80,
+        })
+    return "Focus on one track, build two portfolio projects and apply to internships each week."
+
+
+def install_llm_stub(latency_ms: float = 0.0):
+    """Route every Gemini call to the stub (simulating `latency_ms` per call)"""
+    from services import gemini_service
+
+    gemini_service._genai = StubGenAI(latency_ms / 1000)
+    gemini_service._models.clear()
+
+
+# ==================== Seed data ====================
+
+def seed(virtual_users: int, courses: int = 300, jobs: int = 30, opportunities: int = 2000,
+         messages_per_session: int = 40, seed_value: int = 42) -> List[Dict]:
+    """
+    Insert a deterministic catalog and one account per virtual user.
+
+    Each user has skills, a career track, a structured CV and one CareerBot
+    session with `messages_per_session` messages.
+
+    Returns:
+        [{"id", "email", "session_id"}] for each benchmark user
+    """
+    from auth import get_password_hash
+    from database import SessionLocal
+    from models import (
+        User, UserRole, Skill, Course, Job, LocalOpportunity, UserResume,
+        CareerBotSession, CareerBotConversation, user_skills
+    )
+
+    rng = random.Random(seed_value)
+    db = SessionLocal()
+    try:
+        skills = [
+            Skill(name=name, slug=name.lower().replace(" ", "-").replace("+", "p").replace(".", ""),
+                  category=category, description=f"{name} fundamentals and practice")
+            for name, category in SKILLS
+        ]
+        db.add_all(skills)
+        db.flush()
+        skill_ids = [skill.id for skill in skills]
+        skill_names = [skill.name for skill in skills]
+
+        db.add_all(
+            Course(
+                title=f"{rng.choice(skill_names)} course {i}", platform=rng.choice(["YouTube", "Coursera", "Udemy"]),
+                url=f"https://courses.example.com/{i}", cost_type=rng.choice(["free", "paid"]),
+                description="Hands-on lessons with projects and quizzes. " * 3,
+                related_skills=rng.sample(skill_ids, 2),
+                enrollment_count=rng.randint(0, 500), views_count=rng.randint(0, 5000),
+            )
+            for i in range(courses)
+        )
+        db.add_all(
+            Job(
+                title=f"{rng.choice(TRACKS)} developer {i}", company_name=f"Company {i % 17}",
+                description="Work with a small product team on customer-facing features.",
+                requirements="Two years of experience", job_type="full-time", location="Dhaka",
+                experience_level=rng.choice(["entry", "mid", "senior"]),
+                required_skills=rng.sample(skill_ids, 3),
+            )
+            for i in range(jobs)
+        )
+        db.add_all(
+            LocalOpportunity(
+                title=f"{rng.choice(TRACKS)} program {i}", organization=f"Organization {i % 40}",
+                description="Paid training with mentoring and a placement track.",
+                location=rng.choice(["Dhaka", "Chittagong", "Sylhet", "Khulna"]),
+                category=rng.choice(["Internship", "Training", "Job", "Youth Program"]),
+                target_track=rng.choice(TRACKS), required_skills=rng.sample(skill_ids, 3),
+                priority_group=rng.choice(GROUPS),
+            )
+            for i in range(opportunities)
+        )
+
+        # One bcrypt hash shared by every account keeps seeding fast
+        hashed_password = get_password_hash(BENCH_PASSWORD)
+        accounts = []
+        for n in range(virtual_users):
+            user = User(
+                email=f"user{n}@{BENCH_EMAIL_DOMAIN}", username=f"benchuser{n}",
+                full_name=f"Bench User {n}", hashed_password=hashed_password, role=UserRole.STUDENT,
+                is_active=True, is_verified=True, bio="Aspiring developer",
+                career_interests=json.dumps([rng.choice(TRACKS)]),
+                experience_description="Internship and two freelance projects",
+            )
+            db.add(user)
+            db.flush()
+
+            own_skills = rng.sample(skill_ids, 5)
+            db.execute(user_skills.insert(), [
+                {"user_id": user.id, "skill_id": skill_id, "proficiency_level": "intermediate"}
+                for skill_id in own_skills
+            ])
+            db.add(UserResume(
+                user_id=user.id, personal_summary="Backend developer",
+                experiences=json.dumps([{"title": "Intern", "company": "Acme", "current": False}]),
+                education=json.dumps([{"degree": "BSc", "institution": "State University"}]),
+                skills=own_skills, tools=json.dumps(["Git"]), projects=json.dumps([]),
+            ))
+
+            session = CareerBotSession(
+                user_id=user.id, title="Career planning",
+                message_count=messages_per_session, last_message_preview="Keep going"
+            )
+            db.add(session)
+            db.flush()
+            db.add_all(
+                CareerBotConversation(
+                    user_id=user.id, session_id=session.id, role="user" if m % 2 == 0 else "bot",
+                    message=f"Message {m} about interviews, portfolios and next steps.", language="en"
+                )
+                for m in range(messages_per_session)
+            )
+            accounts.append({"id": user.id, "email": user.email, "session_id": session.id})
+
+        db.commit()
+        return accounts
+    finally:
+        db.close()
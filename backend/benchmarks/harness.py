@@ -0,0 +1,190 @@
+"""
+Benchmark harness
+Runs a scenario with a fixed number of concurrent virtual users, reports
+throughput and latency percentiles, and compares results with a JSON baseline
+"""
+import asyncio
+import json
+import math
+import platform
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# A scenario regresses when p95 latency grows, or throughput drops, by more than this fraction
+DEFAULT_REGRESSION_THRESHOLD = 0.15
+# Latency changes smaller than this are treated as noise (milliseconds)
+MIN_LATENCY_DELTA_MS = 1.0
+
+BASELINE_FORMAT_VERSION = 1
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[float], errors: int, elapsed: float) -> Dict:
+    """
+    Summarize per-request latencies (milliseconds).
+
+    Args:
+        samples: Latency of every measured request
+        errors: Requests that failed or returned an unexpected status
+        elapsed: Wall-clock duration of the measured phase (seconds)
+    """
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 1) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+    }
+
+
+async def run_scenario(scenario, client, users: List, iterations: int, concurrency: int, warmup: int) -> Dict:
+    """
+    Run one scenario: `warmup` unmeasured requests, then `iterations`
+    measured requests spread over `concurrency` virtual users.
+
+    Args:
+        scenario: Scenario to run (see benchmarks.scenarios)
+        client: httpx.AsyncClient bound to the app
+        users: Seeded benchmark users, one per virtual user
+        iterations: Number of measured requests
+        concurrency: Number of requests in flight at a time
+        warmup: Number of unmeasured requests sent first
+
+    Returns:
+        Summary dict (see `summarize`)
+    """
+    for i in range(warmup):
+        await scenario.request(client, users[i % len(users)], i)
+
+    samples: List[float] = []
+    errors = 0
+    counter = iter(range(iterations))
+
+    async def virtual_user(user):
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            failure = None
+            try:
+                response = await scenario.request(client, user, i)
+                if response.status_code not in scenario.expected_status:
+                    failure = f"unexpected status {response.status_code}: {response.text[:200]}"
+            except Exception as e:
+                failure = f"request failed: {e}"
+            samples.append((time.perf_counter() - start) * 1000)
+            if failure:
+                errors += 1
+                # Report the first failure only, the count shows up in the summary
+                if errors == 1:
+                    print(f"{scenario.name}: {failure}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(users[n % len(users)]) for n in range(concurrency)))
+    return summarize(samples, errors, time.perf_counter() - start)
+
+
+def environment_info(database_url: str, options: Dict) -> Dict:
+    """Describe the machine and settings a result was produced with"""
+    return {
+        "format": BASELINE_FORMAT_VERSION,
+        "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "database": database_url.split(":", 1)[0],
+        **options,
+    }
+
+
+def save_baseline(path: Path, meta: Dict, results: Dict[str, Dict]):
+    """Write results as a JSON baseline (merging into an existing file's scenarios)"""
+    scenarios = {}
+    if path.exists():
+        scenarios = json.loads(path.read_text()).get("scenarios", {})
+    scenarios.update(results)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"meta": meta, "scenarios": scenarios}, indent=2, sort_keys=True) + "\n")
+
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def compare(results: Dict[str, Dict], baseline: Dict, threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict]:
+    """
+    Compare results with a baseline.
+
+    Returns:
+        One entry per scenario present in both, with the relative change in
+        p95 latency and throughput and whether it counts as a regression
+    """
+    report = []
+    for name, current in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+
+        p95_change = _relative_change(previous["p95_ms"], current["p95_ms"])
+        throughput_change = _relative_change(previous["throughput_rps"], current["throughput_rps"])
+        latency_regressed = (
+            p95_change > threshold
+            and current["p95_ms"] - previous["p95_ms"] > MIN_LATENCY_DELTA_MS
+        )
+        throughput_regressed = throughput_change < -threshold
+        new_errors = current["errors"] > previous.get("errors", 0)
+
+        report.append({
+            "scenario": name,
+            "p95_ms": [previous["p95_ms"], current["p95_ms"]],
+            "p95_change": round(p95_change, 3),
+            "throughput_rps": [previous["throughput_rps"], current["throughput_rps"]],
+            "throughput_change": round(throughput_change, 3),
+            "regression": latency_regressed or throughput_regressed or new_errors,
+        })
+    return report
+
+
+def _relative_change(before: float, after: float) -> float:
+    if not before:
+        return 0.0
+    return (after - before) / before
+
+
+def format_results(results: Dict[str, Dict]) -> str:
+    """Render results as a fixed-width table"""
+    header = f"{'scenario':<38}{'req':>6}{'err':>5}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    lines = [header, "-" * len(header)]
+    for name, r in results.items():
+        lines.append(
+            f"{name:<38}{r['requests']:>6}{r['errors']:>5}{r['throughput_rps']:>9.1f}"
+            f"{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(report: List[Dict]) -> str:
+    """Render a baseline comparison as a fixed-width table"""
+    header = f"{'scenario':<38}{'p95 before':>12}{'p95 after':>12}{'p95 %':>8}{'rps %':>8}  status"
+    lines = [header, "-" * len(header)]
+    for entry in report:
+        lines.append(
+            f"{entry['scenario']:<38}{entry['p95_ms'][0]:>12.2f}{entry['p95_ms'][1]:>12.2f}"
+            f"{entry['p95_change'] * 100:>+8.1f}{entry['throughput_change'] * 100:>+8.1f}"
+            f"  {'REGRESSION' if entry['regression'] else 'ok'}"
+        )
+    return "\n".join(lines)
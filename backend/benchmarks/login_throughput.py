@@ -0,0 +1,135 @@
+"""
+Login throughput benchmark
+Floods POST /api/users/login for a fixed time and reports successful logins
+per second, attempts shed with 503, and the latency of catalog requests sent
+during the flood (the routes a login spike used to starve)
+
+Login clients honour Retry-After after a 503, like a well-behaved client.
+
+Usage (from backend/):
+    python -m benchmarks.login_throughput [--duration 10] [--logins 32] [--probes 4]
+    python -m benchmarks.login_throughput --workers 0     # hash in the threadpool
+    python -m benchmarks.login_throughput --rounds 10     # BCRYPT_ROUNDS
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks import fixtures
+from benchmarks.harness import percentile
+
+PROBE_PATH = "/api/courses"
+
+
+async def flood(args) -> Dict:
+    import httpx
+    import main
+
+    async with main.app.router.lifespan_context(main.app):
+        accounts = fixtures.seed(args.logins)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+
+            async def login(account):
+                return await client.post(
+                    "/api/users/login", json={"email": account["email"], "password": fixtures.BENCH_PASSWORD}
+                )
+
+            # Warm up: the worker processes and the catalog cache
+            (await login(accounts[0])).raise_for_status()
+            (await client.get(PROBE_PATH)).raise_for_status()
+
+            logins: List[float] = []
+            probes: List[float] = []
+            counts = {"shed": 0, "login_errors": 0, "probe_errors": 0}
+            deadline = time.perf_counter() + args.duration
+
+            async def login_client(account):
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = await login(account)
+                    if response.status_code == 200:
+                        logins.append((time.perf_counter() - start) * 1000)
+                    elif response.status_code == 503:
+                        counts["shed"] += 1
+                        await asyncio.sleep(float(response.headers.get("retry-after", "1")))
+                    else:
+                        counts["login_errors"] += 1
+
+            async def probe_client():
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = await client.get(PROBE_PATH)
+                    if response.status_code == 200:
+                        probes.append((time.perf_counter() - start) * 1000)
+                    else:
+                        counts["probe_errors"] += 1
+                    await asyncio.sleep(args.probe_interval_ms / 1000)
+
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(login_client(account) for account in accounts),
+                *(probe_client() for _ in range(args.probes))
+            )
+            elapsed = time.perf_counter() - start
+
+    logins.sort()
+    probes.sort()
+    return {
+        "workers": int(os.environ["PASSWORD_HASH_WORKERS"]),
+        "bcrypt_rounds": int(os.environ["BCRYPT_ROUNDS"]),
+        "logins": len(logins),
+        "logins_per_second": round(len(logins) / elapsed, 2),
+        "login_p50_ms": round(percentile(logins, 50), 1),
+        "login_p95_ms": round(percentile(logins, 95), 1),
+        "shed_503": counts["shed"],
+        "login_errors": counts["login_errors"],
+        "probe_requests": len(probes),
+        "probe_p50_ms": round(percentile(probes, 50), 1),
+        "probe_p95_ms": round(percentile(probes, 95), 1),
+        "probe_errors": counts["probe_errors"],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.login_throughput", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of login flood")
+    parser.add_argument("--logins", type=int, default=32, help="Concurrent login clients (one account each)")
+    parser.add_argument("--probes", type=int, default=4, help=f"Concurrent clients polling GET {PROBE_PATH}")
+    parser.add_argument("--probe-interval-ms", type=float, default=50.0, help="Pause between probe requests")
+    parser.add_argument("--workers", type=int, help="PASSWORD_HASH_WORKERS (default: CPU count, 0 = threadpool)")
+    parser.add_argument("--rounds", type=int, help="BCRYPT_ROUNDS (default: 12)")
+    parser.add_argument("--database-url", default=fixtures.DEFAULT_DATABASE_URL)
+    parser.add_argument("--reset", action="store_true", help="Drop all tables first (non-SQLite databases)")
+    parser.add_argument("--output", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    # Read at import time by auth and the hash service
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers if args.workers is not None else os.cpu_count() or 1)
+    if args.rounds is not None:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ.setdefault("BCRYPT_ROUNDS", "12")
+
+    from benchmarks.__main__ import prepare_database
+
+    fixtures.configure_environment(args.database_url)
+    prepare_database(args.database_url, args.reset)
+
+    results = asyncio.run(flood(args))
+    width = max(len(key) for key in results)
+    print("\n".join(f"{key:<{width}}  {value}" for key, value in results.items()))
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(json.dumps(results, indent=2) + "\n")
+    return 1 if results["login_errors"] or results["probe_errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
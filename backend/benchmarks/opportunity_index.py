@@ -0,0 +1,118 @@
+"""
+Opportunity matching benchmark
+Compares the legacy per-request scan with the inverted OpportunityIndex
+
+Usage (from backend/):
+    python -m benchmarks.opportunity_index [--opportunities 50000] [--queries 200]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+from services.opportunity_index import OpportunityIndex, OPPORTUNITY_TOP_K
+
+SKILLS = [
+    "Python", "JavaScript", "React", "Node.js", "SQL", "PostgreSQL", "Machine Learning",
+    "Data Analysis", "Excel", "Communication", "Graphic Design", "Figma", "Java", "C++",
+    "Digital Marketing", "Content Writing", "Customer Service", "Accounting", "Networking",
+    "Linux", "Docker", "Project Management", "Sales", "Photoshop", "Django", "Flutter",
+]
+TRACKS = ["Frontend", "Backend", "Data Science", "Cybersecurity", "Design", "Marketing", "Finance", None]
+GROUPS = ["All Youth", "Women", "Rural Youth", "Low-Income", None]
+
+
+def make_opportunities(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        SimpleNamespace(
+            id=i,
+            is_active=rng.random() > 0.1,
+            target_track=rng.choice(TRACKS),
+            required_skills=json.dumps(rng.sample(SKILLS, rng.randint(1, 5))),
+            priority_group=rng.choice(GROUPS),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_users(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        ([{"id": None, "name": name} for name in rng.sample(SKILLS, rng.randint(1, 6))], rng.choice(TRACKS))
+        for _ in range(count)
+    ]
+
+
+def legacy_filter(opportunities, user_skills, user_track):
+    """The pre-index algorithm: json.loads + nested substring scan on every request"""
+    user_skill_names = [skill["name"].lower() for skill in user_skills]
+    filtered = []
+    for opp in opportunities:
+        if not opp.is_active:
+            continue
+        track_match = bool(user_track and opp.target_track) and (
+            user_track.lower() in opp.target_track.lower() or opp.target_track.lower() in user_track.lower()
+        )
+        skill_match = False
+        for req_skill in json.loads(opp.required_skills):
+            req_skill_str = str(req_skill).lower()
+            if any(s in req_skill_str or req_skill_str in s for s in user_skill_names):
+                skill_match = True
+                break
+        if track_match or skill_match:
+            filtered.append(opp)
+    return filtered or [opp for opp in opportunities if opp.is_active]
+
+
+def _timed(fn, runs):
+    samples = []
+    result = None
+    for args in runs:
+        start = time.perf_counter()
+        result = fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, result
+
+
+def _summary(samples):
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+    }
+
+
+def run(opportunities: int = 50000, queries: int = 200) -> dict:
+    data = make_opportunities(opportunities)
+    users = make_users(queries)
+
+    start = time.perf_counter()
+    index = OpportunityIndex(data)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    legacy_samples, legacy_result = _timed(lambda s, t: legacy_filter(data, s, t), users)
+    index_samples, _ = _timed(lambda s, t: index.search(s, t, limit=OPPORTUNITY_TOP_K), users)
+
+    return {
+        "opportunities": opportunities,
+        "queries": queries,
+        "index_build_ms": round(build_ms, 1),
+        "legacy_scan": {**_summary(legacy_samples), "results_per_query": len(legacy_result)},
+        "indexed_top_k": {**_summary(index_samples), "results_per_query": OPPORTUNITY_TOP_K},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--opportunities", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(run(args.opportunities, args.queries), indent=2))
+
+
+if __name__ == "__main__":
+    main()
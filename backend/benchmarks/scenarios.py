@@ -0,0 +1,150 @@
+"""
+Benchmark scenarios
+One scenario per hot path, each issuing real HTTP requests against the app
+
+A scenario's `request(client, user, i)` sends the i-th request as a
+benchmark user ({"headers", "email", "session_id", ...}). `setup`, if set,
+runs once before the warmup (e.g. to upload the PDF the parse scenario reads).
+"""
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.fixtures import BENCH_PASSWORD
+
+# Size of the generated CV PDFs (bytes)
+CV_PDF_SIZE = 256 * 1024
+
+
+class Scenario:
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        request: Callable[..., Awaitable],
+        expected_status: Tuple[int, ...] = (200,),
+        max_iterations: Optional[int] = None,
+        setup: Optional[Callable[..., Awaitable]] = None
+    ):
+        """
+        Args:
+            name: Scenario name used on the command line and in baselines
+            description: One-line description for --list
+            request: async (client, user, i) -> httpx.Response
+            expected_status: Status codes that count as success
+            max_iterations: Cap on measured requests (for very slow paths)
+            setup: async (client, users) -> None, run once before the warmup
+        """
+        self.name = name
+        self.description = description
+        self.request = request
+        self.expected_status = expected_status
+        self.max_iterations = max_iterations
+        self.setup = setup
+
+
+def make_pdf(tag: str, size: int = CV_PDF_SIZE) -> bytes:
+    """A PDF-looking payload whose bytes differ per tag (so uploads aren't deduplicated)"""
+    header = f"%PDF-1.4\n% skillsync benchmark {tag}\n".encode()
+    filler = b"% " + b"x" * 78 + b"\n"
+    return header + filler * ((size - len(header)) // len(filler)) + b"%%EOF\n"
+
+
+# ==================== Requests ====================
+
+async def login(client, user, i):
+    return await client.post("/api/users/login", json={"email": user["email"], "password": BENCH_PASSWORD})
+
+
+def _get(path: str):
+    async def request(client, user, i):
+        return await client.get(path, headers=user["headers"])
+    return request
+
+
+def _revalidate(path: str):
+    """GET with the ETag of a previous response, as a browser cache would"""
+    etags: Dict[str, str] = {}
+
+    async def request(client, user, i):
+        if path not in etags:
+            etags[path] = (await client.get(path)).headers.get("etag", "")
+        return await client.get(path, headers={"If-None-Match": etags[path]})
+    return request
+
+
+async def careerbot_ask(client, user, i):
+    return await client.post("/api/careerbot/ask", headers=user["headers"], json={
+        "message": "Which skills should I learn next to get a backend internship?",
+        "session_id": user["session_id"],
+    })
+
+
+async def careerbot_history(client, user, i):
+    return await client.get(
+        "/api/careerbot/history", headers=user["headers"],
+        params={"session_id": user["session_id"], "limit": 50}
+    )
+
+
+async def cv_upload(client, user, i):
+    pdf = make_pdf(f"{user['id']}-{i}")
+    return await client.post(
+        "/api/cv/pdf", headers=user["headers"],
+        files={"file": ("cv.pdf", pdf, "application/pdf")}
+    )
+
+
+async def _upload_initial_cvs(client, users: List[Dict]):
+    for user in users:
+        await cv_upload(client, user, -1)
+
+
+async def cv_parse(client, user, i):
+    return await client.post("/api/cv/pdf/parse", headers=user["headers"])
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("login", "POST /api/users/login (bcrypt verify + JWT)", login, max_iterations=50),
+    Scenario("catalog_courses", "GET /api/courses", _get("/api/courses")),
+    Scenario("catalog_skills", "GET /api/skills", _get("/api/skills")),
+    Scenario("catalog_jobs", "GET /api/jobs", _get("/api/jobs")),
+    Scenario(
+        "catalog_courses_revalidate", "GET /api/courses with a matching If-None-Match",
+        _revalidate("/api/courses"), expected_status=(304,)
+    ),
+    Scenario("careerbot_ask", "POST /api/careerbot/ask (stubbed LLM)", careerbot_ask),
+    Scenario("careerbot_history", "GET /api/careerbot/history, 50 messages of one session", careerbot_history),
+    Scenario("careerbot_sessions", "GET /api/careerbot/sessions", _get("/api/careerbot/sessions")),
+    Scenario(
+        "job_recommendations", "GET /api/job-recommendations (one stubbed LLM call per job)",
+        _get("/api/job-recommendations?limit=5"), max_iterations=50
+    ),
+    Scenario(
+        "opportunity_recommendations", "GET /api/opportunities/recommend (explanation cache hit)",
+        _get("/api/opportunities/recommend")
+    ),
+    Scenario(
+        "opportunity_recommendations_refresh", "GET /api/opportunities/recommend?refresh=true (stubbed LLM)",
+        _get("/api/opportunities/recommend?refresh=true")
+    ),
+    Scenario("cv_upload", "POST /api/cv/pdf, 256 KB PDF, new content every request", cv_upload),
+    Scenario(
+        "cv_parse", "POST /api/cv/pdf/parse (stubbed LLM)", cv_parse,
+        setup=_upload_initial_cvs
+    ),
+]
+
+
+def get_scenarios(names: Optional[List[str]] = None) -> List[Scenario]:
+    """
+    Select scenarios by name (all when `names` is empty).
+
+    Raises:
+        ValueError: If a name is unknown
+    """
+    if not names:
+        return list(SCENARIOS)
+    by_name = {scenario.name: scenario for scenario in SCENARIOS}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {', '.join(unknown)}")
+    return [by_name[name] for name in names]
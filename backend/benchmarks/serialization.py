@@ -0,0 +1,116 @@
+"""
+List serialization benchmark
+Compares the response_model path (ORM objects -> validate -> dicts -> json)
+with the row-tuple TypeAdapter path used by the catalog list endpoints,
+and reports bytes on the wire uncompressed, gzipped and (if installed) brotli
+
+Usage (from backend/):
+    python -m benchmarks.serialization [--rows 100 1000] [--repeat 50]
+"""
+import argparse
+import gzip
+import json
+import statistics
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import Course
+from responses import list_adapter, response_columns, serialize_rows, GZIP_COMPRESS_LEVEL
+from schemas import CourseResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def make_session(rows: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    now = datetime.utcnow()
+    session.add_all([
+        Course(
+            title=f"Course number {i}",
+            platform="YouTube",
+            url=f"https://www.youtube.com/watch?v=course{i:06d}",
+            cost_type="free" if i % 3 else "paid",
+            description="A practical introduction with hands-on projects and exercises. " * 3,
+            thumbnail_url=f"https://img.example.com/thumbs/{i}.jpg",
+            related_skills=json.dumps([i % 40 + 1, i % 17 + 1]),
+            enrollment_count=i * 3,
+            views_count=i * 11,
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(rows)
+    ])
+    session.commit()
+    return session
+
+
+def legacy_path(session, rows: int) -> bytes:
+    """What FastAPI does for `response_model=list[CourseResponse]` returning ORM objects"""
+    courses = session.query(Course).limit(rows).all()
+    adapter = list_adapter(CourseResponse)
+    content = adapter.dump_python(adapter.validate_python(courses, from_attributes=True), mode="json")
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    session.expunge_all()
+    return body
+
+
+def fast_path(session, rows: int) -> bytes:
+    """Row tuples of the response columns straight into TypeAdapter.dump_json"""
+    result = session.query(*response_columns(CourseResponse, Course)).limit(rows).all()
+    return serialize_rows(CourseResponse, result)
+
+
+def _time(fn, session, rows: int, repeat: int):
+    samples = []
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(session, rows)
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3), body
+
+
+def run(row_counts=(100, 1000), repeat: int = 50) -> dict:
+    results = {}
+    for rows in row_counts:
+        session = make_session(rows)
+        legacy_ms, legacy_body = _time(legacy_path, session, rows, repeat)
+        fast_ms, fast_body = _time(fast_path, session, rows, repeat)
+        assert json.loads(legacy_body) == json.loads(fast_body)
+
+        wire = {
+            "identity_bytes": len(fast_body),
+            "gzip_bytes": len(gzip.compress(fast_body, compresslevel=GZIP_COMPRESS_LEVEL)),
+        }
+        if brotli is not None:
+            wire["brotli_bytes"] = len(brotli.compress(fast_body))
+
+        results[str(rows)] = {
+            "response_model_p50_ms": legacy_ms,
+            "row_adapter_p50_ms": fast_ms,
+            **wire,
+        }
+        session.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Skill extractor benchmark
+Times compiling a SkillExtractor over a synthetic catalog and scanning
+synthetic CVs of a given length for skill mentions
+
+Usage (from backend/):
+    python -m benchmarks.skill_extractor [--skills 20000] [--pages 20] [--runs 20]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from benchmarks.skill_index import WORDS, make_skills
+from services.skill_aliases import SKILL_SYNONYM_GROUPS
+from services.skill_extractor import SkillExtractor
+
+# Roughly one page of CV text
+WORDS_PER_PAGE = 500
+
+FILLER = [
+    "the", "and", "with", "for", "team", "project", "built", "led", "improved", "customers", "reports",
+    "using", "in", "of", "a", "to", "daily", "responsible", "delivered", "2019", "2023", "-", "•", "(", ")",
+]
+
+
+def make_cv(skills, pages: int, seed: int = 3) -> str:
+    """CV-like text where about one word in ten starts a skill name or alias"""
+    rng = random.Random(seed)
+    aliases = [alias for group in SKILL_SYNONYM_GROUPS for alias in group]
+    words = []
+    while len(words) < pages * WORDS_PER_PAGE:
+        roll = rng.random()
+        if roll < 0.05:
+            words.append(rng.choice(skills).name)
+        elif roll < 0.1:
+            words.append(rng.choice(aliases).upper() if rng.random() < 0.5 else rng.choice(aliases))
+        elif roll < 0.3:
+            words.append(rng.choice(WORDS))
+        else:
+            words.append(rng.choice(FILLER))
+        if rng.random() < 0.08:
+            words.append(".\n")
+    return " ".join(words)
+
+
+def run(skills: int = 20000, pages: int = 20, runs: int = 20) -> dict:
+    data = make_skills(skills)
+    text = make_cv(data, pages)
+
+    start = time.perf_counter()
+    extractor = SkillExtractor(data)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        found = extractor.extract_text(text)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "skills": skills,
+        "pages": pages,
+        "characters": len(text),
+        "runs": runs,
+        "compile_ms": round(build_ms, 1),
+        "skills_found": len(found),
+        "mentions_found": sum(skill["count"] for skill in found),
+        "scan_ms": {
+            "p50": round(statistics.median(samples), 2),
+            "max": round(max(samples), 2),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skills", type=int, default=20000)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.skills, args.pages, args.runs), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Skill autocomplete benchmark
+Times building a SkillIndex over a synthetic catalog and the prefix searches
+a typeahead sends as the user types
+
+Usage (from backend/):
+    python -m benchmarks.skill_index [--skills 20000] [--queries 500]
+"""
+import argparse
+import json
+import random
+import statistics
+import string
+import time
+from types import SimpleNamespace
+
+from services.skill_aliases import SKILL_SYNONYM_GROUPS
+from services.skill_index import SkillIndex
+
+WORDS = [
+    "data", "machine", "learning", "web", "design", "cloud", "security", "network", "mobile", "game",
+    "analysis", "engineering", "marketing", "content", "writing", "management", "testing", "automation",
+    "development", "visualization", "accounting", "sales", "support", "research", "architecture",
+]
+
+
+def make_skills(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    names = {group[0].title() for group in SKILL_SYNONYM_GROUPS}
+    while len(names) < count:
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        suffix = "".join(rng.choice(string.ascii_lowercase) for _ in range(3))
+        names.add(" ".join(words).title() + f" {suffix}")
+    return [
+        SimpleNamespace(id=i, name=name, slug=f"skill-{i}", category="Other")
+        for i, name in enumerate(sorted(names), start=1)
+    ]
+
+
+def make_queries(skills, count: int, seed: int = 7):
+    """Prefixes of 1-6 characters of random skill names and aliases, as typed"""
+    rng = random.Random(seed)
+    aliases = [alias for group in SKILL_SYNONYM_GROUPS for alias in group[1:]]
+    queries = []
+    for _ in range(count):
+        source = rng.choice(aliases) if rng.random() < 0.2 else rng.choice(skills).name
+        queries.append(source[:rng.randint(1, 6)])
+    return queries
+
+
+def _summary(samples):
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1], 4),
+        "max_ms": round(ordered[-1], 4),
+    }
+
+
+def run(skills: int = 20000, queries: int = 500) -> dict:
+    data = make_skills(skills)
+    typed = make_queries(data, queries)
+
+    start = time.perf_counter()
+    index = SkillIndex(data)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for query in typed:
+        start = time.perf_counter()
+        index.search(query, limit=10)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "skills": skills,
+        "queries": queries,
+        "index_build_ms": round(build_ms, 1),
+        "search_top_10": _summary(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skills", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps(run(args.skills, args.queries), indent=2))
+
+
+if __name__ == "__main__":
+    main()
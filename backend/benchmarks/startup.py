@@ -0,0 +1,81 @@
+"""
+Startup benchmark
+Measures cold application start in fresh interpreters: importing `main`,
+running the lifespan startup (schema revision check, background writers)
+and serving the first request
+
+Usage (from backend/):
+    python -m benchmarks.startup [--runs 5] [--database-url sqlite:////tmp/skillsync_bench.db]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Runs inside a fresh interpreter and prints one JSON line of timings
+_PROBE = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+client.__enter__()
+started = time.perf_counter()
+response = client.get("/")
+first_request = time.perf_counter()
+client.__exit__(None, None, None)
+import sys
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "lifespan_startup_ms": (started - imported) * 1000,
+    "first_request_ms": (first_request - started) * 1000,
+    "total_ms": (first_request - start) * 1000,
+    "status": response.status_code,
+    "gemini_sdk_loaded": "google.generativeai" in sys.modules,
+}))
+"""
+
+
+def run_once(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int = 5, database_url: str = None) -> dict:
+    env = dict(os.environ)
+    if database_url:
+        env["DATABASE_URL"] = database_url
+
+    samples = [run_once(env) for _ in range(runs)]
+    summary = {
+        key: round(statistics.median(sample[key] for sample in samples), 1)
+        for key in ("import_ms", "lifespan_startup_ms", "first_request_ms", "total_ms")
+    }
+    summary["runs"] = runs
+    summary["gemini_sdk_loaded"] = any(sample["gemini_sdk_loaded"] for sample in samples)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", default=None, help="Defaults to DATABASE_URL from the environment")
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.database_url), indent=2))
+
+
+if __name__ == "__main__":
+    main()
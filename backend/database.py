@@ -1,23 +1,253 @@
 """
 Database configuration and session management for SkillSync
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from fastapi import Header
+from fastapi.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from pathlib import Path
+from typing import Dict, List, Optional
+import itertools
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
+from pool_metrics import DEFAULT_POOL_NAME, MeteredNullPool, MeteredQueuePool
+
 load_dotenv()
 
 # Database URL from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://myuser:mypassword@db:5432/nutrimap")
 
+# Create all tables and stamp the Alembic head when the database is empty
+DB_AUTO_CREATE = os.getenv("DB_AUTO_CREATE", "true").lower() in ("1", "true", "yes")
+# Refuse to start when the schema is not at the Alembic head revision
+DB_REQUIRE_CURRENT_SCHEMA = os.getenv("DB_REQUIRE_CURRENT_SCHEMA", "false").lower() in ("1", "true", "yes")
+
+ALEMBIC_DIR = Path(__file__).resolve().parent / "alembic"
+
+# Connection pool: connections kept open, and extra connections allowed under load
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Seconds a request waits for a free connection before failing
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Replace connections older than this many seconds (-1 keeps them forever)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Test each connection on checkout, so a database restart doesn't fail requests with dead connections
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# Postgres cancels statements running longer than this (milliseconds, 0 disables)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+# Behind PgBouncer in transaction pooling mode: no session state (the statement
+# timeout is set per transaction instead of per connection) and no server-side
+# prepared statements
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+# Open a new connection for every checkout and leave pooling to PgBouncer
+DB_NULL_POOL = os.getenv("DB_NULL_POOL", "false").lower() in ("1", "true", "yes")
+
+
+def engine_options(database_url: str, pool_name: str = DEFAULT_POOL_NAME) -> dict:
+    """
+    Keyword arguments for create_engine() from the DB_* pool settings.
+
+    Args:
+        database_url: Database URL the engine connects to
+        pool_name: Name the pool's metrics are reported under
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}  # In-memory SQLite keeps its single-connection pool
+
+    options = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_logging_name": pool_name,
+    }
+    if DB_NULL_POOL:
+        options["poolclass"] = MeteredNullPool
+    else:
+        options.update({
+            "poolclass": MeteredQueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        })
+
+    if url.get_backend_name() == "postgresql":
+        connect_args = {}
+        if DB_STATEMENT_TIMEOUT_MS and not DB_PGBOUNCER:
+            # PgBouncer rejects startup options, see _set_transaction_statement_timeout
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+        if DB_PGBOUNCER and url.get_driver_name() == "psycopg":
+            # psycopg 3 prepares repeated statements; a prepared statement may not
+            # exist on the server connection PgBouncer picks for the next transaction
+            connect_args["prepare_threshold"] = None
+        options["connect_args"] = connect_args
+    return options
+
+
+def create_database_engine(database_url: str, pool_name: str = DEFAULT_POOL_NAME) -> Engine:
+    """Create an engine with the configured pool, timeouts and PgBouncer settings"""
+    new_engine = create_engine(database_url, **engine_options(database_url, pool_name))
+    if DB_PGBOUNCER and DB_STATEMENT_TIMEOUT_MS and new_engine.dialect.name == "postgresql":
+        event.listen(new_engine, "begin", _set_transaction_statement_timeout)
+    return new_engine
+
+
+def _set_transaction_statement_timeout(connection):
+    # SET LOCAL lasts until the end of the transaction, so it never leaks into
+    # another client's transaction on the same PgBouncer server connection
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"SET LOCAL statement_timeout = {DB_STATEMENT_TIMEOUT_MS}")
+    finally:
+        cursor.close()
+
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
+engine = create_database_engine(DATABASE_URL)
 
 # Create SessionLocal class for database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# ==================== Read replicas ====================
+
+# Comma-separated replica URLs; get_read_db sessions go round-robin to the healthy ones
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# Seconds between health checks (connectivity and replication lag) of a replica
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))
+# Replicas further behind the primary than this many seconds are skipped
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "10"))
+# After a client's own write, its reads go to the primary for this many seconds
+DB_READ_YOUR_WRITES_WINDOW = float(os.getenv("DB_READ_YOUR_WRITES_WINDOW", "5"))
+
+# Seconds the replica is behind; 0 when it has replayed everything it received
+# (an idle primary leaves the last replay timestamp old) or is not a standby
+REPLICATION_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class ReadReplica:
+    """One replica engine and its last known health"""
+
+    def __init__(self, name: str, database_url: str):
+        self.name = name
+        self.engine = create_database_engine(database_url, pool_name=name)
+        self.healthy = True
+        self.checked_at = 0.0
+        self._check_lock = threading.Lock()
+
+    def is_healthy(self) -> bool:
+        """Health as of the last check, re-checked every DB_REPLICA_CHECK_INTERVAL seconds"""
+        if time.monotonic() - self.checked_at >= DB_REPLICA_CHECK_INTERVAL and self._check_lock.acquire(blocking=False):
+            try:
+                self._set_health(*self._check())
+            finally:
+                self._check_lock.release()
+        return self.healthy
+
+    def mark_down(self, reason: str):
+        """Skip this replica until the next health check"""
+        self._set_health(False, reason)
+
+    def _check(self):
+        try:
+            with self.engine.connect() as connection:
+                lag = 0.0
+                if connection.dialect.name == "postgresql":
+                    lag = float(connection.exec_driver_sql(REPLICATION_LAG_SQL).scalar() or 0)
+        except SQLAlchemyError as e:
+            return False, f"unreachable ({e.__class__.__name__})"
+        if lag > DB_REPLICA_MAX_LAG:
+            return False, f"{lag:.1f}s behind the primary"
+        return True, None
+
+    def _set_health(self, healthy: bool, reason: Optional[str]):
+        if healthy != self.healthy:
+            print(f"Read replica {self.name} is {'back in rotation' if healthy else 'out of rotation: ' + reason}")
+        self.healthy = healthy
+        self.checked_at = time.monotonic()
+
+
+class ReplicaSet:
+    """Round-robin over the healthy read replicas"""
+
+    def __init__(self, database_urls: List[str]):
+        self.replicas = [ReadReplica(f"replica{index}", url) for index, url in enumerate(database_urls, start=1)]
+        self._turn = itertools.count()
+
+    def pick(self) -> Optional[ReadReplica]:
+        """Next healthy replica, or None when all are down"""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._turn) % len(self.replicas)]
+            if replica.is_healthy():
+                return replica
+        return None
+
+
+replica_set = ReplicaSet(DATABASE_REPLICA_URLS) if DATABASE_REPLICA_URLS else None
+
+# Clients (by Authorization header) that recently wrote -> end of their primary-read window
+_recent_writers: Dict[str, float] = {}
+_recent_writers_lock = threading.Lock()
+
+
+def record_write(client_key: Optional[str]):
+    """Send the client's reads to the primary for the next DB_READ_YOUR_WRITES_WINDOW seconds"""
+    if not client_key or replica_set is None:
+        return
+    now = time.monotonic()
+    with _recent_writers_lock:
+        if len(_recent_writers) > 10000:
+            for key in [key for key, until in _recent_writers.items() if until <= now]:
+                del _recent_writers[key]
+        _recent_writers[client_key] = now + DB_READ_YOUR_WRITES_WINDOW
+
+
+def wrote_recently(client_key: Optional[str]) -> bool:
+    if not client_key:
+        return False
+    return _recent_writers.get(client_key, 0.0) > time.monotonic()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Record clients whose non-GET requests succeeded, so get_read_db sends their
+    reads to the primary until the replicas have caught up with the write.
+
+    The window is kept in process memory, so with several app workers a client's
+    next read may land on a worker that did not see the write; keep the window
+    above the replicas' usual lag and DB_REPLICA_MAX_LAG low.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_record(message: Message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = dict(scope["headers"])
+                authorization = headers.get(b"authorization")
+                record_write(authorization.decode("latin-1") if authorization else None)
+            await send(message)
+
+        await self.app(scope, receive, send_and_record)
+
 # Base class for models
 Base = declarative_base()
 
@@ -27,9 +257,98 @@ def get_db():
     """
     Dependency function to get database session.
     Yields a database session and ensures it's closed after use.
+    
+    Always the primary; read-only routes use get_read_db.
+    
+    The connection is checked out here, in FastAPI's threadpool. Most routes
+    are `async def` and query on the event loop, where waiting for a busy pool
+    would block the loop, and with it every request that is about to return
+    its connection, until pool_timeout.
     """
     db = SessionLocal()
     try:
+        db.connection()
+        yield db
+    finally:
+        db.close()
+
+
+async def reacquire_connection(db: Session):
+    """
+    Check a connection out again for a session that released it mid-request.
+
+    Routes that await slow non-database work (password hashing) call
+    db.close() first, so the pool is not held by requests that are not using
+    it. The new checkout runs in the threadpool, as in get_db.
+    """
+    await run_in_threadpool(db.connection)
+
+
+def get_read_db(authorization: Optional[str] = Header(None)):
+    """
+    Dependency for read-only routes: a session on a read replica.
+    
+    Falls back to the primary when no replicas are configured or healthy, and
+    for clients that wrote within DB_READ_YOUR_WRITES_WINDOW seconds, so they
+    see their own changes. Never write through this session.
+    """
+    replica = None
+    if replica_set is not None and not wrote_recently(authorization):
+        replica = replica_set.pick()
+
+    db = SessionLocal(bind=replica.engine) if replica else SessionLocal()
+    try:
+        try:
+            db.connection()
+        except SQLAlchemyError as e:
+            if replica is None:
+                raise
+            replica.mark_down(f"checkout failed ({e.__class__.__name__})")
+            db.close()
+            db = SessionLocal()
+            db.connection()
         yield db
     finally:
         db.close()
+
+
+def check_database_schema():
+    """
+    Fast startup check of the database schema against the Alembic migrations.
+
+    Schema changes are applied with `alembic upgrade head`, not by the app.
+    This only reads the alembic_version row and compares it to the head
+    revision of the migration scripts (no model reflection, no DDL), except
+    for a brand-new empty database, which is bootstrapped with create_all and
+    stamped at head when DB_AUTO_CREATE is enabled.
+
+    Raises:
+        RuntimeError: If the schema is not current and DB_REQUIRE_CURRENT_SCHEMA is set
+    """
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory(str(ALEMBIC_DIR))
+    head = script.get_current_head()
+
+    with engine.begin() as connection:
+        context = MigrationContext.configure(connection)
+        current = context.get_current_revision()
+
+        if current is None and DB_AUTO_CREATE and not inspect(connection).get_table_names():
+            import models  # noqa: F401 - register every table on Base.metadata
+            Base.metadata.create_all(bind=connection)
+            context.stamp(script, "head")
+            print(f"Created database schema at revision {head}")
+            return
+
+    if current == head:
+        return
+
+    message = (
+        f"Database schema revision is {current or 'unversioned'}, expected {head}. "
+        "Run `alembic upgrade head` (or `alembic stamp head` for a schema created by create_all)."
+    )
+    if DB_REQUIRE_CURRENT_SCHEMA:
+        raise RuntimeError(message)
+    print(f"WARNING: {message}")
@@ -2,37 +2,87 @@
 SkillSync - AI-Powered Learning Platform
 Main FastAPI application with admin and user authentication
 """
-from fastapi import FastAPI, Depends, HTTPException, status, Header
+from fastapi import FastAPI, Depends, HTTPException, status, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime
+from contextlib import asynccontextmanager
 
 # Import local modules
-from database import engine, Base, get_db
-from models import User, UserRole, Skill, Course, AdminLog, Job, UserResume, LocalOpportunity
+from database import (
+    get_db, get_read_db, reacquire_connection, check_database_schema, ReadYourWritesMiddleware, replica_set
+)
+from profiling import ProfilingMiddleware
+from pool_metrics import METRICS_ENABLED, render_prometheus
+from responses import (
+    DefaultJSONResponse, CompressionMiddleware, response_columns, json_list_response, not_modified
+)
+from pagination import paginate, next_cursor_headers, CURSOR_HEADERS, MAX_PAGE_SIZE
+from request_limits import BodySizeLimitMiddleware, MULTIPART_OVERHEAD_BYTES
+from models import User, UserRole, Skill, Course, Job, UserResume, LocalOpportunity
 from schemas import (
     AdminLogin, Token, UserResponse, SuccessResponse, 
-    DashboardStats, SkillResponse, CourseResponse,
-    SkillCreate, JobCreate, JobUpdate, JobResponse,
+    DashboardStats, SkillResponse, SkillAutocompleteResult, CourseResponse,
+    SkillCreate, JobCreate, JobUpdate, JobResponse, JobApplicationResponse,
     CourseCreate, CourseUpdate
 )
 from auth import (
-    verify_password, get_password_hash, 
+    get_password_hash, 
     create_access_token, decode_access_token
 )
 
+from services.counter_service import counter_buffer
+from services.audit_log_service import audit_log_writer, build_audit_record, client_ip
+from services.password_hash_service import password_hasher
+from services.dashboard_stats_service import (
+    get_dashboard_stats as get_dashboard_stats_rollup,
+    record_user_created, record_course_created, record_course_deleted,
+    record_skill_created, record_skill_deleted
+)
+from services.catalog_version_service import (
+    catalog_cache_headers, item_cache_headers, bump_catalog_version,
+    COURSES_CATALOG, SKILLS_CATALOG, JOBS_CATALOG
+)
+from services.skill_index import get_skill_index, invalidate_skill_index
+from services.skill_array_service import resolve_skill_ids, split_skill_values, has_any_skill, has_all_skills
+from services.cv_service import CV_PDF_MAX_BYTES
+
 # Import user routes
 from api_users import router as user_router
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: check the schema revision and start background
+    writers and the password hash workers on startup, and flush the writers on
+    shutdown so buffered data is not lost
+    """
+    check_database_schema()
+    counter_buffer.start()
+    audit_log_writer.start()
+    password_hasher.start()
+    yield
+    password_hasher.stop()
+    audit_log_writer.stop()
+    counter_buffer.stop()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="SkillSync API",
     description="AI-Powered Learning Platform Backend",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=DefaultJSONResponse
+)
+
+# Refuse oversized CV uploads while the body is received, before multipart parsing
+# spools them (added before CORS so the 413 still carries CORS headers)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={"/api/cv/pdf": CV_PDF_MAX_BYTES + MULTIPART_OVERHEAD_BYTES},
 )
 
 # CORS Middleware
@@ -42,8 +92,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=CURSOR_HEADERS,  # Pagination cursors are returned in headers
 )
 
+# Compress large responses (brotli if available, otherwise gzip)
+app.add_middleware(CompressionMiddleware)
+
+# Per-request DB/LLM/serialization timings (Server-Timing header, flagged requests logged)
+app.add_middleware(ProfilingMiddleware)
+
+# Send a client's reads to the primary for a few seconds after its writes
+if replica_set is not None:
+    app.add_middleware(ReadYourWritesMiddleware)
+
 # Include routers
 app.include_router(user_router)
 # Include profile routes (user profile and skill management)
@@ -67,6 +128,9 @@ app.include_router(cv_assistant_router)
 # Include opportunity routes (local opportunity recommendations)
 from routes.opportunity_routes import router as opportunity_router
 app.include_router(opportunity_router)
+# Include search routes (full-text search over courses, jobs and opportunities)
+from routes.search_routes import router as search_router
+app.include_router(search_router)
 
 
 # ==================== Authentication Helpers ====================
@@ -107,7 +171,6 @@ async def get_admin_user(current_user: User = Depends(get_current_user)):
     """
     Dependency to ensure current user is an admin
     """
-    print(f"DEBUG: User role: {current_user.role}, Expected: {UserRole.ADMIN}, Match: {current_user.role == UserRole.ADMIN}")
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -116,19 +179,37 @@ async def get_admin_user(current_user: User = Depends(get_current_user)):
     return current_user
 
 
-def log_admin_action(db: Session, admin_id: int, action: str, target_type: str = None, target_id: int = None, details: str = None):
+def log_admin_action(
+    db: Session,
+    admin_id: int,
+    action: str,
+    target_type: str = None,
+    target_id: int = None,
+    details: str = None,
+    request: Request = None
+):
     """
     Log admin actions for audit trail
+    Records are queued and written in batches by the audit log writer;
+    client IP (see client_ip: X-Forwarded-For only from TRUSTED_PROXIES) and
+    user agent are captured from the request when given
     """
-    log = AdminLog(
+    ip_address = None
+    user_agent = None
+    if request is not None:
+        ip_address = client_ip(request)
+        user_agent = request.headers.get("user-agent")
+    
+    record = build_audit_record(
         admin_id=admin_id,
         action=action,
         target_type=target_type,
         target_id=target_id,
-        details=details
+        details=details,
+        ip_address=ip_address,
+        user_agent=user_agent
     )
-    db.add(log)
-    db.commit()
+    audit_log_writer.write(db, record)
 
 
 # ==================== Public Routes ====================
@@ -149,10 +230,18 @@ def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow()}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Connection pool metrics in the Prometheus text format"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return Response(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 # ==================== Admin Authentication ====================
 
 @app.post("/api/admin/login", response_model=Token)
-def admin_login(credentials: AdminLogin, db: Session = Depends(get_db)):
+async def admin_login(request: Request, credentials: AdminLogin, db: Session = Depends(get_db)):
     """
     Admin login endpoint
     Returns JWT token if credentials are valid
@@ -173,8 +262,10 @@ def admin_login(credentials: AdminLogin, db: Session = Depends(get_db)):
             detail="Admin access required"
         )
     
-    # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    # Verify password with the pooled connection released (user stays loaded, detached)
+    db.close()
+    verified, new_hash = await password_hasher.verify(credentials.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
@@ -187,6 +278,13 @@ def admin_login(credentials: AdminLogin, db: Session = Depends(get_db)):
             detail="Account is inactive"
         )
     
+    await reacquire_connection(db)
+    db.add(user)
+    
+    # Upgrade hashes made with outdated cost parameters
+    if new_hash:
+        user.hashed_password = new_hash
+    
     # Update last login
     user.last_login = datetime.utcnow()
     db.commit()
@@ -197,7 +295,7 @@ def admin_login(credentials: AdminLogin, db: Session = Depends(get_db)):
     )
     
     # Log admin action
-    log_admin_action(db, user.id, "admin_login")
+    log_admin_action(db, user.id, "admin_login", request=request)
     
     return {
         "access_token": access_token,
@@ -215,11 +313,11 @@ async def get_current_admin(current_user: User = Depends(get_admin_user)):
 
 
 @app.post("/api/admin/logout", response_model=SuccessResponse)
-async def admin_logout(current_user: User = Depends(get_admin_user), db: Session = Depends(get_db)):
+async def admin_logout(request: Request, current_user: User = Depends(get_admin_user), db: Session = Depends(get_db)):
     """
     Admin logout endpoint
     """
-    log_admin_action(db, current_user.id, "admin_logout")
+    log_admin_action(db, current_user.id, "admin_logout", request=request)
     return {"success": True, "message": "Logged out successfully"}
 
 
@@ -229,97 +327,93 @@ async def admin_logout(current_user: User = Depends(get_admin_user), db: Session
 async def get_dashboard_stats(current_user: User = Depends(get_admin_user), db: Session = Depends(get_db)):
     """
     Get dashboard statistics for admin panel
+    Served from the incrementally maintained rollup (see dashboard_stats_service)
     """
-    from datetime import timedelta
-    from sqlalchemy import func
-    
-    # Calculate date for "this month"
-    this_month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    # Get statistics
-    total_users = db.query(func.count(User.id)).scalar()
-    total_courses = db.query(func.count(Course.id)).scalar()
-    total_skills = db.query(func.count(Skill.id)).scalar()
-    # Jobs feature removed; keep total_jobs as 0 for compatibility
-    total_jobs = 0
-    
-    new_users_this_month = db.query(func.count(User.id)).filter(
-        User.created_at >= this_month_start
-    ).scalar()
-    
-    courses_added_this_month = db.query(func.count(Course.id)).filter(
-        Course.created_at >= this_month_start
-    ).scalar()
-    
-    return {
-        "total_users": total_users or 0,
-        "total_courses": total_courses or 0,
-        "total_skills": total_skills or 0,
-        "total_jobs": total_jobs or 0,
-        "active_enrollments": 0,  # Will be calculated with enrollments
-        "new_users_this_month": new_users_this_month or 0,
-        "courses_published_this_month": courses_added_this_month or 0
-    }
+    return get_dashboard_stats_rollup(db)
 
 
 # ==================== Admin User Management ====================
 
 @app.get("/api/admin/users", response_model=list[UserResponse])
 async def list_users(
-    skip: int = 0,
-    limit: int = 50,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    List all users (paginated)
+    List all users (paginated by id; next page cursor in X-Next-Cursor)
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    users, next_cursor = paginate(db.query(*response_columns(UserResponse, User)), (User.id,), cursor, limit, skip)
+    return json_list_response(UserResponse, users, headers=next_cursor_headers(next_cursor))
 
 
 # ==================== Admin Skill Management ====================
 
 @app.get("/api/admin/skills", response_model=list[SkillResponse])
 async def list_skills(
-    skip: int = 0,
-    limit: int = 50,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    List all skills (paginated)
+    List all skills (paginated by id; next page cursor in X-Next-Cursor)
     """
-    skills = db.query(Skill).offset(skip).limit(limit).all()
+    skills, next_cursor = paginate(db.query(Skill), (Skill.id,), cursor, limit, skip)
+    response.headers.update(next_cursor_headers(next_cursor))
     return skills
 
 
 @app.get("/api/skills", response_model=list[SkillResponse])
 async def list_skills_public(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     """
-    List all skills (public endpoint)
+    List all skills (public endpoint, paginated by id; next page cursor in X-Next-Cursor)
+    Cacheable: returns 304 Not Modified when If-None-Match matches the catalog ETag
     """
-    skills = db.query(Skill).offset(skip).limit(limit).all()
-    return skills
+    cache_headers = catalog_cache_headers(db, SKILLS_CATALOG)
+    cached = not_modified(request, cache_headers)
+    if cached:
+        return cached
+    
+    skills, next_cursor = paginate(db.query(*response_columns(SkillResponse, Skill)), (Skill.id,), cursor, limit, skip)
+    return json_list_response(SkillResponse, skills, headers={**cache_headers, **next_cursor_headers(next_cursor)})
+
+
+@app.get("/api/skills/autocomplete", response_model=list[SkillAutocompleteResult])
+def autocomplete_skills(q: str, limit: int = Query(10, ge=1, le=50)):
+    """
+    Typeahead over skill names and aliases (public endpoint)
+    Served from the in-memory skill index, best matches first
+    """
+    return get_skill_index().search(q, limit)
 
 
 # ==================== Admin Course Management ====================
 
 @app.get("/api/admin/courses", response_model=list[CourseResponse])
 async def list_courses(
-    skip: int = 0,
-    limit: int = 50,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    List all courses (paginated)
+    List all courses (paginated by id; next page cursor in X-Next-Cursor)
     """
-    courses = db.query(Course).offset(skip).limit(limit).all()
+    courses, next_cursor = paginate(db.query(Course), (Course.id,), cursor, limit, skip)
+    response.headers.update(next_cursor_headers(next_cursor))
     return courses
 
 
@@ -350,6 +444,7 @@ def initialize_admin(db: Session = Depends(get_db)):
     )
     
     db.add(admin)
+    record_user_created(db)
     db.commit()
     db.refresh(admin)
     
@@ -368,6 +463,7 @@ def initialize_admin(db: Session = Depends(get_db)):
 
 @app.post("/api/admin/skills", response_model=SkillResponse)
 async def create_skill(
+    request: Request,
     skill: SkillCreate,
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
@@ -386,13 +482,17 @@ async def create_skill(
     # Create new skill
     new_skill = Skill(**skill.dict())
     db.add(new_skill)
+    record_skill_created(db)
+    bump_catalog_version(db, SKILLS_CATALOG)
     db.commit()
     db.refresh(new_skill)
+    invalidate_skill_index()
     
     # Log action
     log_admin_action(
         db, current_user.id, "create_skill", 
-        "skill", new_skill.id, f"Created skill: {new_skill.name}"
+        "skill", new_skill.id, f"Created skill: {new_skill.name}",
+        request=request
     )
     
     return new_skill
@@ -400,6 +500,7 @@ async def create_skill(
 
 @app.delete("/api/admin/skills/{skill_id}")
 async def delete_skill(
+    request: Request,
     skill_id: int,
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
@@ -416,12 +517,16 @@ async def delete_skill(
     
     skill_name = skill.name
     db.delete(skill)
+    record_skill_deleted(db)
+    bump_catalog_version(db, SKILLS_CATALOG)
     db.commit()
+    invalidate_skill_index()
     
     # Log action
     log_admin_action(
         db, current_user.id, "delete_skill",
-        "skill", skill_id, f"Deleted skill: {skill_name}"
+        "skill", skill_id, f"Deleted skill: {skill_name}",
+        request=request
     )
     
     return {"success": True, "message": f"Skill '{skill_name}' deleted successfully"}
@@ -431,20 +536,24 @@ async def delete_skill(
 
 @app.get("/api/admin/jobs", response_model=list[JobResponse])
 async def list_admin_jobs(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get all jobs (admin only)
+    Get all jobs (admin only) (paginated by id; next page cursor in X-Next-Cursor)
     """
-    jobs = db.query(Job).offset(skip).limit(limit).all()
+    jobs, next_cursor = paginate(db.query(Job), (Job.id,), cursor, limit, skip)
+    response.headers.update(next_cursor_headers(next_cursor))
     return jobs
 
 
 @app.post("/api/admin/jobs", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
 async def create_job(
+    request: Request,
     job: JobCreate,
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
@@ -453,15 +562,19 @@ async def create_job(
     Create a new job posting (admin only)
     """
     # Create new job
-    new_job = Job(**job.dict(), posted_by=current_user.id)
+    job_data = job.dict()
+    job_data["required_skills"] = resolve_skill_ids(db, job_data["required_skills"])
+    new_job = Job(**job_data, posted_by=current_user.id)
     db.add(new_job)
+    bump_catalog_version(db, JOBS_CATALOG)
     db.commit()
     db.refresh(new_job)
     
     # Log action
     log_admin_action(
         db, current_user.id, "create_job", 
-        "job", new_job.id, f"Created job: {new_job.title} at {new_job.company_name}"
+        "job", new_job.id, f"Created job: {new_job.title} at {new_job.company_name}",
+        request=request
     )
     
     return new_job
@@ -469,6 +582,7 @@ async def create_job(
 
 @app.put("/api/admin/jobs/{job_id}", response_model=JobResponse)
 async def update_job(
+    request: Request,
     job_id: int,
     job_update: JobUpdate,
     current_user: User = Depends(get_admin_user),
@@ -486,16 +600,20 @@ async def update_job(
     
     # Update job fields
     update_data = job_update.dict(exclude_unset=True)
+    if 'required_skills' in update_data:
+        update_data['required_skills'] = resolve_skill_ids(db, update_data['required_skills'])
     for field, value in update_data.items():
         setattr(job, field, value)
     
+    bump_catalog_version(db, JOBS_CATALOG)
     db.commit()
     db.refresh(job)
     
     # Log action
     log_admin_action(
         db, current_user.id, "update_job",
-        "job", job.id, f"Updated job: {job.title}"
+        "job", job.id, f"Updated job: {job.title}",
+        request=request
     )
     
     return job
@@ -503,6 +621,7 @@ async def update_job(
 
 @app.delete("/api/admin/jobs/{job_id}")
 async def delete_job(
+    request: Request,
     job_id: int,
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
@@ -520,12 +639,14 @@ async def delete_job(
     job_title = job.title
     company = job.company_name
     db.delete(job)
+    bump_catalog_version(db, JOBS_CATALOG)
     db.commit()
     
     # Log action
     log_admin_action(
         db, current_user.id, "delete_job",
-        "job", job_id, f"Deleted job: {job_title} at {company}"
+        "job", job_id, f"Deleted job: {job_title} at {company}",
+        request=request
     )
     
     return {"success": True, "message": f"Job '{job_title}' deleted successfully"}
@@ -535,59 +656,124 @@ async def delete_job(
 
 @app.get("/api/jobs", response_model=list[JobResponse])
 async def list_jobs(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skills: Optional[str] = None,
+    match_all: bool = False,
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get all active jobs (public access)
+    Get all active jobs (public access, paginated by id; next page cursor in X-Next-Cursor)
+    Optional filter: skills=1,2,3 (skill IDs) matches jobs with any of them, or all with match_all=true
+    Cacheable: returns 304 Not Modified when If-None-Match matches the catalog ETag
     """
-    jobs = db.query(Job).filter(Job.is_active == True).offset(skip).limit(limit).all()
-    return jobs
+    cache_headers = catalog_cache_headers(db, JOBS_CATALOG)
+    cached = not_modified(request, cache_headers)
+    if cached:
+        return cached
+    
+    query = db.query(*response_columns(JobResponse, Job)).filter(Job.is_active == True)
+    if skills:
+        skill_ids, _ = split_skill_values(skills)
+        match = has_all_skills if match_all else has_any_skill
+        query = query.filter(match(db, Job.required_skills, skill_ids))
+    jobs, next_cursor = paginate(query, (Job.id,), cursor, limit, skip)
+    return json_list_response(JobResponse, jobs, headers={**cache_headers, **next_cursor_headers(next_cursor)})
 
 
 @app.get("/api/jobs/{job_id}", response_model=JobResponse)
 async def get_job(
+    request: Request,
+    response: Response,
     job_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific job by ID (public access)
-    Increments view count
+    Increments view count (buffered, written back in batches)
+    Cacheable: returns 304 Not Modified when If-None-Match matches the ETag of the entry
+    """
+    # Primary-key lookup of the version columns only; the full row is loaded on a cache miss
+    current = db.query(Job.id, Job.updated_at).filter(
+        Job.id == job_id, Job.is_active == True
+    ).first()
+    if not current:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    cache_headers = item_cache_headers(JOBS_CATALOG, current.id, current.updated_at)
+    cached = not_modified(request, cache_headers)
+    if cached:
+        counter_buffer.increment(Job, "views_count", current.id)
+        return cached
+    
+    job = db.query(Job).filter(Job.id == current.id).first()
+    
+    # Increment view count without a write transaction
+    pending_views = counter_buffer.increment(Job, "views_count", job.id)
+    
+    response.headers.update(cache_headers)
+    job_response = JobResponse.model_validate(job)
+    job_response.views_count = (job.views_count or 0) + pending_views
+    job_response.applications_count = (
+        (job.applications_count or 0) + counter_buffer.pending(Job, "applications_count", job.id)
+    )
+    return job_response
+
+
+@app.post("/api/jobs/{job_id}/apply", response_model=JobApplicationResponse)
+async def apply_to_job(
+    job_id: int,
+    db: Session = Depends(get_read_db)
+):
     """
-    job = db.query(Job).filter(Job.id == job_id, Job.is_active == True).first()
+    Record an application click-through and return where to apply (public access)
+    Increments applications count (buffered, written back in batches)
+    """
+    job = db.query(Job.id, Job.application_url, Job.application_email, Job.applications_count).filter(
+        Job.id == job_id, Job.is_active == True
+    ).first()
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
     
-    # Increment view count
-    job.views_count += 1
-    db.commit()
-    db.refresh(job)
-    
-    return job
+    pending_applications = counter_buffer.increment(Job, "applications_count", job.id)
+    return {
+        "job_id": job.id,
+        "application_url": job.application_url,
+        "application_email": job.application_email,
+        "applications_count": (job.applications_count or 0) + pending_applications,
+    }
 
 
 # ==================== Course Management (Admin) ====================
 
 @app.get("/api/admin/courses", response_model=list[CourseResponse])
 async def list_admin_courses(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get all courses for admin management
+    Get all courses for admin management (paginated by id; next page cursor in X-Next-Cursor)
     """
-    courses = db.query(Course).offset(skip).limit(limit).all()
+    courses, next_cursor = paginate(db.query(Course), (Course.id,), cursor, limit, skip)
+    response.headers.update(next_cursor_headers(next_cursor))
     return courses
 
 
 @app.post("/api/admin/courses", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
 async def create_course(
+    request: Request,
     course_data: CourseCreate,
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
@@ -595,8 +781,6 @@ async def create_course(
     """
     Create a new course (admin only)
     """
-    import json
-    
     # Create course
     new_course = Course(
         title=course_data.title,
@@ -605,20 +789,23 @@ async def create_course(
         cost_type=course_data.cost_type,
         description=course_data.description,
         thumbnail_url=course_data.thumbnail_url,
-        related_skills=json.dumps(course_data.related_skills) if course_data.related_skills else None,
+        related_skills=resolve_skill_ids(db, course_data.related_skills) or None,
         is_active=course_data.is_active,
         enrollment_count=0,
         views_count=0
     )
     
     db.add(new_course)
+    record_course_created(db)
+    bump_catalog_version(db, COURSES_CATALOG)
     db.commit()
     db.refresh(new_course)
     
     # Log action
     log_admin_action(
         db, current_user.id, "create_course",
-        "course", new_course.id, f"Created course: {new_course.title}"
+        "course", new_course.id, f"Created course: {new_course.title}",
+        request=request
     )
     
     return new_course
@@ -626,6 +813,7 @@ async def create_course(
 
 @app.put("/api/admin/courses/{course_id}", response_model=CourseResponse)
 async def update_course(
+    request: Request,
     course_id: int,
     course_data: CourseUpdate,
     current_user: User = Depends(get_admin_user),
@@ -634,8 +822,6 @@ async def update_course(
     """
     Update a course (admin only)
     """
-    import json
-    
     course = db.query(Course).filter(Course.id == course_id).first()
     if not course:
         raise HTTPException(
@@ -648,19 +834,21 @@ async def update_course(
     
     # Handle related_skills separately
     if 'related_skills' in update_data and update_data['related_skills'] is not None:
-        update_data['related_skills'] = json.dumps(update_data['related_skills'])
+        update_data['related_skills'] = resolve_skill_ids(db, update_data['related_skills'])
     
     for field, value in update_data.items():
         setattr(course, field, value)
     
     course.updated_at = datetime.utcnow()
+    bump_catalog_version(db, COURSES_CATALOG)
     db.commit()
     db.refresh(course)
     
     # Log action
     log_admin_action(
         db, current_user.id, "update_course",
-        "course", course.id, f"Updated course: {course.title}"
+        "course", course.id, f"Updated course: {course.title}",
+        request=request
     )
     
     return course
@@ -668,6 +856,7 @@ async def update_course(
 
 @app.delete("/api/admin/courses/{course_id}")
 async def delete_course(
+    request: Request,
     course_id: int,
     current_user: User = Depends(get_admin_user),
     db: Session = Depends(get_db)
@@ -683,13 +872,16 @@ async def delete_course(
         )
     
     course_title = course.title
+    record_course_deleted(db, course.created_at)
     db.delete(course)
+    bump_catalog_version(db, COURSES_CATALOG)
     db.commit()
     
     # Log action
     log_admin_action(
         db, current_user.id, "delete_course",
-        "course", course_id, f"Deleted course: {course_title}"
+        "course", course_id, f"Deleted course: {course_title}",
+        request=request
     )
     
     return {"success": True, "message": f"Course '{course_title}' deleted successfully"}
@@ -699,38 +891,69 @@ async def delete_course(
 
 @app.get("/api/courses", response_model=list[CourseResponse])
 async def list_courses(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skills: Optional[str] = None,
+    match_all: bool = False,
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get all active courses (public access)
+    Get all active courses (public access, paginated by id; next page cursor in X-Next-Cursor)
+    Optional filter: skills=1,2,3 (skill IDs) matches courses with any of them, or all with match_all=true
+    Cacheable: returns 304 Not Modified when If-None-Match matches the catalog ETag
     """
-    courses = db.query(Course).filter(Course.is_active == True).offset(skip).limit(limit).all()
-    return courses
+    cache_headers = catalog_cache_headers(db, COURSES_CATALOG)
+    cached = not_modified(request, cache_headers)
+    if cached:
+        return cached
+    
+    query = db.query(*response_columns(CourseResponse, Course)).filter(Course.is_active == True)
+    if skills:
+        skill_ids, _ = split_skill_values(skills)
+        match = has_all_skills if match_all else has_any_skill
+        query = query.filter(match(db, Course.related_skills, skill_ids))
+    courses, next_cursor = paginate(query, (Course.id,), cursor, limit, skip)
+    return json_list_response(CourseResponse, courses, headers={**cache_headers, **next_cursor_headers(next_cursor)})
 
 
 @app.get("/api/courses/{course_id}", response_model=CourseResponse)
 async def get_course(
+    request: Request,
+    response: Response,
     course_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific course by ID (public access)
-    Increments view count
-    """
-    course = db.query(Course).filter(Course.id == course_id, Course.is_active == True).first()
-    if not course:
+    Increments view count (buffered, written back in batches)
+    Cacheable: returns 304 Not Modified when If-None-Match matches the ETag of the entry
+    """
+    # Primary-key lookup of the version columns only; the full row is loaded on a cache miss
+    current = db.query(Course.id, Course.updated_at).filter(
+        Course.id == course_id, Course.is_active == True
+    ).first()
+    if not current:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
     
-    # Increment view count
-    course.views_count += 1
-    db.commit()
-    db.refresh(course)
+    cache_headers = item_cache_headers(COURSES_CATALOG, current.id, current.updated_at)
+    cached = not_modified(request, cache_headers)
+    if cached:
+        counter_buffer.increment(Course, "views_count", current.id)
+        return cached
     
-    return course
+    course = db.query(Course).filter(Course.id == current.id).first()
+    
+    # Increment view count without a write transaction
+    pending_views = counter_buffer.increment(Course, "views_count", course.id)
+    
+    response.headers.update(cache_headers)
+    course_response = CourseResponse.model_validate(course)
+    course_response.views_count = (course.views_count or 0) + pending_views
+    return course_response
 
 
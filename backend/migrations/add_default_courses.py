@@ -10,7 +10,6 @@ Run this after the base schema and default skills have been created.
 """
 
 import argparse
-import json
 import os
 import sys
 
@@ -62,7 +61,7 @@ def _create_course(
 
     related_skill_ids = [skill.id for skill in related_skills]
     course = Course(**course_data)
-    course.related_skills = json.dumps(related_skill_ids) if related_skill_ids else None
+    course.related_skills = related_skill_ids or None
 
     for skill in related_skills:
         course.skills.append(skill)
@@ -10,7 +10,6 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import SessionLocal
 from models import LocalOpportunity
-import json
 
 def seed_opportunities():
     """Add sample local opportunities"""
@@ -32,7 +31,7 @@ def seed_opportunities():
                 "location": "Dhaka, Bangladesh",
                 "category": "Internship",
                 "target_track": "Frontend",
-                "required_skills": json.dumps([1, 2, 3]),  # Assuming skill IDs - adjust based on your skills table
+                "required_skills": [1, 2, 3],  # Assuming skill IDs - adjust based on your skills table
                 "link": "https://techstart.com/careers/internship",
                 "priority_group": "All Youth",
                 "is_active": True
@@ -44,7 +43,7 @@ def seed_opportunities():
                 "location": "Chittagong, Bangladesh",
                 "category": "Training",
                 "target_track": "Data Science",
-                "required_skills": json.dumps([5, 6, 7]),  # Adjust skill IDs
+                "required_skills": [5, 6, 7],  # Adjust skill IDs
                 "link": "https://youthskills.org/bootcamp",
                 "priority_group": "Rural Youth",
                 "is_active": True
@@ -56,7 +55,7 @@ def seed_opportunities():
                 "location": "Dhaka, Bangladesh",
                 "category": "Training",
                 "target_track": "Cybersecurity",
-                "required_skills": json.dumps([8, 9, 10]),  # Adjust skill IDs
+                "required_skills": [8, 9, 10],  # Adjust skill IDs
                 "link": "https://digisec.org/training",
                 "priority_group": "All Youth",
                 "is_active": True
@@ -68,7 +67,7 @@ def seed_opportunities():
                 "location": "Dhaka, Bangladesh",
                 "category": "Job",
                 "target_track": "Full-Stack",
-                "required_skills": json.dumps([1, 2, 11, 12]),  # Adjust skill IDs
+                "required_skills": [1, 2, 11, 12],  # Adjust skill IDs
                 "link": "https://innovatetech.com/careers",
                 "priority_group": "All Youth",
                 "is_active": True
@@ -80,7 +79,7 @@ def seed_opportunities():
                 "location": "Dhaka, Bangladesh",
                 "category": "Internship",
                 "target_track": "Frontend",
-                "required_skills": json.dumps([1, 2, 3]),  # Adjust skill IDs
+                "required_skills": [1, 2, 3],  # Adjust skill IDs
                 "link": "https://womentech.org/internship",
                 "priority_group": "Women",
                 "is_active": True
@@ -92,7 +91,7 @@ def seed_opportunities():
                 "location": "Sylhet, Bangladesh",
                 "category": "Youth Program",
                 "target_track": "Frontend",
-                "required_skills": json.dumps([1, 2]),  # Adjust skill IDs
+                "required_skills": [1, 2],  # Adjust skill IDs
                 "link": "https://ruraldev.org/digital-skills",
                 "priority_group": "Rural Youth",
                 "is_active": True
@@ -104,7 +103,7 @@ def seed_opportunities():
                 "location": "Dhaka, Bangladesh",
                 "category": "Training",
                 "target_track": "Backend",
-                "required_skills": json.dumps([11, 12, 13]),  # Adjust skill IDs
+                "required_skills": [11, 12, 13],  # Adjust skill IDs
                 "link": "https://codeacademybd.com/backend",
                 "priority_group": "All Youth",
                 "is_active": True
@@ -116,7 +115,7 @@ def seed_opportunities():
                 "location": "Dhaka, Bangladesh",
                 "category": "Internship",
                 "target_track": "Mobile Development",
-                "required_skills": json.dumps([14, 15]),  # Adjust skill IDs
+                "required_skills": [14, 15],  # Adjust skill IDs
                 "link": "https://appdev.com/internship",
                 "priority_group": "All Youth",
                 "is_active": True
@@ -128,7 +127,7 @@ def seed_opportunities():
                 "location": "Multiple Cities, Bangladesh",
                 "category": "Youth Program",
                 "target_track": "Full-Stack",
-                "required_skills": json.dumps([1, 2, 11]),  # Adjust skill IDs
+                "required_skills": [1, 2, 11],  # Adjust skill IDs
                 "link": "https://techforall.org/scholarship",
                 "priority_group": "Low-Income",
                 "is_active": True
@@ -140,7 +139,7 @@ def seed_opportunities():
                 "location": "Dhaka, Bangladesh",
                 "category": "Training",
                 "target_track": "Design",
-                "required_skills": json.dumps([16, 17]),  # Adjust skill IDs
+                "required_skills": [16, 17],  # Adjust skill IDs
                 "link": "https://designhub.com/training",
                 "priority_group": "All Youth",
                 "is_active": True
@@ -0,0 +1,92 @@
+"""
+Backfill resume skills from CV text
+Adds skills mentioned in each user's CV text, experience description and
+projects (see services/skill_extractor) to their resume's skills
+
+Usage (from backend/):
+    python migrations/backfill_resume_skills.py [--dry-run] [--min-mentions 2] [--batch-size 500]
+"""
+import argparse
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal
+from models import User, UserResume
+from services.cv_service import extract_resume_skills
+from services.skill_extractor import get_skill_extractor
+from services.user_context_service import bump_context_version
+
+
+def backfill_resume_skills(dry_run: bool = False, min_mentions: int = 1, batch_size: int = 500):
+    """Union detected skill ids into every resume's skills, committing once per batch"""
+    db = SessionLocal()
+
+    try:
+        extractor = get_skill_extractor(db)
+        print(f"Compiled {extractor.size} skills")
+
+        scanned = updated = added = 0
+        started = time.perf_counter()
+        last_id = 0
+        while True:
+            # Keyset pagination, so committed batches never shift the next page
+            rows = (
+                db.query(UserResume, User)
+                .join(User, User.id == UserResume.user_id)
+                .filter(UserResume.id > last_id)
+                .order_by(UserResume.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            for resume, user in rows:
+                scanned += 1
+                detected = extract_resume_skills(user, resume, db)
+                current = list(resume.skills or [])
+                new_skills = [
+                    skill for skill in detected
+                    if skill["count"] >= min_mentions and skill["skill_id"] not in current
+                ]
+                if not new_skills:
+                    continue
+
+                updated += 1
+                added += len(new_skills)
+                print(f"Resume {resume.id} (user {user.id}): + {', '.join(skill['name'] for skill in new_skills)}")
+                if not dry_run:
+                    resume.skills = current + [skill["skill_id"] for skill in new_skills]
+                    bump_context_version(db, user.id)
+
+            last_id = rows[-1][0].id
+            if dry_run:
+                db.rollback()
+            else:
+                db.commit()
+            # Release the batch's objects
+            db.expunge_all()
+
+        elapsed = time.perf_counter() - started
+        action = "Would add" if dry_run else "Added"
+        print(f"\n✅ Scanned {scanned} resumes in {elapsed:.1f}s; {action} {added} skills to {updated} resumes")
+
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error backfilling resume skills: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Report the skills that would be added")
+    parser.add_argument("--min-mentions", type=int, default=1, help="Mentions needed before a skill is added")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print("Backfilling resume skills from CV text...")
+    backfill_resume_skills(args.dry_run, args.min_mentions, args.batch_size)
@@ -7,7 +7,6 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import SessionLocal
 from models import LocalOpportunity, Skill
-import json
 
 def update_opportunity_skills():
     """Update opportunities with correct skill IDs"""
@@ -43,7 +42,7 @@ def update_opportunity_skills():
                         skill_ids.append(skill_id)
                 
                 if skill_ids:
-                    opp.required_skills = json.dumps(skill_ids)
+                    opp.required_skills = skill_ids
                     updated_count += 1
                     print(f"Updated {opp.title}: {skill_ids}")
         
@@ -2,13 +2,61 @@
 Database models for SkillSync platform
 Designed with AI integration in mind for future enhancements
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Float, Table, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Float, Table, Enum, Index, DDL, event, JSON
+from sqlalchemy.dialects.postgresql import TSVECTOR, JSONB
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from database import Base
 import enum
 
 
+# Full-text search documents: (column, weight) pairs indexed into each table's
+# `search_vector` (Postgres only; kept current by a trigger, see _search_vector_ddl)
+COURSE_SEARCH_FIELDS = (("title", "A"), ("platform", "B"), ("description", "C"))
+JOB_SEARCH_FIELDS = (("title", "A"), ("company_name", "B"), ("description", "C"), ("requirements", "C"))
+OPPORTUNITY_SEARCH_FIELDS = (
+    ("title", "A"), ("organization", "B"), ("target_track", "B"), ("category", "B"), ("description", "C")
+)
+SEARCH_TEXT_CONFIG = "english"
+
+# Plain text on SQLite, which falls back to LIKE matching
+SearchVector = TSVECTOR().with_variant(Text(), "sqlite")
+
+# Skill id lists ([1, 2, 3]): JSONB on Postgres, GIN-indexed for containment
+# queries (see services/skill_array_service.py); JSON text elsewhere
+SkillIdArray = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
+def _skill_ids_index(table_name: str, column: str) -> Index:
+    return Index(
+        f"ix_{table_name}_{column}", column,
+        postgresql_using="gin", postgresql_ops={column: "jsonb_path_ops"}
+    ).ddl_if(dialect="postgresql")
+
+
+def _search_vector_ddl(table: Table, fields: tuple):
+    """Create the trigger that maintains `search_vector` when the table is created"""
+    name = table.name
+    document = " ||\n        ".join(
+        f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce(NEW.{column}, '')), '{weight}')"
+        for column, weight in fields
+    )
+    columns = ", ".join(column for column, _ in fields)
+    for statement in (
+        f"""CREATE OR REPLACE FUNCTION {name}_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        {document};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql""",
+        f"""CREATE TRIGGER {name}_search_vector_trigger
+BEFORE INSERT OR UPDATE OF {columns} ON {name}
+FOR EACH ROW EXECUTE FUNCTION {name}_search_vector_update()""",
+    ):
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
 # Enums for structured data
 class UserRole(str, enum.Enum):
     ADMIN = "admin"
@@ -43,7 +91,10 @@ user_skills = Table(
     Column('user_id', Integer, ForeignKey('users.id', ondelete='CASCADE')),
     Column('skill_id', Integer, ForeignKey('skills.id', ondelete='CASCADE')),
     Column('proficiency_level', String(50)),
-    Column('acquired_date', DateTime, server_default=func.now())
+    Column('acquired_date', DateTime, server_default=func.now()),
+    # One row per (user, skill): serves "skills of user" lookups and membership checks
+    Index('ix_user_skills_user_id_skill_id', 'user_id', 'skill_id', unique=True),
+    Index('ix_user_skills_skill_id', 'skill_id')
 )
 
 course_skills = Table(
@@ -89,6 +140,7 @@ class User(Base):
     experience_description = Column(Text)  # user's work/project experience
     career_interests = Column(Text)  # target roles or career paths (JSON array of strings)
     cv_text = Column(Text)  # stored CV/resume text for later AI analysis
+    context_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped when profile/skills/CV change
     
     # Metadata
     is_active = Column(Boolean, default=True)
@@ -97,6 +149,14 @@ class User(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     last_login = Column(DateTime)
     
+    __table_args__ = (
+        # Admin lookups (WHERE role = 'ADMIN') only ever touch a handful of rows
+        Index(
+            "ix_users_admin_id", "id",
+            postgresql_where=role == UserRole.ADMIN, sqlite_where=role == UserRole.ADMIN
+        ),
+    )
+    
     # Relationships
     skills = relationship("Skill", secondary=user_skills, back_populates="users")
     courses_created = relationship("Course", back_populates="instructor", foreign_keys="Course.instructor_id")
@@ -150,7 +210,7 @@ class Course(Base):
     thumbnail_url = Column(String(500))
     
     # Related skills stored as JSON array of skill IDs
-    related_skills = Column(Text)  # JSON array of skill IDs
+    related_skills = Column(SkillIdArray)  # JSON array of skill IDs
     
     # Analytics
     enrollment_count = Column(Integer, default=0)
@@ -167,6 +227,16 @@ class Course(Base):
     skills = relationship("Skill", secondary=course_skills, back_populates="courses")
     enrolled_students = relationship("User", secondary=course_enrollments, back_populates="enrolled_courses")
     progress_records = relationship("LearningProgress", back_populates="course")
+    
+    # Full-text search document (maintained by a database trigger, never loaded by default)
+    search_vector = deferred(Column(SearchVector))
+    
+    __table_args__ = (
+        Index("ix_courses_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        _skill_ids_index("courses", "related_skills"),
+        # Public catalog pages: WHERE is_active ORDER BY id
+        Index("ix_courses_active_id", "id", postgresql_where=is_active == True).ddl_if(dialect="postgresql"),
+    )
 
 
 class LearningProgress(Base):
@@ -256,7 +326,7 @@ class Job(Base):
     experience_level = Column(String(50))  # entry, mid, senior
     
     # Skills required (JSON array of skill IDs)
-    required_skills = Column(Text)  # JSON array
+    required_skills = Column(SkillIdArray)  # JSON array
     
     # Application details
     application_url = Column(String(500))
@@ -270,6 +340,16 @@ class Job(Base):
     applications_count = Column(Integer, default=0)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    # Full-text search document (maintained by a database trigger, never loaded by default)
+    search_vector = deferred(Column(SearchVector))
+    
+    __table_args__ = (
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        _skill_ids_index("jobs", "required_skills"),
+        # Public job board pages: WHERE is_active ORDER BY id
+        Index("ix_jobs_active_id", "id", postgresql_where=is_active == True).ddl_if(dialect="postgresql"),
+    )
 
 
 class AdminLog(Base):
@@ -311,7 +391,7 @@ class UserResume(Base):
     education = Column(Text)  # JSON array: [{"degree": "...", "institution": "...", "field": "...", ...}]
     
     # Skills (JSON array of skill IDs from admin-defined skills table)
-    skills = Column(Text)  # JSON array of skill IDs: [1, 2, 3]
+    skills = Column(SkillIdArray)  # JSON array of skill IDs: [1, 2, 3]
     
     # Tools/Technologies (JSON array of strings)
     tools = Column(Text)  # JSON array: ["React", "Node.js", "MongoDB"]
@@ -324,7 +404,8 @@ class UserResume(Base):
     
     # PDF CV file storage
     cv_pdf_filename = Column(String(500))  # Filename of uploaded PDF
-    cv_pdf_path = Column(String(1000))  # Server path to PDF file
+    cv_pdf_path = Column(String(1000))  # Blob store key (legacy rows: server path to PDF file)
+    cv_pdf_sha256 = Column(String(64), index=True)  # Content hash of the PDF (cv_blobs.sha256)
     
     # Metadata
     created_at = Column(DateTime, server_default=func.now())
@@ -332,6 +413,10 @@ class UserResume(Base):
     
     # Relationships
     user = relationship("User", backref="resume")
+    
+    __table_args__ = (
+        _skill_ids_index("user_resumes", "skills"),
+    )
 
 
 class CareerBotSession(Base):
@@ -342,16 +427,24 @@ class CareerBotSession(Base):
     __tablename__ = "careerbot_sessions"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     
     # Session details
     title = Column(String(255), default="New Chat")  # Conversation title
     
+    # Denormalized sidebar data (maintained when messages are inserted)
+    message_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_message_preview = Column(String(255))
+    
     # Metadata
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     last_message_at = Column(DateTime, server_default=func.now())  # For sorting
     
+    __table_args__ = (
+        Index("ix_careerbot_sessions_user_id_last_message_at", "user_id", last_message_at.desc()),
+    )
+    
     # Relationships
     user = relationship("User", backref="careerbot_sessions")
     messages = relationship("CareerBotConversation", back_populates="session", cascade="all, delete-orphan")
@@ -366,7 +459,7 @@ class CareerBotConversation(Base):
     __tablename__ = "careerbot_conversations"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
     session_id = Column(Integer, ForeignKey('careerbot_sessions.id', ondelete='CASCADE'), nullable=False, index=True)
     
     # Message details
@@ -378,6 +471,13 @@ class CareerBotConversation(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
+    __table_args__ = (
+        # Session history pages: WHERE user_id = ? AND session_id = ? ORDER BY created_at, id
+        Index("ix_careerbot_conversations_history", "user_id", "session_id", "created_at", "id"),
+        # All-sessions history pages: WHERE user_id = ? ORDER BY created_at, id
+        Index("ix_careerbot_conversations_user_recent", "user_id", "created_at", "id"),
+    )
+    
     # Relationships
     user = relationship("User", backref="careerbot_conversations")
     session = relationship("CareerBotSession", back_populates="messages")
@@ -435,7 +535,7 @@ class LocalOpportunity(Base):
     target_track = Column(String(255), nullable=True, index=True)  # e.g., "Frontend", "Data Science", "Cybersecurity"
     
     # Requirements
-    required_skills = Column(Text)  # JSON array of skill IDs or skill names
+    required_skills = Column(SkillIdArray)  # JSON array of skill IDs
     
     # Application details
     link = Column(String(1000), nullable=True)  # URL to apply or learn more
@@ -446,4 +546,85 @@ class LocalOpportunity(Base):
     # Metadata
     is_active = Column(Boolean, default=True, index=True)
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    # Full-text search document (maintained by a database trigger, never loaded by default)
+    search_vector = deferred(Column(SearchVector))
+    
+    __table_args__ = (
+        Index(
+            "ix_local_opportunities_search_vector", "search_vector", postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        _skill_ids_index("local_opportunities", "required_skills"),
+    )
+
+class DashboardStatRollup(Base):
+    """
+    Pre-aggregated counters for the admin dashboard
+    One row per metric, kept current incrementally by signups, course/skill
+    changes and enrollments, and periodically reconciled from the source tables
+    """
+    __tablename__ = "dashboard_stat_rollups"
+
+    metric = Column(String(100), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+    period_start = Column(DateTime, nullable=True)  # Month the value belongs to (monthly metrics only)
+    
+    # Metadata
+    refreshed_at = Column(DateTime, server_default=func.now())  # Last full recompute from source tables
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class CVBlob(Base):
+    """
+    Content-addressed CV file in the blob store
+    Identical uploads share one object; ref_count tracks how many resumes
+    point at it and the object is deleted when it drops to zero
+    """
+    __tablename__ = "cv_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    storage_key = Column(String(500), nullable=False)  # Key in the configured blob store
+    size_bytes = Column(Integer, nullable=False)
+    content_type = Column(String(100), nullable=False, default="application/pdf")
+    ref_count = Column(Integer, nullable=False, default=0)
+    
+    # Metadata
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class OpportunityExplanation(Base):
+    """
+    Cached Gemini explanation of a user's opportunity recommendations
+    One row per user, reused while the cache key (hash of the user context,
+    the selected opportunities' ids/updated_at and the language) is unchanged
+    """
+    __tablename__ = "opportunity_explanations"
+
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    cache_key = Column(String(64), nullable=False)  # SHA-256 of the generation inputs
+    language = Column(String(10))
+    explanation = Column(Text, nullable=False)
+    
+    # Metadata
+    generated_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class CatalogVersion(Base):
+    """
+    Change counter for a public catalog (courses, skills, jobs)
+    Bumped in the same transaction as every admin create/update/delete and
+    used to build the ETag of the public catalog endpoints
+    """
+    __tablename__ = "catalog_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    
+    # Metadata
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+_search_vector_ddl(Course.__table__, COURSE_SEARCH_FIELDS)
+_search_vector_ddl(Job.__table__, JOB_SEARCH_FIELDS)
+_search_vector_ddl(LocalOpportunity.__table__, OPPORTUNITY_SEARCH_FIELDS)
@@ -0,0 +1,129 @@
+"""
+Cursor pagination helpers for SkillSync
+Opaque keyset cursors shared by list endpoints
+
+List endpoints page with `paginate`: rows come back in a fixed order over a
+unique sort key, the cursor for the following page is returned in the
+X-Next-Cursor header, and a request with ?cursor= seeks straight to it
+through the index, so page 1000 costs the same as page 1. The old
+skip/limit parameters still work (skip is ignored when a cursor is given).
+
+Response bodies stay plain JSON arrays, so cursors travel in headers only.
+Every cursor header is listed in CURSOR_HEADERS, which the app passes to
+CORS expose_headers; without that, browser clients on another origin could
+not read them.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Largest page a list endpoint returns (the `limit` query parameter's upper bound)
+MAX_PAGE_SIZE = 500
+# Neighbouring-page cursors of bidirectional lists (CareerBot history)
+BEFORE_CURSOR_HEADER = "X-Before-Cursor"
+AFTER_CURSOR_HEADER = "X-After-Cursor"
+# Response headers carrying cursors; all of them must be exposed through CORS
+CURSOR_HEADERS = [NEXT_CURSOR_HEADER, BEFORE_CURSOR_HEADER, AFTER_CURSOR_HEADER]
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort-key values of a row into an opaque cursor string.
+
+    Args:
+        values: Sort-key values in order (datetimes are stored as ISO strings)
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> List[Any]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor: Cursor string from a previous response
+        types: Expected type of each value (int, str or datetime)
+
+    Returns:
+        List of sort-key values converted to the expected types
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor has the wrong shape")
+        return [
+            datetime.fromisoformat(value) if expected is datetime else expected(value)
+            for value, expected in zip(values, types)
+        ]
+    except (ValueError, TypeError, UnicodeError, json.JSONDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def paginate(
+    query,
+    sort_columns: Sequence,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    skip: int = 0,
+    descending: bool = False
+) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page of `query` in keyset order.
+
+    Args:
+        query: Query to page (its selection must include every sort column)
+        sort_columns: Columns forming a unique sort key, e.g. (Model.id,)
+            or (Model.created_at, Model.id)
+        cursor: Cursor from a previous page's X-Next-Cursor header
+        limit: Page size
+        skip: Legacy offset, only used without a cursor
+        descending: Newest/highest first
+
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        HTTPException: 400 if limit is below 1 or the cursor is malformed
+    """
+    if limit < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be at least 1"
+        )
+
+    key = sort_columns[0] if len(sort_columns) == 1 else tuple_(*sort_columns)
+    if cursor:
+        values = decode_cursor(cursor, *(column.type.python_type for column in sort_columns))
+        bound = values[0] if len(values) == 1 else tuple_(*values)
+        query = query.filter(key < bound if descending else key > bound)
+
+    query = query.order_by(*(column.desc() if descending else column.asc() for column in sort_columns))
+    if skip and not cursor:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*(getattr(rows[-1], column.key) for column in sort_columns))
+
+
+def next_cursor_headers(next_cursor: Optional[str]) -> dict:
+    """Response headers announcing the next page (empty on the last page)"""
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
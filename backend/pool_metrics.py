@@ -0,0 +1,180 @@
+"""
+Connection pool metrics for SkillSync
+Checkout wait times, overflow and timeouts of the SQLAlchemy pools
+
+database.py builds its engines with MeteredQueuePool (or MeteredNullPool in
+PgBouncer mode with DB_NULL_POOL). They time every checkout, from asking the
+pool for a connection to getting one (waiting for a free connection and
+opening a new one both count), and count checkout timeouts and detected
+disconnects (e.g. a failed pre-ping after a database restart, which
+invalidates every pooled connection).
+
+Stats are kept per pool name (the engine's `pool_logging_name`) and exposed in
+the Prometheus text format by `GET /metrics` (METRICS_ENABLED=false hides it).
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import NullPool, QueuePool
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Checkout wait histogram buckets (seconds)
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+DEFAULT_POOL_NAME = "primary"
+
+
+class PoolStats:
+    """Counters for one named pool (thread-safe)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None  # Latest pool instance (engine.dispose() recreates it)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.disconnects = 0
+        self.wait_seconds_sum = 0.0
+        self.wait_buckets = [0] * len(CHECKOUT_WAIT_BUCKETS)
+        self.overflow_peak = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, wait_seconds: float, overflow: int):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_sum += wait_seconds
+            index = bisect_left(CHECKOUT_WAIT_BUCKETS, wait_seconds)
+            if index < len(self.wait_buckets):
+                self.wait_buckets[index] += 1
+            self.overflow_peak = max(self.overflow_peak, overflow)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_disconnect(self):
+        with self._lock:
+            self.disconnects += 1
+
+    def snapshot(self) -> Dict:
+        """Current counters and gauges"""
+        pool = self.pool
+        with self._lock:
+            snapshot = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "disconnects": self.disconnects,
+                "wait_seconds_sum": self.wait_seconds_sum,
+                "wait_buckets": list(self.wait_buckets),
+                "overflow_peak": self.overflow_peak,
+            }
+        if isinstance(pool, QueuePool):
+            snapshot.update({
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "overflow": _overflow(pool),
+            })
+        return snapshot
+
+
+_pool_stats: Dict[str, PoolStats] = {}
+_registry_lock = threading.Lock()
+
+
+def get_pool_stats(name: str) -> PoolStats:
+    with _registry_lock:
+        if name not in _pool_stats:
+            _pool_stats[name] = PoolStats(name)
+        return _pool_stats[name]
+
+
+def _overflow(pool: QueuePool) -> int:
+    # QueuePool.overflow() starts at -size; report only connections beyond pool_size
+    return max(0, pool.overflow())
+
+
+class _MeteredPool:
+    """Mixin timing `_do_get`, the step that waits for (or opens) a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats = get_pool_stats(self.logging_name or DEFAULT_POOL_NAME)
+        self._stats.pool = self
+
+    def _invalidate(self, *args, **kwargs):
+        # Called once per detected disconnect; invalidates every pooled connection
+        self._stats.record_disconnect()
+        return super()._invalidate(*args, **kwargs)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self._stats.record_timeout()
+            raise
+        overflow = _overflow(self) if isinstance(self, QueuePool) else 0
+        self._stats.record_checkout(time.perf_counter() - start, overflow)
+        return record
+
+
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    """QueuePool that records checkout wait, overflow and timeouts"""
+
+
+class MeteredNullPool(_MeteredPool, NullPool):
+    """NullPool (a new connection per checkout) that records connect times"""
+
+
+# ==================== Prometheus exposition ====================
+
+def _labels(name: str, **extra) -> str:
+    labels = {"pool": name, **extra}
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus() -> str:
+    """Pool metrics of every registered pool in the Prometheus text format"""
+    with _registry_lock:
+        stats = [stats for _, stats in sorted(_pool_stats.items())]
+
+    gauges = (
+        ("size", "Configured pool size"),
+        ("max_overflow", "Connections allowed beyond the pool size"),
+        ("checked_out", "Connections currently checked out"),
+        ("overflow", "Overflow connections currently open"),
+        ("overflow_peak", "Most overflow connections open at once since start"),
+    )
+    counters = (
+        ("checkouts", "Connections checked out of the pool"),
+        ("timeouts", "Checkouts that gave up after pool_timeout"),
+        ("disconnects", "Detected database disconnects (failed pre-ping or query), each resetting the pool"),
+    )
+
+    snapshots = [(item.name, item.snapshot()) for item in stats]
+    lines = []
+    for key, help_text in gauges:
+        metric = f"skillsync_db_pool_{key}"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        lines += [f"{metric}{_labels(name)} {snapshot[key]}" for name, snapshot in snapshots if key in snapshot]
+    for key, help_text in counters:
+        metric = f"skillsync_db_pool_{key}_total"
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        lines += [f"{metric}{_labels(name)} {snapshot[key]}" for name, snapshot in snapshots]
+
+    metric = "skillsync_db_pool_checkout_wait_seconds"
+    lines += [f"# HELP {metric} Time to get a connection from the pool", f"# TYPE {metric} histogram"]
+    for name, snapshot in snapshots:
+        cumulative = 0
+        for bound, count in zip(CHECKOUT_WAIT_BUCKETS, snapshot["wait_buckets"]):
+            cumulative += count
+            lines.append(f"{metric}_bucket{_labels(name, le=bound)} {cumulative}")
+        lines.append(f"{metric}_bucket{_labels(name, le='+Inf')} {snapshot['checkouts']}")
+        lines.append(f"{metric}_sum{_labels(name)} {snapshot['wait_seconds_sum']:.6f}")
+        lines.append(f"{metric}_count{_labels(name)} {snapshot['checkouts']}")
+    return "\n".join(lines) + "\n"
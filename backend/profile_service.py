@@ -6,6 +6,7 @@ from fastapi import HTTPException, status
 from datetime import datetime
 from models import User, Skill
 from schemas import UserProfileUpdate, UserProfile
+from services.user_context_service import bump_context_version
 import json
 
 
@@ -62,6 +63,7 @@ class ProfileService:
                 setattr(user, field, value)
         
         user.updated_at = datetime.utcnow()
+        bump_context_version(db, user_id)
         db.commit()
         db.refresh(user)
         
@@ -98,6 +100,7 @@ class ProfileService:
         if skill not in user.skills:
             user.skills.append(skill)
             user.updated_at = datetime.utcnow()
+            bump_context_version(db, user_id)
             db.commit()
             db.refresh(user)
         
@@ -126,6 +129,7 @@ class ProfileService:
         if skill and skill in user.skills:
             user.skills.remove(skill)
             user.updated_at = datetime.utcnow()
+            bump_context_version(db, user_id)
             db.commit()
             db.refresh(user)
         
@@ -168,6 +172,7 @@ class ProfileService:
         user = ProfileService.get_user_profile(db, user_id)
         user.career_interests = json.dumps(interests) if interests else None
         user.updated_at = datetime.utcnow()
+        bump_context_version(db, user_id)
         db.commit()
         db.refresh(user)
         return user
@@ -210,6 +215,7 @@ class ProfileService:
         user = ProfileService.get_user_profile(db, user_id)
         user.experience_description = experience
         user.updated_at = datetime.utcnow()
+        bump_context_version(db, user_id)
         db.commit()
         db.refresh(user)
         return user
@@ -230,6 +236,7 @@ class ProfileService:
         user = ProfileService.get_user_profile(db, user_id)
         user.cv_text = cv_text
         user.updated_at = datetime.utcnow()
+        bump_context_version(db, user_id)
         db.commit()
         db.refresh(user)
         return user
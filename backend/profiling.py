@@ -0,0 +1,168 @@
+"""
+Request profiling for SkillSync
+Per-request DB, LLM, serialization and total timings
+
+ProfilingMiddleware starts a RequestProfile for every HTTP request and keeps
+it in a context variable, which follows the request into threadpool workers.
+SQLAlchemy cursor events count and time every statement; the Gemini client
+and the JSON encoders report into the same profile with `timer()`.
+
+Each response gets a Server-Timing header (visible in browser dev tools) and
+a JSON log line is printed for requests that are slow or run more queries
+than PROFILING_QUERY_THRESHOLD, which makes N+1 patterns stand out. Set
+PROFILING_LOG=all to log every request.
+"""
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "true").lower() in ("1", "true", "yes")
+# Add a Server-Timing header to every response
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "true").lower() in ("1", "true", "yes")
+# Flag requests that run more SQL statements than this
+PROFILING_QUERY_THRESHOLD = int(os.getenv("PROFILING_QUERY_THRESHOLD", "20"))
+# Flag requests slower than this (milliseconds)
+PROFILING_SLOW_MS = float(os.getenv("PROFILING_SLOW_MS", "1000"))
+# "flagged" (default): log flagged requests only, "all": every request, "off": never
+PROFILING_LOG = os.getenv("PROFILING_LOG", "flagged").lower()
+
+# Timing categories reported besides the query count
+TIMING_CATEGORIES = ("db", "llm", "serialize")
+
+
+class RequestProfile:
+    """Timings collected for one request (milliseconds)"""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = dict.fromkeys(TIMING_CATEGORIES, 0.0)
+        self.query_count = 0
+        self.statements: Counter = Counter()
+
+    def add(self, category: str, elapsed_ms: float):
+        self.timings[category] = self.timings.get(category, 0.0) + elapsed_ms
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def flags(self, total_ms: float) -> list:
+        flags = []
+        if self.query_count > PROFILING_QUERY_THRESHOLD:
+            flags.append("query_count")
+        if total_ms > PROFILING_SLOW_MS:
+            flags.append("slow")
+        return flags
+
+    def server_timing(self, total_ms: float) -> str:
+        parts = [f'db;dur={self.timings["db"]:.1f};desc="{self.query_count} queries"']
+        parts.extend(
+            f"{category};dur={self.timings[category]:.1f}"
+            for category in TIMING_CATEGORIES[1:] if self.timings[category]
+        )
+        parts.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(parts)
+
+    def log_record(self, status_code: int, total_ms: float) -> Dict:
+        record = {
+            "event": "request_profile",
+            "method": self.method,
+            "path": self.path,
+            "status": status_code,
+            "total_ms": round(total_ms, 1),
+            "queries": self.query_count,
+            **{f"{category}_ms": round(self.timings[category], 1) for category in TIMING_CATEGORIES},
+            "flags": self.flags(total_ms),
+        }
+        if self.statements:
+            statement, count = self.statements.most_common(1)[0]
+            if count > 1:
+                # The statement issued most often is usually the N+1 culprit
+                record["most_repeated_query"] = {"count": count, "sql": statement[:200]}
+        return record
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Get the profile of the request being handled (None outside a request)"""
+    return _current_profile.get()
+
+
+@contextmanager
+def timer(category: str):
+    """Add the time spent in the block to the current request's `category`"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(category, (time.perf_counter() - start) * 1000)
+
+
+# ==================== SQLAlchemy hooks ====================
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profiling_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    starts = conn.info.get("profiling_query_start")
+    if profile is None or not starts:
+        return
+    profile.add("db", (time.perf_counter() - starts.pop()) * 1000)
+    profile.query_count += 1
+    profile.statements[statement] += 1
+
+
+# ==================== Middleware ====================
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles each HTTP request (see module docstring)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        token = _current_profile.set(profile)
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING_HEADER:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", profile.server_timing(profile.elapsed_ms()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            total_ms = profile.elapsed_ms()
+            if PROFILING_LOG == "all" or (PROFILING_LOG != "off" and profile.flags(total_ms)):
+                print(json.dumps(profile.log_record(status_code, total_ms)))
@@ -0,0 +1,95 @@
+"""
+Request body size limits for SkillSync
+
+Starlette parses multipart forms before the route runs, spooling every
+uploaded file to a temporary file. A size check inside the handler can
+therefore only refuse a file that has already been received in full. This
+middleware enforces the limit while the body is being received: requests
+whose Content-Length is over the limit are answered with 413 without
+reading the body, and chunked bodies are cut off as soon as they pass it.
+"""
+import json
+from typing import Dict
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Allowance for multipart boundaries and part headers on top of the file size (bytes)
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject request bodies larger than a per-path limit with 413 Payload Too Large.
+
+    Only the listed paths (exact matches) are limited; other requests pass
+    through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int]):
+        """
+        Args:
+            app: ASGI application
+            limits: Request path -> largest accepted body in bytes
+        """
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(send, limit)
+            return
+
+        received = 0
+        rejected = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    rejected = True
+                    if not response_started:
+                        await self._reject(send, limit)
+                    # The app sees a disconnected client and stops parsing the body
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message):
+            nonlocal response_started
+            if rejected:
+                return  # The 413 has been sent already
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+    @staticmethod
+    async def _reject(send: Send, limit: int):
+        body = json.dumps({
+            "detail": f"Request body exceeds {limit // (1024 * 1024)}MB limit"
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,148 @@
+"""
+Response helpers for SkillSync
+Fast JSON serialization for large list endpoints and response compression
+
+List endpoints query only the columns their response model needs and hand
+the row tuples to a precompiled Pydantic TypeAdapter, which validates and
+encodes them to JSON bytes in one pass (no ORM objects, no jsonable_encoder).
+orjson (if installed) is used for every other response, and bodies above a
+size threshold are compressed with brotli (if installed) or gzip.
+"""
+import os
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from profiling import timer
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as _BaseJSONResponse
+except ImportError:
+    _BaseJSONResponse = JSONResponse
+
+# Responses smaller than this are sent uncompressed (bytes)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Compression level (gzip 1-9); brotli uses its own default quality
+GZIP_COMPRESS_LEVEL = int(os.getenv("GZIP_COMPRESS_LEVEL", "6"))
+# Prefer brotli when the brotli-asgi package is installed
+COMPRESSION_BROTLI = os.getenv("COMPRESSION_BROTLI", "true").lower() in ("1", "true", "yes")
+
+# Paths whose responses are never compressed (already-compressed files, byte ranges)
+UNCOMPRESSED_PATH_PREFIXES: Tuple[str, ...] = ("/api/cv/pdf",)
+
+
+class DefaultJSONResponse(_BaseJSONResponse):
+    """orjson-backed (if installed) JSON response that reports its encoding time"""
+
+    def render(self, content) -> bytes:
+        with timer("serialize"):
+            return super().render(content)
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Get the (cached, precompiled) TypeAdapter for List[model]"""
+    return TypeAdapter(List[model])
+
+
+@lru_cache(maxsize=None)
+def _column_names(model: Type[BaseModel], orm_class) -> Tuple[str, ...]:
+    return tuple(name for name in model.model_fields if hasattr(orm_class, name))
+
+
+def response_columns(model: Type[BaseModel], orm_class) -> list:
+    """
+    Get the ORM columns needed to build `model`, for db.query(*columns).
+
+    Args:
+        model: Pydantic response model (from_attributes)
+        orm_class: SQLAlchemy model class the response is built from
+
+    Returns:
+        List of instrumented column attributes, in response-field order
+    """
+    return [getattr(orm_class, name) for name in _column_names(model, orm_class)]
+
+
+def serialize_rows(model: Type[BaseModel], rows: Sequence) -> bytes:
+    """Validate row tuples (or ORM objects) against `model` and encode a JSON array"""
+    adapter = list_adapter(model)
+    with timer("serialize"):
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def json_list_response(model: Type[BaseModel], rows: Iterable, headers: dict = None) -> Response:
+    """
+    Build a JSON list response straight from query rows.
+
+    Args:
+        model: Pydantic response model for each item
+        rows: Rows from db.query(*response_columns(model, OrmClass))
+        headers: Optional extra response headers
+
+    Returns:
+        Response with the encoded JSON body
+    """
+    return Response(
+        content=serialize_rows(model, list(rows)),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def etag_matches(header_value: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if header_value.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag.removeprefix("W/") for tag in header_value.split(","))
+
+
+def not_modified(request: Request, headers: dict) -> Optional[Response]:
+    """
+    Get a 304 Not Modified response if the request's If-None-Match matches
+    the ETag in `headers`, otherwise None.
+
+    Args:
+        request: Incoming request
+        headers: Response headers including "ETag" (sent along with the 304)
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Compress responses larger than `minimum_size`.
+
+    Uses brotli (with gzip fallback for clients that don't accept br) when
+    brotli-asgi is installed, plain gzip otherwise. Requests under
+    UNCOMPRESSED_PATH_PREFIXES bypass compression entirely.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.compressor = None
+        if COMPRESSION_BROTLI:
+            try:
+                from brotli_asgi import BrotliMiddleware
+                self.compressor = BrotliMiddleware(
+                    app, minimum_size=minimum_size, gzip_fallback=True
+                )
+            except ImportError:
+                pass
+        if self.compressor is None:
+            self.compressor = GZipMiddleware(app, minimum_size=minimum_size, compresslevel=GZIP_COMPRESS_LEVEL)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and not scope["path"].startswith(UNCOMPRESSED_PATH_PREFIXES):
+            await self.compressor(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
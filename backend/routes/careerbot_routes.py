@@ -1,21 +1,30 @@
 """
 CareerBot Routes - API endpoints for AI-powered career guidance
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 from pydantic import BaseModel
-from database import get_db
-from models import User, UserResume, Skill, CareerBotConversation, CareerBotSession
+from database import get_db, get_read_db, SessionLocal
+from models import User, CareerBotConversation, CareerBotSession
 from api_users import get_current_user
 from services.guardrail_service import filter_out_of_context, get_safe_fallback_response
 from services.language_service import detect_language
 from services.careerbot_service import get_career_bot_response
+from services.user_context_service import get_user_context
+from pagination import encode_cursor, decode_cursor, BEFORE_CURSOR_HEADER, AFTER_CURSOR_HEADER
 from datetime import datetime
 import json
 
 router = APIRouter(prefix="/api/careerbot", tags=["careerbot"])
 
+# History pagination
+HISTORY_DEFAULT_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+HISTORY_STREAM_BATCH_SIZE = 500
+
 
 # ==================== Request/Response Schemas ====================
 
@@ -45,6 +54,7 @@ class SessionResponse(BaseModel):
     updated_at: str
     last_message_at: str
     message_count: int
+    last_message_preview: Optional[str] = None
 
 
 class MessageResponse(BaseModel):
@@ -54,6 +64,31 @@ class MessageResponse(BaseModel):
     timestamp: str
 
 
+# ==================== Helpers ====================
+
+def _record_session_messages(session: CareerBotSession, count: int, last_message: str):
+    """
+    Update a session's denormalized sidebar fields for newly inserted messages.
+    The count is incremented in SQL so concurrent requests cannot lose updates.
+    """
+    session.message_count = CareerBotSession.message_count + count
+    session.last_message_preview = last_message[:255]
+    session.last_message_at = datetime.utcnow()
+
+
+def _session_response(session: CareerBotSession) -> SessionResponse:
+    """Build the API representation of a session from its stored columns"""
+    return SessionResponse(
+        id=session.id,
+        title=session.title,
+        created_at=session.created_at.isoformat() if session.created_at else None,
+        updated_at=session.updated_at.isoformat() if session.updated_at else None,
+        last_message_at=session.last_message_at.isoformat() if session.last_message_at else None,
+        message_count=session.message_count or 0,
+        last_message_preview=session.last_message_preview
+    )
+
+
 # ==================== CareerBot Endpoints ====================
 
 @router.post("/ask", response_model=CareerBotResponse)
@@ -131,8 +166,8 @@ async def ask_career_bot(
             )
             db.add(bot_response)
             
-            # Update session's last_message_at
-            session.last_message_at = datetime.utcnow()
+            # Update session's message count, preview and last_message_at
+            _record_session_messages(session, 2, safe_response)
             
             db.commit()
             
@@ -147,34 +182,15 @@ async def ask_career_bot(
         # 3. Detect message language
         detected_language = detect_language(sanitized_message)
         
-        # 4. Fetch user profile data
-        # User model already has: full_name, experience_level, career_interests, etc.
-        user_profile = current_user
-        
-        # 5. Fetch user skills (from user_skills junction table)
-        # Query directly from the junction table to ensure we get all skills reliably
-        from models import user_skills as user_skills_table
-        skill_ids_result = db.query(user_skills_table.c.skill_id).filter(
-            user_skills_table.c.user_id == current_user.id
-        ).all()
-        
-        user_skills = []
-        if skill_ids_result:
-            skill_ids_list = [row[0] for row in skill_ids_result]
-            if skill_ids_list:
-                user_skills = db.query(Skill).filter(Skill.id.in_(skill_ids_list)).all()
-        
-        # 6. Fetch user CV data
-        user_cv = db.query(UserResume).filter(
-            UserResume.user_id == current_user.id
-        ).first()
+        # 4-6. Load profile, skills and CV from the cached context snapshot
+        user_context = get_user_context(db, current_user)
         
         # 7. Build context and call Gemini API
         bot_reply = get_career_bot_response(
             message=sanitized_message,
-            user_profile=user_profile,
-            user_skills=user_skills,
-            user_cv=user_cv,
+            user_profile=user_context["profile"],
+            user_skills=user_context["skills"],
+            user_cv=user_context["cv"],
             language=detected_language
         )
         
@@ -199,8 +215,8 @@ async def ask_career_bot(
         )
         db.add(bot_msg_record)
         
-        # Update session's last_message_at
-        session.last_message_at = datetime.utcnow()
+        # Update session's message count, preview and last_message_at
+        _record_session_messages(session, 2, bot_reply)
         
         # Auto-generate title from first user message if still "New Chat"
         if session.title == "New Chat":
@@ -229,9 +245,14 @@ async def ask_career_bot(
 
 @router.get("/history")
 async def get_conversation_history(
+    response: Response,
     session_id: Optional[int] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = HISTORY_DEFAULT_PAGE_SIZE,
+    format: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get conversation history for a specific session or all conversations.
@@ -239,13 +260,26 @@ async def get_conversation_history(
     If session_id is provided, returns messages for that session only.
     Otherwise, returns all conversations for the user.
     
+    Keyset-paginated on (created_at, id), across sessions when session_id is omitted:
+    - no cursor: the most recent `limit` messages
+    - before: messages older than the cursor
+    - after: messages newer than the cursor
+    Cursors for the neighbouring pages are returned in the X-Before-Cursor and
+    X-After-Cursor headers (absent when there is nothing more in that direction).
+    
+    With format=ndjson the whole history (optionally limited by a before or
+    after cursor) is streamed oldest first as newline-delimited JSON for
+    exports, with flat memory use.
+    
     Protected route - returns user's own conversation history only.
     Returns messages in chronological order (oldest first) for proper chat display.
     """
     try:
-        query = db.query(CareerBotConversation).filter(
-            CareerBotConversation.user_id == current_user.id
-        )
+        if before and after:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Use either 'before' or 'after', not both"
+            )
         
         if session_id:
             # Verify session belongs to user
@@ -258,21 +292,43 @@ async def get_conversation_history(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Session not found"
                 )
+        
+        if format == "ndjson":
+            before_key = decode_cursor(before, *_HISTORY_CURSOR_TYPES) if before else None
+            after_key = decode_cursor(after, *_HISTORY_CURSOR_TYPES) if after else None
+            return StreamingResponse(
+                _stream_history_ndjson(current_user.id, session_id, before_key, after_key),
+                media_type="application/x-ndjson"
+            )
+        
+        limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+        
+        query = db.query(CareerBotConversation).filter(
+            CareerBotConversation.user_id == current_user.id
+        )
+        if session_id:
             query = query.filter(CareerBotConversation.session_id == session_id)
         
-        conversations = query.order_by(
-            CareerBotConversation.created_at.asc()  # Oldest first for chat display
-        ).all()
+        if after:
+            query = query.filter(_HISTORY_KEY > tuple_(*decode_cursor(after, *_HISTORY_CURSOR_TYPES)))
+            rows = query.order_by(*_HISTORY_ORDER_ASC).limit(limit + 1).all()
+            has_newer = len(rows) > limit
+            rows = rows[:limit]
+            has_older = True
+        else:
+            if before:
+                query = query.filter(_HISTORY_KEY < tuple_(*decode_cursor(before, *_HISTORY_CURSOR_TYPES)))
+            rows = query.order_by(*_HISTORY_ORDER_DESC).limit(limit + 1).all()
+            has_older = len(rows) > limit
+            rows = list(reversed(rows[:limit]))  # Oldest first for chat display
+            has_newer = before is not None
+        
+        if rows and has_older:
+            response.headers[BEFORE_CURSOR_HEADER] = _history_cursor(rows[0])
+        if rows and has_newer:
+            response.headers[AFTER_CURSOR_HEADER] = _history_cursor(rows[-1])
         
-        return [
-            {
-                "role": conv.role,
-                "message": conv.message,
-                "language": conv.language,
-                "timestamp": conv.created_at.isoformat() if conv.created_at else None
-            }
-            for conv in conversations
-        ]
+        return [_history_item(conv) for conv in rows]
         
     except HTTPException:
         raise
@@ -284,16 +340,75 @@ async def get_conversation_history(
         )
 
 
+# Chronological across sessions: a session's messages interleave with the
+# user's other sessions ordered by time, not grouped by session id
+_HISTORY_KEY = tuple_(CareerBotConversation.created_at, CareerBotConversation.id)
+_HISTORY_CURSOR_TYPES = (datetime, int)
+_HISTORY_ORDER_ASC = (
+    CareerBotConversation.created_at.asc(),
+    CareerBotConversation.id.asc()
+)
+_HISTORY_ORDER_DESC = (
+    CareerBotConversation.created_at.desc(),
+    CareerBotConversation.id.desc()
+)
+
+
+def _history_item(conv: CareerBotConversation) -> Dict:
+    return {
+        "role": conv.role,
+        "message": conv.message,
+        "language": conv.language,
+        "timestamp": conv.created_at.isoformat() if conv.created_at else None
+    }
+
+
+def _history_cursor(conv: CareerBotConversation) -> str:
+    return encode_cursor(conv.created_at, conv.id)
+
+
+def _stream_history_ndjson(
+    user_id: int,
+    session_id: Optional[int],
+    before_key: Optional[list],
+    after_key: Optional[list]
+):
+    """
+    Yield history rows as NDJSON lines.
+    Uses its own session because the request-scoped one is closed before
+    the streaming body is sent.
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(CareerBotConversation).filter(
+            CareerBotConversation.user_id == user_id
+        )
+        if session_id:
+            query = query.filter(CareerBotConversation.session_id == session_id)
+        if before_key:
+            query = query.filter(_HISTORY_KEY < tuple_(*before_key))
+        if after_key:
+            query = query.filter(_HISTORY_KEY > tuple_(*after_key))
+        
+        for conv in query.order_by(*_HISTORY_ORDER_ASC).yield_per(HISTORY_STREAM_BATCH_SIZE):
+            item = _history_item(conv)
+            item["session_id"] = conv.session_id
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+    finally:
+        db.close()
+
+
 # ==================== Session Management Endpoints ====================
 
 @router.get("/sessions", response_model=List[SessionResponse])
 async def get_sessions(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all conversation sessions for the current user.
     Returns sessions sorted by last_message_at (most recent first).
+    Message counts and previews are stored on the session, so this is a single query.
     """
     try:
         sessions = db.query(CareerBotSession).filter(
@@ -302,22 +417,7 @@ async def get_sessions(
             CareerBotSession.last_message_at.desc()
         ).all()
         
-        result = []
-        for session in sessions:
-            message_count = db.query(CareerBotConversation).filter(
-                CareerBotConversation.session_id == session.id
-            ).count()
-            
-            result.append(SessionResponse(
-                id=session.id,
-                title=session.title,
-                created_at=session.created_at.isoformat() if session.created_at else None,
-                updated_at=session.updated_at.isoformat() if session.updated_at else None,
-                last_message_at=session.last_message_at.isoformat() if session.last_message_at else None,
-                message_count=message_count
-            ))
-        
-        return result
+        return [_session_response(session) for session in sessions]
         
     except Exception as e:
         print(f"Error fetching sessions: {e}")
@@ -345,14 +445,7 @@ async def create_session(
         db.commit()
         db.refresh(session)
         
-        return SessionResponse(
-            id=session.id,
-            title=session.title,
-            created_at=session.created_at.isoformat() if session.created_at else None,
-            updated_at=session.updated_at.isoformat() if session.updated_at else None,
-            last_message_at=session.last_message_at.isoformat() if session.last_message_at else None,
-            message_count=0
-        )
+        return _session_response(session)
         
     except Exception as e:
         print(f"Error creating session: {e}")
@@ -390,18 +483,7 @@ async def update_session(
         db.commit()
         db.refresh(session)
         
-        message_count = db.query(CareerBotConversation).filter(
-            CareerBotConversation.session_id == session.id
-        ).count()
-        
-        return SessionResponse(
-            id=session.id,
-            title=session.title,
-            created_at=session.created_at.isoformat() if session.created_at else None,
-            updated_at=session.updated_at.isoformat() if session.updated_at else None,
-            last_message_at=session.last_message_at.isoformat() if session.last_message_at else None,
-            message_count=message_count
-        )
+        return _session_response(session)
         
     except HTTPException:
         raise
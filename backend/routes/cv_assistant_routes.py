@@ -7,12 +7,12 @@ from sqlalchemy.orm import Session
 from typing import Optional, Dict, List
 from pydantic import BaseModel
 from database import get_db
-from models import User, Skill
+from models import User
 from api_users import get_current_user
 from services.cv_service import CVService
 from services.cv_assistant_service import CVAssistantService
 from profile_service import ProfileService
-import json
+from services.user_context_service import get_user_context, bump_context_version
 
 router = APIRouter(prefix="/api/cv-assistant", tags=["cv-assistant"])
 
@@ -66,29 +66,25 @@ class KeywordsResponse(BaseModel):
 
 # ==================== Helper Functions ====================
 
-def get_user_profile_data(user: User) -> Dict:
-    """Extract profile data from user object"""
-    career_interests = []
-    if user.career_interests:
-        try:
-            career_interests = json.loads(user.career_interests)
-        except (json.JSONDecodeError, TypeError):
-            pass
+def get_user_profile_data(db: Session, user: User) -> Dict:
+    """Extract profile data from the user's cached context snapshot"""
+    profile = get_user_context(db, user)["profile"]
     
     return {
-        "full_name": user.full_name or "",
-        "bio": user.bio or "",
-        "experience_level": getattr(user, "experience_level", "mid") or "mid",
-        "career_interests": career_interests,
-        "experience_description": user.experience_description or ""
+        "full_name": profile["full_name"],
+        "bio": profile["bio"],
+        "experience_level": profile["experience_level"] or "mid",
+        "career_interests": profile["career_interests"],
+        "experience_description": profile["experience_description"]
     }
 
 
-def get_user_cv_data(db: Session, user_id: int) -> Dict:
-    """Get user's CV data with skills populated"""
-    resume = CVService.get_user_resume(db, user_id)
+def get_user_cv_data(db: Session, user: User) -> Dict:
+    """Get user's CV data with skills populated (from the cached context snapshot)"""
+    user_context = get_user_context(db, user)
+    cv_data = user_context["cv"]
     
-    if not resume:
+    if not cv_data:
         return {
             "personal_summary": "",
             "experiences": [],
@@ -98,16 +94,8 @@ def get_user_cv_data(db: Session, user_id: int) -> Dict:
             "projects": []
         }
     
-    # Parse CV data
-    cv_data = CVService.format_resume_response(resume)
-    
-    # Get full skill objects
-    skill_ids = cv_data.get('skills', [])
-    if skill_ids:
-        skills = db.query(Skill).filter(Skill.id.in_(skill_ids)).all()
-        cv_data['skills'] = [{"id": s.id, "name": s.name} for s in skills]
-    else:
-        cv_data['skills'] = []
+    # Replace skill IDs with {"id", "name"} objects
+    cv_data["skills"] = user_context["cv_skills"]
     
     return cv_data
 
@@ -125,8 +113,8 @@ async def generate_professional_summary(
     Returns a 3-4 sentence professional summary optimized for resumes/CVs
     """
     try:
-        profile_data = get_user_profile_data(current_user)
-        cv_data = get_user_cv_data(db, current_user.id)
+        profile_data = get_user_profile_data(db, current_user)
+        cv_data = get_user_cv_data(db, current_user)
         
         summary = CVAssistantService.generate_professional_summary(profile_data, cv_data)
         
@@ -153,7 +141,7 @@ async def improve_bullet_points(
     Uses AI to create strong, impactful bullet points following best practices
     """
     try:
-        cv_data = get_user_cv_data(db, current_user.id)
+        cv_data = get_user_cv_data(db, current_user)
         experiences = cv_data.get('experiences', [])
         
         if request.experience_index < 0 or request.experience_index >= len(experiences):
@@ -191,7 +179,7 @@ async def improve_project_description(
     Uses AI to create compelling project descriptions
     """
     try:
-        cv_data = get_user_cv_data(db, current_user.id)
+        cv_data = get_user_cv_data(db, current_user)
         projects = cv_data.get('projects', [])
         
         if request.project_index < 0 or request.project_index >= len(projects):
@@ -229,8 +217,8 @@ async def get_linkedin_suggestions(
     Provides recommendations for headline, about section, and general profile tips
     """
     try:
-        profile_data = get_user_profile_data(current_user)
-        cv_data = get_user_cv_data(db, current_user.id)
+        profile_data = get_user_profile_data(db, current_user)
+        cv_data = get_user_cv_data(db, current_user)
         
         suggestions = CVAssistantService.suggest_linkedin_improvements(profile_data, cv_data)
         
@@ -253,8 +241,8 @@ async def get_portfolio_suggestions(
     Provides recommendations for structure, content, and design
     """
     try:
-        profile_data = get_user_profile_data(current_user)
-        cv_data = get_user_cv_data(db, current_user.id)
+        profile_data = get_user_profile_data(db, current_user)
+        cv_data = get_user_cv_data(db, current_user)
         
         suggestions = CVAssistantService.suggest_portfolio_improvements(profile_data, cv_data)
         
@@ -277,7 +265,7 @@ async def analyze_cv_completeness(
     Returns a completeness score and specific recommendations
     """
     try:
-        cv_data = get_user_cv_data(db, current_user.id)
+        cv_data = get_user_cv_data(db, current_user)
         
         analysis = CVAssistantService.analyze_cv_completeness(cv_data)
         
@@ -301,7 +289,7 @@ async def get_cv_keywords(
     Generates relevant keywords based on CV content and optional target role
     """
     try:
-        cv_data = get_user_cv_data(db, current_user.id)
+        cv_data = get_user_cv_data(db, current_user)
         
         keywords = CVAssistantService.generate_cv_keywords(cv_data, target_role)
         
@@ -337,6 +325,7 @@ async def apply_generated_summary(
             )
         
         resume.personal_summary = summary
+        bump_context_version(db, current_user.id)
         db.commit()
         
         return {
@@ -1,26 +1,74 @@
 """
 CV Routes - API endpoints for CV/Resume management
 """
+import uuid
+from contextlib import nullcontext
 from pathlib import Path
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional, Tuple
 from database import get_db
-from models import User, UserResume
-from schemas import CVCreate, CVResponse, SuccessResponse
+from models import User
+from schemas import CVCreate, CVResponse, DetectedSkill, SuccessResponse
 from api_users import get_current_user
-from services.cv_service import CVService
+from services.cv_service import (
+    CVService, save_pdf_upload, remove_file_quietly, match_skills_to_database, extract_resume_skills
+)
+from services.blob_store import get_blob_store, get_staging_dir
 from services.gemini_service import analyze_cv_pdf
-from models import Skill
 from profile_service import ProfileService
+from responses import not_modified
 
 router = APIRouter(prefix="/api/cv", tags=["cv"])
 
-# Directory to store uploaded CV PDFs
-CV_UPLOAD_DIR = Path("uploads/cv_pdfs")
-CV_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def _parse_byte_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=start-end" Range header against an object size
+    
+    Returns:
+        (start, end) inclusive, or None when the header should be ignored
+        (malformed or multi-range) and the whole file served
+    
+    Raises:
+        HTTPException: 416 if the range cannot be satisfied
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # Suffix range: the last N bytes
+            suffix_length = int(end_text)
+            if suffix_length <= 0:
+                raise ValueError
+            start = max(size - suffix_length, 0)
+            end = size - 1
+    except ValueError:
+        return None
+    
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, min(end, size - 1)
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
 
 
 # ==================== CV Endpoints ====================
@@ -77,6 +125,25 @@ async def get_my_cv(
     return formatted_resume
 
 
+@router.get("/me/detected-skills", response_model=List[DetectedSkill])
+def get_my_detected_skills(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Skills mentioned in the current user's CV text, experience description
+    and project descriptions/technologies, most mentioned first
+    Protected route - requires valid JWT token
+    
+    Runs locally (no Gemini call); in_resume marks skills the CV already lists
+    """
+    resume = CVService.get_user_resume(db, current_user.id)
+    detected = extract_resume_skills(current_user, resume, db)
+    
+    resume_skills = set(resume.skills or []) if resume else set()
+    return [{**skill, "in_resume": skill["skill_id"] in resume_skills} for skill in detected]
+
+
 @router.delete("/reset", response_model=SuccessResponse)
 async def reset_cv(
     current_user: User = Depends(get_current_user),
@@ -88,7 +155,7 @@ async def reset_cv(
     
     This allows users to start over with a fresh CV
     """
-    deleted = CVService.delete_resume(db, current_user.id)
+    deleted = await run_in_threadpool(CVService.delete_resume, db, current_user.id)
     
     if not deleted:
         raise HTTPException(
@@ -116,63 +183,34 @@ async def upload_cv_pdf(
     
     - Only PDF files are allowed
     - User can only have one PDF at a time
-    - Previous PDF will be deleted if a new one is uploaded
+    - Identical files are stored once (addressed by SHA-256)
+    - Previous PDF is deleted once no resume references it
     """
     # Validate file type
-    if not file.filename.endswith('.pdf'):
+    if not file.filename or not file.filename.lower().endswith('.pdf'):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only PDF files are allowed"
         )
     
-    # Check file size (max 10MB)
-    file_content = await file.read()
-    if len(file_content) > 10 * 1024 * 1024:  # 10MB
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File size exceeds 10MB limit"
-        )
+    # Stream to a staging file in chunks (size limit, PDF check and hashing happen on the fly)
+    staged_path = get_staging_dir() / f"{uuid.uuid4().hex}.pdf"
+    saved = await save_pdf_upload(file, staged_path)
     
-    # Get or create user resume
-    resume = CVService.get_user_resume(db, current_user.id)
-    
-    # Delete existing PDF if it exists
-    if resume and resume.cv_pdf_path:
-        old_pdf_path = Path(resume.cv_pdf_path)
-        if old_pdf_path.exists():
-            old_pdf_path.unlink()
-    
-    # Generate unique filename
-    file_extension = Path(file.filename).suffix
-    unique_filename = f"cv_{current_user.id}_{int(datetime.utcnow().timestamp())}{file_extension}"
-    file_path = CV_UPLOAD_DIR / unique_filename
-    
-    # Save file
-    with open(file_path, "wb") as buffer:
-        buffer.write(file_content)
-    
-    # Update or create resume record
-    if resume:
-        resume.cv_pdf_filename = file.filename
-        resume.cv_pdf_path = str(file_path)
-    else:
-        # Create new resume record for PDF only
-        resume = UserResume(
-            user_id=current_user.id,
-            cv_pdf_filename=file.filename,
-            cv_pdf_path=str(file_path)
-        )
-        db.add(resume)
-    
-    db.commit()
-    db.refresh(resume)
+    # Store (or reuse) the content-addressed blob and point the resume at it
+    try:
+        await run_in_threadpool(CVService.attach_pdf, db, current_user.id, file.filename, saved)
+    finally:
+        # Already moved into the store or discarded on success
+        await run_in_threadpool(remove_file_quietly, saved["path"])
     
     return {
         "success": True,
         "message": f"CV PDF uploaded successfully: {file.filename}",
         "data": {
             "filename": file.filename,
-            "size": len(file_content)
+            "size": saved["size"],
+            "sha256": saved["sha256"]
         }
     }
 
@@ -193,20 +231,23 @@ async def parse_cv_pdf(
             detail="No CV PDF found. Please upload a PDF first."
         )
     
-    pdf_path = Path(resume.cv_pdf_path)
-    if not pdf_path.exists():
+    blob = CVService.get_pdf_blob(db, resume)
+    store = get_blob_store()
+    if blob:
+        file_exists = await run_in_threadpool(store.exists, blob.storage_key)
+    else:
+        # Legacy upload stored at a local path
+        file_exists = Path(resume.cv_pdf_path).exists()
+    if not file_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="CV PDF file not found on server."
         )
 
-    # Get all available skills from the database to provide as context to Gemini
-    all_skills = db.query(Skill).all()
-    available_skill_names = [skill.name for skill in all_skills]
-    skill_name_to_id_map = {skill.name.lower(): skill.id for skill in all_skills}
-
-    # Call Gemini service to analyze the PDF with available skills context
-    extracted_data = analyze_cv_pdf(str(pdf_path), available_skills=available_skill_names)
+    # Call Gemini service to analyze the PDF
+    local_pdf = store.local_copy(blob.storage_key) if blob else nullcontext(resume.cv_pdf_path)
+    with local_pdf as pdf_path:
+        extracted_data = analyze_cv_pdf(str(pdf_path))
 
     if not extracted_data:
         raise HTTPException(
@@ -214,16 +255,9 @@ async def parse_cv_pdf(
             detail="Failed to parse CV with Gemini."
         )
 
-    # Convert skill names to skill IDs
-    # Gemini should now only return skills from the available list
-    skill_names = extracted_data.get('skills', [])
-    skill_ids = []
-    
-    if skill_names:
-        for skill_name in skill_names:
-            skill_name_lower = skill_name.lower().strip()
-            if skill_name_lower in skill_name_to_id_map:
-                skill_ids.append(skill_name_to_id_map[skill_name_lower])
+    # Map the skill and tool names Gemini found to admin-defined skill IDs
+    skill_names = list(extracted_data.get('skills') or []) + list(extracted_data.get('tools') or [])
+    skill_ids = match_skills_to_database([str(name) for name in skill_names], db)
     
     # Replace skill names with skill IDs
     extracted_data['skills'] = skill_ids
@@ -248,14 +282,18 @@ async def parse_cv_pdf(
     return formatted_resume
 
 
-@router.get("/pdf", response_class=FileResponse)
+@router.get("/pdf", response_class=StreamingResponse)
 async def download_cv_pdf(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Download current user's CV PDF
     Protected route - requires valid JWT token
+    
+    - ETag is the file's SHA-256; If-None-Match returns 304 Not Modified
+    - Supports single HTTP Range requests (206 Partial Content)
     """
     resume = CVService.get_user_resume(db, current_user.id)
     
@@ -265,17 +303,60 @@ async def download_cv_pdf(
             detail="No CV PDF found. Upload a PDF first."
         )
     
-    pdf_path = Path(resume.cv_pdf_path)
-    if not pdf_path.exists():
+    filename = resume.cv_pdf_filename or "cv.pdf"
+    blob = CVService.get_pdf_blob(db, resume)
+    
+    if not blob:
+        # Legacy upload stored at a local path
+        pdf_path = Path(resume.cv_pdf_path)
+        if not pdf_path.exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="CV PDF file not found on server"
+            )
+        return FileResponse(path=str(pdf_path), filename=filename, media_type="application/pdf")
+    
+    etag = f'"{blob.sha256}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # Private to the user; revalidate with the ETag instead of refetching
+        "Cache-Control": "private, no-cache",
+    }
+    
+    cached = not_modified(request, headers)
+    if cached:
+        return cached
+    
+    store = get_blob_store()
+    if not await run_in_threadpool(store.exists, blob.storage_key):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="CV PDF file not found on server"
         )
     
-    return FileResponse(
-        path=str(pdf_path),
-        filename=resume.cv_pdf_filename or "cv.pdf",
-        media_type="application/pdf"
+    size = blob.size_bytes
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
+        byte_range = _parse_byte_range(range_header, size)
+    
+    if byte_range:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    else:
+        start, end = 0, size - 1
+        status_code = status.HTTP_200_OK
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Disposition"] = _content_disposition(filename)
+    
+    return StreamingResponse(
+        store.iter_range(blob.storage_key, start, end),
+        status_code=status_code,
+        media_type="application/pdf",
+        headers=headers
     )
 
 
@@ -296,15 +377,8 @@ async def delete_cv_pdf(
             detail="No CV PDF found"
         )
     
-    # Delete file from filesystem
-    pdf_path = Path(resume.cv_pdf_path)
-    if pdf_path.exists():
-        pdf_path.unlink()
-    
-    # Clear PDF fields in database
-    resume.cv_pdf_filename = None
-    resume.cv_pdf_path = None
-    db.commit()
+    # Clear PDF fields and release the stored file
+    await run_in_threadpool(CVService.detach_pdf, db, resume)
     
     return {
         "success": True,
@@ -1,11 +1,11 @@
 """
 Opportunity Routes - API endpoints for local opportunity recommendations
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from database import get_db
-from models import User, UserResume, Skill, LocalOpportunity, UserRole
+from database import get_db, get_read_db
+from models import User, LocalOpportunity, UserRole
 from api_users import get_current_user
 from schemas import (
     LocalOpportunityCreate,
@@ -16,11 +16,18 @@ from schemas import (
 from services.opportunity_service import (
     build_user_context_for_opportunities,
     generate_opportunity_recommendations,
-    filter_opportunities_by_user_profile
+    build_explanation_cache_key,
+    get_cached_explanation,
+    save_explanation,
+    OPPORTUNITY_ERROR_MESSAGE
 )
+from services.opportunity_index import get_opportunity_index, invalidate_opportunity_index
 from services.language_service import detect_language
+from services.user_context_service import get_user_context
+from services.skill_array_service import resolve_skill_ids, skill_names_by_id
+from responses import response_columns, json_list_response
+from pagination import paginate, next_cursor_headers, MAX_PAGE_SIZE
 from datetime import datetime
-import json
 
 router = APIRouter(prefix="/api/opportunities", tags=["opportunities"])
 
@@ -29,6 +36,7 @@ router = APIRouter(prefix="/api/opportunities", tags=["opportunities"])
 
 @router.get("/recommend", response_model=OpportunityRecommendationResponse)
 async def get_opportunity_recommendations(
+    refresh: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -39,43 +47,31 @@ async def get_opportunity_recommendations(
     
     Steps:
     1. Fetch user profile, skills, and CV data
-    2. Fetch all active local opportunities
-    3. Filter opportunities based on user profile and skills
-    4. Generate personalized explanation using Gemini
+    2. Look up active opportunities in the in-memory skill/track index
+    3. Rank them by skill overlap, track and open-to-all priority group (top-K)
+    4. Reuse the cached explanation if the user context, selected
+       opportunities and language are unchanged (unless refresh=true),
+       otherwise generate a new one with Gemini
     5. Return ranked opportunities with explanations
     
     Returns:
         - explanation: Gemini-generated personalized text
         - opportunities: Ranked list of matching opportunities
         - total_matched: Count of matched opportunities
+        - generated_at: When the explanation was generated
+        - cached: Whether the explanation came from the cache
     """
     try:
-        # 1. Fetch user profile (current_user already has profile data)
-        user_profile = current_user
+        # 1-3. Load profile, skills and CV from the cached context snapshot
+        user_context_snapshot = get_user_context(db, current_user)
+        user_profile = user_context_snapshot["profile"]
+        user_skills = user_context_snapshot["skills"]
+        user_cv = user_context_snapshot["cv"]
         
-        # 2. Fetch user skills
-        from models import user_skills as user_skills_table
-        skill_ids_result = db.query(user_skills_table.c.skill_id).filter(
-            user_skills_table.c.user_id == current_user.id
-        ).all()
-        
-        user_skills = []
-        if skill_ids_result:
-            skill_ids_list = [row[0] for row in skill_ids_result]
-            if skill_ids_list:
-                user_skills = db.query(Skill).filter(Skill.id.in_(skill_ids_list)).all()
-        
-        # 3. Fetch user CV data
-        user_cv = db.query(UserResume).filter(
-            UserResume.user_id == current_user.id
-        ).first()
+        # 4. Get the in-memory skill/track index of active opportunities
+        opportunity_index = get_opportunity_index(db)
         
-        # 4. Fetch all active local opportunities
-        all_opportunities = db.query(LocalOpportunity).filter(
-            LocalOpportunity.is_active == True
-        ).all()
-        
-        if not all_opportunities:
+        if opportunity_index.size == 0:
             return OpportunityRecommendationResponse(
                 success=True,
                 explanation="Currently, there are no local opportunities available in our database. Please check back later or contact support for more information.",
@@ -83,22 +79,20 @@ async def get_opportunity_recommendations(
                 total_matched=0
             )
         
-        # 5. Filter opportunities based on user profile
+        # 5. Rank opportunities against the user profile (bounded top-K)
         # Get user's preferred track from career_interests or experience_description
         user_track = None
-        if current_user.career_interests:
-            try:
-                interests = json.loads(current_user.career_interests)
-                if interests and len(interests) > 0:
-                    user_track = interests[0]  # Use first career interest as track
-            except:
-                pass
+        if user_profile["career_interests"]:
+            user_track = user_profile["career_interests"][0]  # Use first career interest as track
         
-        filtered_opportunities = filter_opportunities_by_user_profile(
-            all_opportunities,
-            user_skills,
-            user_track
-        )
+        ranked, total_matched = opportunity_index.search(user_skills, user_track)
+        ranked_ids = [opp_id for opp_id, _ in ranked]
+        rows = db.query(LocalOpportunity).filter(
+            LocalOpportunity.id.in_(ranked_ids),
+            LocalOpportunity.is_active == True
+        ).all()
+        rows_by_id = {opp.id: opp for opp in rows}
+        filtered_opportunities = [rows_by_id[opp_id] for opp_id in ranked_ids if opp_id in rows_by_id]
         
         # 6. Build user context
         user_context = build_user_context_for_opportunities(
@@ -110,26 +104,43 @@ async def get_opportunity_recommendations(
         # 7. Detect language for Gemini response
         # Use a sample of user's text to detect language
         sample_text = ""
-        if current_user.experience_description:
-            sample_text = current_user.experience_description[:100]
-        elif user_cv and user_cv.personal_summary:
-            sample_text = user_cv.personal_summary[:100]
+        if user_profile["experience_description"]:
+            sample_text = user_profile["experience_description"][:100]
+        elif user_cv and user_cv["personal_summary"]:
+            sample_text = user_cv["personal_summary"][:100]
         
         detected_language = detect_language(sample_text) if sample_text else "en"
         
-        # 8. Generate personalized explanation using Gemini
-        explanation = generate_opportunity_recommendations(
-            user_context,
-            filtered_opportunities,
-            detected_language
-        )
+        # 8. Serve the cached explanation or generate a new one using Gemini
+        cache_key = build_explanation_cache_key(user_context, filtered_opportunities, detected_language)
+        # Serialize now; saving the explanation commits and would expire the rows
+        opportunity_items = [LocalOpportunityResponse.model_validate(opp) for opp in filtered_opportunities]
+        cached = None if refresh else get_cached_explanation(db, current_user.id, cache_key)
+        
+        if cached:
+            explanation = cached.explanation
+            generated_at = cached.generated_at
+        else:
+            explanation = generate_opportunity_recommendations(
+                user_context,
+                filtered_opportunities,
+                detected_language,
+                skill_names_by_id(db, [opp.required_skills for opp in filtered_opportunities])
+            )
+            generated_at = datetime.utcnow()
+            if explanation != OPPORTUNITY_ERROR_MESSAGE:
+                generated_at = save_explanation(
+                    db, current_user.id, cache_key, detected_language, explanation
+                ).generated_at
         
         # 9. Return response
         return OpportunityRecommendationResponse(
             success=True,
             explanation=explanation,
-            opportunities=filtered_opportunities,
-            total_matched=len(filtered_opportunities)
+            opportunities=opportunity_items,
+            total_matched=total_matched or len(opportunity_items),
+            generated_at=generated_at,
+            cached=cached is not None
         )
         
     except HTTPException:
@@ -156,19 +167,28 @@ async def get_admin_user(current_user: User = Depends(get_current_user)):
 
 @router.get("/all", response_model=List[LocalOpportunityResponse])
 async def get_all_opportunities(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all local opportunities (admin only).
     
     Protected route - requires admin JWT token.
+    Paginated by id; the next page cursor is returned in X-Next-Cursor.
     """
     try:
-        opportunities = db.query(LocalOpportunity).offset(skip).limit(limit).all()
-        return opportunities
+        opportunities, next_cursor = paginate(
+            db.query(*response_columns(LocalOpportunityResponse, LocalOpportunity)),
+            (LocalOpportunity.id,), cursor, limit, skip
+        )
+        return json_list_response(
+            LocalOpportunityResponse, opportunities, headers=next_cursor_headers(next_cursor)
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error fetching all opportunities: {e}")
         raise HTTPException(
@@ -188,12 +208,16 @@ async def create_opportunity(
     
     Protected route - requires admin JWT token.
     """
+    opportunity_fields = opportunity_data.dict()
+    opportunity_fields["required_skills"] = resolve_skill_ids(db, opportunity_fields["required_skills"])
+    
     try:
         # Create new opportunity
-        new_opportunity = LocalOpportunity(**opportunity_data.dict())
+        new_opportunity = LocalOpportunity(**opportunity_fields)
         db.add(new_opportunity)
         db.commit()
         db.refresh(new_opportunity)
+        invalidate_opportunity_index()
         
         return new_opportunity
     except Exception as e:
@@ -230,12 +254,15 @@ async def update_opportunity(
         
         # Update fields
         update_data = opportunity_data.dict(exclude_unset=True)
+        if "required_skills" in update_data:
+            update_data["required_skills"] = resolve_skill_ids(db, update_data["required_skills"])
         for field, value in update_data.items():
             setattr(opportunity, field, value)
         
         opportunity.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(opportunity)
+        invalidate_opportunity_index()
         
         return opportunity
     except HTTPException:
@@ -274,6 +301,7 @@ async def delete_opportunity(
         title = opportunity.title
         db.delete(opportunity)
         db.commit()
+        invalidate_opportunity_index()
         
         return {
             "success": True,
@@ -294,7 +322,7 @@ async def delete_opportunity(
 @router.get("/{opportunity_id}", response_model=LocalOpportunityResponse)
 async def get_opportunity(
     opportunity_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a specific opportunity by ID (public endpoint).
@@ -2,6 +2,7 @@
 Profile routes - user profile and skill management endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from database import get_db
@@ -9,6 +10,9 @@ from models import User, Skill
 from schemas import UserProfile, UserProfileUpdate, SkillResponse, SuccessResponse, SkillSuggest
 from api_users import get_current_user
 from profile_service import ProfileService
+from services.dashboard_stats_service import record_skill_created
+from services.catalog_version_service import bump_catalog_version, SKILLS_CATALOG
+from services.skill_index import get_skill_index, invalidate_skill_index
 import re
 
 router = APIRouter(prefix="/api/users", tags=["profile"])
@@ -102,10 +106,14 @@ async def suggest_new_skill(
     category = skill_data.category or "Other"
     proficiency_level = skill_data.proficiency_level or "beginner"
     
-    # Check if skill already exists (case-insensitive)
-    existing_skill = db.query(Skill).filter(
-        Skill.name.ilike(skill_name)
-    ).first()
+    # Check if skill already exists (name or alias, case-insensitive)
+    existing_skill = None
+    skill_id = get_skill_index(db).find(skill_name)
+    if skill_id is not None:
+        existing_skill = db.get(Skill, skill_id)
+    if existing_skill is None:
+        # Not in the index (inactive, or created by another worker since it was built)
+        existing_skill = db.query(Skill).filter(func.lower(Skill.name) == skill_name.lower()).first()
     
     if existing_skill:
         # Skill exists, just add it to user's profile
@@ -116,12 +124,17 @@ async def suggest_new_skill(
         return existing_skill
     
     # Create slug from skill name
-    slug = re.sub(r'[^a-z0-9]+', '-', skill_name.lower()).strip('-')
+    base_slug = re.sub(r'[^a-z0-9]+', '-', skill_name.lower()).strip('-') or 'skill'
     
-    # Ensure slug is unique
-    base_slug = slug
+    # Ensure slug is unique: fetch the base slug and its numbered variants in one query
+    taken = {
+        row[0] for row in db.query(Skill.slug).filter(
+            or_(Skill.slug == base_slug, Skill.slug.like(f"{base_slug}-%"))
+        )
+    }
+    slug = base_slug
     counter = 1
-    while db.query(Skill).filter(Skill.slug == slug).first():
+    while slug in taken:
         slug = f"{base_slug}-{counter}"
         counter += 1
     
@@ -135,8 +148,11 @@ async def suggest_new_skill(
     )
     
     db.add(new_skill)
+    record_skill_created(db)
+    bump_catalog_version(db, SKILLS_CATALOG)
     db.commit()
     db.refresh(new_skill)
+    invalidate_skill_index()
     
     # Automatically add to user's profile
     ProfileService.add_skill(db, current_user.id, new_skill.id, proficiency_level)
@@ -1,19 +1,24 @@
 """
 Roadmap Routes - API endpoints for AI-generated career roadmaps
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database import get_db
-from models import User, UserResume, Skill, CareerRoadmap
+from models import User, CareerRoadmap
 from api_users import get_current_user
 from services.roadmap_service import generate_career_roadmap
+from services.user_context_service import get_user_context
 from schemas import RoadmapGenerateRequest, RoadmapGenerateResponse, RoadmapResponse
+from pagination import paginate, next_cursor_headers, MAX_PAGE_SIZE
 from datetime import datetime
 import json
 
 router = APIRouter(prefix="/api/roadmap", tags=["roadmap"])
 
+# Page size of /all when a cursor is given without a limit
+ROADMAP_PAGE_SIZE = 20
+
 
 @router.post("/generate", response_model=RoadmapGenerateResponse)
 async def generate_roadmap(
@@ -46,25 +51,11 @@ async def generate_roadmap(
                 detail="target_role and timeframe are required"
             )
         
-        # 2. Fetch user profile (current_user already has profile data)
-        user_profile = current_user
-        
-        # 3. Fetch user skills
-        from models import user_skills as user_skills_table
-        skill_ids_result = db.query(user_skills_table.c.skill_id).filter(
-            user_skills_table.c.user_id == current_user.id
-        ).all()
-        
-        user_skills = []
-        if skill_ids_result:
-            skill_ids_list = [row[0] for row in skill_ids_result]
-            if skill_ids_list:
-                user_skills = db.query(Skill).filter(Skill.id.in_(skill_ids_list)).all()
-        
-        # 4. Fetch user CV data
-        user_cv = db.query(UserResume).filter(
-            UserResume.user_id == current_user.id
-        ).first()
+        # 2-4. Load profile, skills and CV from the cached context snapshot
+        user_context = get_user_context(db, current_user)
+        user_profile = user_context["profile"]
+        user_skills = user_context["skills"]
+        user_cv = user_context["cv"]
         
         # 5. Build input context snapshot (for storage)
         input_context = {
@@ -72,21 +63,21 @@ async def generate_roadmap(
             "timeframe": timeframe,
             "weekly_hours": weekly_hours,
             "user_profile": {
-                "name": user_profile.full_name or "",
-                "bio": user_profile.bio or "",
-                "experience_description": user_profile.experience_description or "",
-                "career_interests": json.loads(user_profile.career_interests) if user_profile.career_interests else [],
+                "name": user_profile["name"],
+                "bio": user_profile["bio"],
+                "experience_description": user_profile["experience_description"],
+                "career_interests": user_profile["career_interests"],
             },
-            "skills": [skill.name for skill in user_skills],
+            "skills": [skill["name"] for skill in user_skills],
             "cv_data": {
-                "has_cv": user_cv is not None,
-                "experiences_count": len(json.loads(user_cv.experiences)) if user_cv and user_cv.experiences else 0,
-                "projects_count": len(json.loads(user_cv.projects)) if user_cv and user_cv.projects else 0,
+                "has_cv": True,
+                "experiences_count": len(user_cv["experiences"]),
+                "projects_count": len(user_cv["projects"]),
             } if user_cv else {"has_cv": False}
         }
         
         # 6. Generate roadmap using Gemini
-        visual_roadmap, description, user_context = generate_career_roadmap(
+        visual_roadmap, description, _ = generate_career_roadmap(
             user_profile=user_profile,
             user_skills=user_skills,
             user_cv=user_cv,
@@ -131,6 +122,9 @@ async def generate_roadmap(
 
 @router.get("/all", response_model=List[RoadmapResponse])
 async def get_all_roadmaps(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -139,16 +133,24 @@ async def get_all_roadmaps(
     
     Protected route - returns only the user's own roadmaps.
     Returns roadmaps sorted by creation date (newest first).
+    Without limit or cursor every roadmap is returned; otherwise one page,
+    with the next page cursor in the X-Next-Cursor header.
     """
     try:
-        roadmaps = db.query(CareerRoadmap).filter(
+        query = db.query(CareerRoadmap).filter(
             CareerRoadmap.user_id == current_user.id
-        ).order_by(
-            CareerRoadmap.created_at.desc()
-        ).all()
+        )
+        if limit is None and cursor is None:
+            return query.order_by(CareerRoadmap.id.desc()).all()
         
+        roadmaps, next_cursor = paginate(
+            query, (CareerRoadmap.id,), cursor, limit or ROADMAP_PAGE_SIZE, descending=True
+        )
+        response.headers.update(next_cursor_headers(next_cursor))
         return roadmaps
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error fetching roadmaps: {e}")
         raise HTTPException(
@@ -0,0 +1,64 @@
+"""
+Search Routes - Ranked full-text search over the public catalog
+"""
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from database import get_read_db
+from models import UserRole
+from api_users import get_current_user
+from schemas import SearchResponse
+from services.search_service import search_catalog, SEARCH_TARGETS, SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    type: Optional[str] = None,
+    category: Optional[str] = None,
+    target_track: Optional[str] = None,
+    cost_type: Optional[str] = None,
+    is_active: bool = True,
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT),
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Search courses, jobs and local opportunities.
+
+    Public endpoint. Results from every type are merged and ordered by rank;
+    `title` and `headline` are HTML-escaped and wrap matched words in <mark>...</mark>.
+
+    Query params:
+    - q: Search text (supports "quoted phrases", OR and -exclusions on Postgres)
+    - type: Comma-separated subset of courses, jobs, opportunities (default: all)
+    - category, target_track: Opportunity filters
+    - cost_type: Course filter ("free"/"paid")
+    - is_active: Search inactive entries instead (admin only)
+    - limit: Maximum number of results (1-100)
+    """
+    kinds = None
+    if type:
+        kinds = [kind.strip() for kind in type.split(",") if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in SEARCH_TARGETS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search type: {', '.join(unknown)}. Use {', '.join(SEARCH_TARGETS)}"
+            )
+
+    if not is_active:
+        current_user = await get_current_user(authorization, db)
+        if current_user.role != UserRole.ADMIN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Admin access required"
+            )
+
+    results = search_catalog(
+        db, q.strip(), kinds=kinds, category=category, target_track=target_track,
+        cost_type=cost_type, is_active=is_active, limit=limit
+    )
+    return SearchResponse(query=q, results=results)
@@ -2,6 +2,7 @@
 Pydantic schemas for SkillSync API
 Defines request/response models for data validation
 """
+import json
 from pydantic import BaseModel, EmailStr, Field, validator
 from typing import Optional, List
 from datetime import datetime
@@ -175,6 +176,22 @@ class SkillSuggest(BaseModel):
     proficiency_level: Optional[str] = Field(default="beginner")
 
 
+class SkillAutocompleteResult(BaseModel):
+    """Skill autocomplete match"""
+    id: int
+    name: str
+    slug: str
+    category: Optional[str] = None
+    matched_alias: Optional[str] = None  # Alias the query matched, e.g. "k8s" for Kubernetes
+
+
+def skill_ids_json(value):
+    """Skill id arrays are stored as JSON; the API keeps returning them as JSON strings"""
+    if isinstance(value, list):
+        return json.dumps(value)
+    return value
+
+
 # Course Schemas
 class CourseBase(BaseModel):
     """Base course information"""
@@ -214,6 +231,8 @@ class CourseResponse(CourseBase):
     created_at: datetime
     updated_at: datetime
     
+    _related_skills_json = validator("related_skills", pre=True, allow_reuse=True)(skill_ids_json)
+    
     class Config:
         from_attributes = True
 
@@ -276,6 +295,8 @@ class JobResponse(JobBase):
     applications_count: int
     created_at: datetime
     
+    _required_skills_json = validator("required_skills", pre=True, allow_reuse=True)(skill_ids_json)
+    
     class Config:
         from_attributes = True
 
@@ -300,6 +321,14 @@ class SuccessResponse(BaseModel):
     data: Optional[dict] = None
 
 
+class JobApplicationResponse(BaseModel):
+    """Where to apply for a job (returned when an application click-through is recorded)"""
+    job_id: int
+    application_url: Optional[str] = None
+    application_email: Optional[str] = None
+    applications_count: int
+
+
 class ErrorResponse(BaseModel):
     """Generic error response"""
     success: bool = False
@@ -367,6 +396,22 @@ class CVResponse(BaseModel):
         from_attributes = True
 
 
+class SkillMention(BaseModel):
+    """Where a skill was mentioned in CV text"""
+    field: str  # e.g. "raw_cv_text", "experience_description", "projects.0.description"
+    start: int
+    end: int
+
+
+class DetectedSkill(BaseModel):
+    """Skill detected in the user's CV text"""
+    skill_id: int
+    name: str
+    count: int
+    mentions: List[SkillMention] = []
+    in_resume: bool = False  # Already one of the resume's skills
+
+
 # Roadmap Schemas
 class RoadmapGenerateRequest(BaseModel):
     """Roadmap generation request - accepts camelCase from frontend"""
@@ -411,7 +456,7 @@ class LocalOpportunityBase(BaseModel):
     location: str = Field(..., min_length=2, max_length=255)
     category: str = Field(..., description="Internship, Training, Job, Youth Program")
     target_track: Optional[str] = Field(None, max_length=255)
-    required_skills: Optional[str] = Field(None, description="JSON array of skill IDs or skill names")
+    required_skills: Optional[str] = Field(None, description="JSON array of skill IDs or skill names (stored as IDs)")
     link: Optional[str] = Field(None, max_length=1000)
     priority_group: Optional[str] = Field(None, max_length=255)
 
@@ -442,6 +487,8 @@ class LocalOpportunityResponse(LocalOpportunityBase):
     created_at: datetime
     updated_at: datetime
     
+    _required_skills_json = validator("required_skills", pre=True, allow_reuse=True)(skill_ids_json)
+    
     class Config:
         from_attributes = True
 
@@ -451,4 +498,23 @@ class OpportunityRecommendationResponse(BaseModel):
     success: bool = True
     explanation: str  # Gemini-generated personalized explanation
     opportunities: List[LocalOpportunityResponse] = []  # Ranked opportunities
-    total_matched: int
\ No newline at end of file
+    total_matched: int
+    generated_at: Optional[datetime] = None  # When the explanation was generated
+    cached: bool = False  # True if the explanation was served from cache
+
+# ==================== Search Schemas ====================
+
+class SearchResult(BaseModel):
+    """One ranked catalog search hit"""
+    kind: str  # "courses", "jobs" or "opportunities"
+    id: int
+    title: str  # HTML-escaped, matches wrapped in <mark>...</mark>
+    subtitle: Optional[str] = None  # Platform, company or organization
+    headline: str  # HTML-escaped description fragment, matches wrapped in <mark>...</mark>
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    """Catalog search response"""
+    query: str
+    results: List[SearchResult] = []
@@ -0,0 +1,263 @@
+"""
+Audit Log Service
+Batched, asynchronous writer for admin audit records
+
+Admin actions are pushed onto an in-memory queue and written by a background
+thread using a single multi-row INSERT, instead of a second commit after
+every business transaction. Set AUDIT_LOG_SYNC=true to write synchronously.
+
+A batch that fails with a transient error (connection lost, database down)
+is requeued; the queue is capped at AUDIT_LOG_MAX_QUEUE records, dropping
+the oldest, so an outage cannot exhaust memory. A batch the database rejects
+(IntegrityError, DataError) is retried one row at a time and the rows that
+are still rejected are logged and dropped, so one bad record cannot block
+every later write.
+"""
+import ipaddress
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import AdminLog
+
+# Flush when this many records are queued...
+AUDIT_LOG_BATCH_SIZE = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "100"))
+# ...or when the oldest queued record is this old (seconds)
+AUDIT_LOG_FLUSH_INTERVAL = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL_SECONDS", "2"))
+# Most records held in memory while the database is unreachable (oldest dropped beyond)
+AUDIT_LOG_MAX_QUEUE = int(os.getenv("AUDIT_LOG_MAX_QUEUE", "10000"))
+# Write each record immediately in the caller's session (fallback mode)
+AUDIT_LOG_SYNC = os.getenv("AUDIT_LOG_SYNC", "false").lower() in ("1", "true", "yes")
+
+
+def _parse_networks(value: str) -> List:
+    networks = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            print(f"Ignoring invalid TRUSTED_PROXIES entry: {entry!r}")
+    return networks
+
+
+# Reverse proxies (IPs or CIDRs, comma-separated) whose X-Forwarded-For is
+# believed; from anyone else the header is ignored, since clients can forge it
+TRUSTED_PROXIES = _parse_networks(os.getenv("TRUSTED_PROXIES", ""))
+
+
+class AuditLogWriter:
+    """
+    Queue of pending AdminLog rows drained by a background thread.
+
+    The thread wakes up when the queue reaches `batch_size` or after
+    `flush_interval` seconds, whichever comes first. `stop()` drains the
+    queue before returning so records survive a clean shutdown.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = AUDIT_LOG_BATCH_SIZE,
+        flush_interval: float = AUDIT_LOG_FLUSH_INTERVAL,
+        synchronous: bool = AUDIT_LOG_SYNC,
+        max_queue: int = AUDIT_LOG_MAX_QUEUE
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.synchronous = synchronous
+        self.max_queue = max_queue
+        # Records given up on (rejected by the database or over max_queue)
+        self.dropped = 0
+        self._queue: List[Dict] = []
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def write(self, db: Session, record: Dict):
+        """
+        Record an audit entry.
+
+        Falls back to a synchronous insert in `db` when the writer is
+        configured as synchronous or its background thread is not running
+        (e.g. in scripts that import the app without starting it).
+        """
+        if self.synchronous or not self.running:
+            db.add(AdminLog(**record))
+            db.commit()
+            return
+
+        with self._condition:
+            self._queue.append(record)
+            self._trim()
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify()
+
+    def _trim(self):
+        """Drop the oldest records beyond max_queue (caller holds the condition)"""
+        excess = len(self._queue) - self.max_queue
+        if excess <= 0:
+            return
+        dropped, self._queue = self._queue[:excess], self._queue[excess:]
+        self.dropped += excess
+        summary = ", ".join(
+            f"{record['action']} by admin {record['admin_id']} at {record['created_at']}" for record in dropped[:5]
+        )
+        print(
+            f"Audit log queue full ({self.max_queue} records), dropped the {excess} oldest: "
+            f"{summary}{' ...' if excess > 5 else ''}"
+        )
+
+    def _requeue(self, records: List[Dict]):
+        with self._condition:
+            self._queue[:0] = records
+            self._trim()
+
+    def flush(self) -> int:
+        """
+        Write every queued record in one multi-row INSERT.
+
+        Returns:
+            Number of records written (dropped and requeued ones excluded)
+        """
+        with self._condition:
+            batch = self._queue
+            self._queue = []
+
+        if not batch:
+            return 0
+
+        db = SessionLocal()
+        try:
+            db.execute(insert(AdminLog), batch)
+            db.commit()
+            return len(batch)
+        except (IntegrityError, DataError) as e:
+            db.rollback()
+            print(f"Audit log batch rejected, writing its {len(batch)} records one by one: {e.orig}")
+            return self._write_each(db, batch)
+        except Exception as e:
+            db.rollback()
+            print(f"Error writing audit log batch, will retry: {e}")
+            self._requeue(batch)
+            return 0
+        finally:
+            db.close()
+
+    def _write_each(self, db: Session, batch: List[Dict]) -> int:
+        """Insert records one per transaction, dropping those the database rejects"""
+        written = 0
+        for position, record in enumerate(batch):
+            try:
+                db.execute(insert(AdminLog), [record])
+                db.commit()
+                written += 1
+            except (IntegrityError, DataError) as e:
+                db.rollback()
+                self.dropped += 1
+                print(f"Dropping audit record the database rejects: {record}: {e.orig}")
+            except Exception as e:
+                db.rollback()
+                print(f"Error writing audit log records, will retry: {e}")
+                self._requeue(batch[position:])
+                break
+        return written
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._stopping and len(self._queue) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def start(self):
+        """Start the background writer thread (no-op in synchronous mode)"""
+        if self.synchronous or self.running:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and write everything still queued"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+
+# Shared writer used by log_admin_action
+audit_log_writer = AuditLogWriter()
+
+
+def build_audit_record(
+    admin_id: int,
+    action: str,
+    target_type: Optional[str] = None,
+    target_id: Optional[int] = None,
+    details: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None
+) -> Dict:
+    """
+    Build an AdminLog row as a plain dict (safe to queue across threads).
+
+    `created_at` is captured at enqueue time so batching does not skew the
+    audit trail.
+    """
+    return {
+        "admin_id": admin_id,
+        "action": action,
+        "target_type": target_type,
+        "target_id": target_id,
+        "details": details,
+        "ip_address": ip_address[:45] if ip_address else None,
+        "user_agent": user_agent[:500] if user_agent else None,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _is_trusted_proxy(host: Optional[str]) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except (TypeError, ValueError):
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(request) -> Optional[str]:
+    """
+    IP address of the client that sent `request`, for the audit trail.
+
+    X-Forwarded-For is only used when the peer is a trusted proxy
+    (TRUSTED_PROXIES). The header is then read right to left, skipping
+    trusted proxies, so the result is the address the outermost trusted
+    proxy saw; entries further left were supplied by the client.
+    """
+    peer = request.client.host if request.client else None
+    if not _is_trusted_proxy(peer):
+        return peer
+
+    forwarded_for = request.headers.get("x-forwarded-for")
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()] if forwarded_for else []
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
@@ -0,0 +1,235 @@
+"""
+Blob Store
+Pluggable, content-addressed storage for uploaded files
+
+Objects are stored under a key derived from their SHA-256 digest, so every
+node sees the same key for the same bytes. BLOB_STORE_BACKEND selects the
+backend:
+- "local" (default): a directory on disk (BLOB_STORE_ROOT, default "uploads")
+- "s3": any S3-compatible service (S3_BUCKET, S3_ENDPOINT_URL for MinIO or
+  another local stand-in); requires boto3
+"""
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BLOB_STORE_BACKEND = os.getenv("BLOB_STORE_BACKEND", "local").lower()
+BLOB_STORE_ROOT = os.getenv("BLOB_STORE_ROOT", "uploads")
+# Directory for uploads that are still being streamed/validated
+BLOB_STAGING_DIR = os.getenv("BLOB_STAGING_DIR", os.path.join(BLOB_STORE_ROOT, "tmp"))
+
+S3_BUCKET = os.getenv("S3_BUCKET", "skillsync-uploads")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")  # e.g. http://minio:9000
+S3_REGION = os.getenv("S3_REGION", "us-east-1")
+# Create the bucket on startup if it is missing (handy for a local MinIO)
+S3_CREATE_BUCKET = os.getenv("S3_CREATE_BUCKET", "false").lower() in ("1", "true", "yes")
+
+# Bytes yielded per iteration when streaming an object
+BLOB_READ_CHUNK_SIZE = 64 * 1024
+
+
+def content_key(sha256: str, prefix: str, suffix: str = "") -> str:
+    """
+    Build the storage key for a content hash.
+
+    Keys are sharded by the first two hex characters so no directory (or
+    S3 prefix listing) grows unbounded, e.g. "cv_pdfs/ab/ab12....pdf".
+    """
+    return f"{prefix}/{sha256[:2]}/{sha256}{suffix}"
+
+
+class BlobStore(ABC):
+    """Interface implemented by every storage backend"""
+
+    @abstractmethod
+    def put_file(self, key: str, source_path: str, content_type: str = "application/octet-stream"):
+        """Store a local file under `key`; the source file is consumed"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Delete an object (missing objects are ignored)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_range(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = BLOB_READ_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Yield bytes `start`..`end` (inclusive; None means end of object)"""
+        raise NotImplementedError
+
+    @contextmanager
+    @abstractmethod
+    def local_copy(self, key: str) -> Iterator[str]:
+        """Yield a local filesystem path holding the object's bytes"""
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store backed by a directory on the local (or a shared) filesystem"""
+
+    def __init__(self, root: str = BLOB_STORE_ROOT):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid blob key: {key}")
+        return path
+
+    def put_file(self, key: str, source_path: str, content_type: str = "application/octet-stream"):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Same filesystem in the default layout, so this is an atomic rename
+        shutil.move(source_path, path)
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def size(self, key: str) -> int:
+        return self._path(key).stat().st_size
+
+    def delete(self, key: str):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def iter_range(self, key, start=0, end=None, chunk_size=BLOB_READ_CHUNK_SIZE):
+        with open(self._path(key), "rb") as f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[str]:
+        yield str(self._path(key))
+
+
+class S3BlobStore(BlobStore):
+    """Blob store backed by an S3-compatible object store"""
+
+    def __init__(
+        self,
+        bucket: str = S3_BUCKET,
+        endpoint_url: Optional[str] = S3_ENDPOINT_URL,
+        region: str = S3_REGION
+    ):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError:
+            raise RuntimeError("BLOB_STORE_BACKEND=s3 requires boto3 (pip install boto3)")
+
+        self.bucket = bucket
+        self._client_error = ClientError
+        # Credentials come from the standard AWS_* environment variables
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+        if S3_CREATE_BUCKET:
+            self._ensure_bucket()
+
+    def _ensure_bucket(self):
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+        except self._client_error as e:
+            if not self._is_not_found(e):
+                raise
+            self.client.create_bucket(Bucket=self.bucket)
+
+    def _is_not_found(self, error) -> bool:
+        return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+    def put_file(self, key: str, source_path: str, content_type: str = "application/octet-stream"):
+        try:
+            self.client.upload_file(source_path, self.bucket, key, ExtraArgs={"ContentType": content_type})
+        finally:
+            try:
+                os.unlink(source_path)
+            except FileNotFoundError:
+                pass
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except self._client_error as e:
+            if self._is_not_found(e):
+                return False
+            raise
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def iter_range(self, key, start=0, end=None, chunk_size=BLOB_READ_CHUNK_SIZE):
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        body = self.client.get_object(Bucket=self.bucket, Key=key, Range=byte_range)["Body"]
+        try:
+            for chunk in body.iter_chunks(chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[str]:
+        fd, temp_path = tempfile.mkstemp(suffix=Path(key).suffix)
+        os.close(fd)
+        try:
+            self.client.download_file(self.bucket, key, temp_path)
+            yield temp_path
+        finally:
+            try:
+                os.unlink(temp_path)
+            except FileNotFoundError:
+                pass
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get the process-wide blob store for the configured backend"""
+    global _blob_store
+    if _blob_store is None:
+        if BLOB_STORE_BACKEND == "s3":
+            _blob_store = S3BlobStore()
+        elif BLOB_STORE_BACKEND == "local":
+            _blob_store = LocalBlobStore()
+        else:
+            raise RuntimeError(f"Unknown BLOB_STORE_BACKEND: {BLOB_STORE_BACKEND}")
+    return _blob_store
+
+
+def get_staging_dir() -> Path:
+    """Directory where uploads are streamed before they are stored"""
+    path = Path(BLOB_STAGING_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
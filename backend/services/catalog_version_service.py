@@ -0,0 +1,113 @@
+"""
+Catalog Version Service
+Versions and HTTP cache headers for the public course, skill and job catalogs
+
+The catalogs change only when an admin edits them, so each one has a counter
+in `catalog_versions` that is bumped in the same transaction as the change.
+The public list endpoints turn the counter into a strong ETag and answer a
+matching If-None-Match with 304 after a single primary-key lookup, without
+loading any catalog rows. Detail endpoints use an ETag built from the
+entry's own updated_at instead, looked up by primary key.
+
+View and enrollment counts are part of the responses but don't bump the
+version; the ETag also rolls over every CATALOG_COUNTS_REFRESH_SECONDS so
+those counts (and rows written outside the API, e.g. by seed scripts) are
+never stale for longer than that.
+"""
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import CatalogVersion
+
+COURSES_CATALOG = "courses"
+SKILLS_CATALOG = "skills"
+JOBS_CATALOG = "jobs"
+
+# How long browsers and proxies may reuse a catalog list without revalidating (seconds)
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE_SECONDS", "60"))
+# Upper bound on how stale view/enrollment counts in a cached response can be (seconds)
+CATALOG_COUNTS_REFRESH = int(os.getenv("CATALOG_COUNTS_REFRESH_SECONDS", "300"))
+
+
+def bump_catalog_version(db: Session, catalog: str):
+    """
+    Invalidate the cached representations of a catalog.
+
+    Must be called inside the transaction that creates, updates or deletes
+    catalog entries; the caller commits.
+
+    Args:
+        db: Database session
+        catalog: Catalog name (COURSES_CATALOG, SKILLS_CATALOG or JOBS_CATALOG)
+    """
+    table = CatalogVersion.__table__
+    updated = db.execute(
+        table.update().where(table.c.name == catalog).values(version=table.c.version + 1)
+    )
+    if updated.rowcount:
+        return
+
+    # First change of this catalog: create its row (in a savepoint, another worker may race us)
+    try:
+        with db.begin_nested():
+            db.add(CatalogVersion(name=catalog, version=1))
+    except IntegrityError:
+        db.execute(
+            table.update().where(table.c.name == catalog).values(version=table.c.version + 1)
+        )
+
+
+def get_catalog_version(db: Session, catalog: str) -> int:
+    """Get the current version of a catalog (0 if it was never changed)"""
+    return db.query(CatalogVersion.version).filter(CatalogVersion.name == catalog).scalar() or 0
+
+
+def _counts_epoch() -> int:
+    return int(time.time() // CATALOG_COUNTS_REFRESH) if CATALOG_COUNTS_REFRESH > 0 else 0
+
+
+def catalog_cache_headers(db: Session, catalog: str) -> Dict[str, str]:
+    """
+    Build the ETag and Cache-Control headers for a public catalog list response.
+
+    Args:
+        db: Database session
+        catalog: Catalog name
+
+    Returns:
+        Dictionary of response headers
+    """
+    version = get_catalog_version(db, catalog)
+    return {
+        "ETag": f'"{catalog}-{version}-{_counts_epoch()}"',
+        "Cache-Control": f"public, max-age={CATALOG_CACHE_MAX_AGE}",
+    }
+
+
+def item_cache_headers(catalog: str, item_id: int, updated_at: Optional[datetime]) -> Dict[str, str]:
+    """
+    Build the ETag and Cache-Control headers for one catalog entry (detail endpoints).
+
+    The ETag comes from the entry's own updated_at, so editing one entry
+    does not invalidate every other detail page. Responses must be
+    revalidated on every use, so each page view still reaches the server
+    and is counted.
+
+    Args:
+        catalog: Catalog name
+        item_id: Primary key of the entry
+        updated_at: The entry's updated_at (None if never set)
+
+    Returns:
+        Dictionary of response headers
+    """
+    stamp = updated_at.strftime("%Y%m%d%H%M%S%f") if updated_at else "0"
+    return {
+        "ETag": f'"{catalog}-{item_id}-{stamp}-{_counts_epoch()}"',
+        "Cache-Control": "public, no-cache",
+    }
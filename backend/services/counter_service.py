@@ -0,0 +1,137 @@
+"""
+Counter Service
+Write-behind buffer for analytics counters (views, applications, enrollments)
+
+Public read endpoints used to run `views_count += 1`, commit and refresh on
+every page view. Increments are now aggregated in memory and written back
+periodically as one `UPDATE ... SET col = col + delta` statement per table.
+"""
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+from sqlalchemy import case, func, update
+
+from database import SessionLocal
+
+# How often pending increments are written to the database (seconds)
+COUNTER_FLUSH_INTERVAL = float(os.getenv("COUNTER_FLUSH_INTERVAL_SECONDS", "5"))
+
+
+class CounterBuffer:
+    """
+    Thread-safe in-process aggregator for integer counter columns.
+
+    Pending deltas are keyed by (model, column, row id). A background thread
+    flushes them every `flush_interval` seconds; `stop()` performs a final
+    flush so no increments are lost on a clean shutdown.
+    """
+
+    def __init__(self, flush_interval: float = COUNTER_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._pending: Dict[Tuple[type, str, int], int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def increment(self, model, column: str, row_id: int, delta: int = 1) -> int:
+        """
+        Record an increment for `model.column` on row `row_id`.
+
+        Args:
+            model: SQLAlchemy model class (e.g. Job, Course)
+            column: Name of the integer counter column (e.g. "views_count")
+            row_id: Primary key of the row
+            delta: Amount to add (default 1)
+
+        Returns:
+            Total delta still pending for this counter (including this call)
+        """
+        key = (model, column, row_id)
+        with self._lock:
+            self._pending[key] += delta
+            return self._pending[key]
+
+    def pending(self, model, column: str, row_id: int) -> int:
+        """Get the not-yet-flushed delta for a single counter"""
+        with self._lock:
+            return self._pending.get((model, column, row_id), 0)
+
+    def flush(self) -> int:
+        """
+        Write all pending increments to the database.
+
+        Each table gets a single UPDATE statement; every counter column is
+        incremented by a CASE expression keyed on the primary key. On failure
+        the deltas are merged back into the buffer so they are retried.
+
+        Returns:
+            Number of counters written
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+            snapshot = dict(self._pending)
+            self._pending.clear()
+
+        # Group by model -> column -> {row_id: delta}
+        grouped = defaultdict(lambda: defaultdict(dict))
+        for (model, column, row_id), delta in snapshot.items():
+            if delta:
+                grouped[model][column][row_id] = delta
+
+        db = SessionLocal()
+        try:
+            for model, columns in grouped.items():
+                row_ids = set()
+                values = {}
+                for column, deltas in columns.items():
+                    row_ids.update(deltas.keys())
+                    col = getattr(model, column)
+                    values[column] = func.coalesce(col, 0) + case(deltas, value=model.id, else_=0)
+                if "updated_at" in model.__table__.c:
+                    # Counters are not edits: keep updated_at (and the detail ETags built from it)
+                    values["updated_at"] = model.updated_at
+
+                db.execute(
+                    update(model)
+                    .where(model.id.in_(row_ids))
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+            db.commit()
+            return len(snapshot)
+        except Exception as e:
+            db.rollback()
+            print(f"Error flushing counters, will retry: {e}")
+            with self._lock:
+                for key, delta in snapshot.items():
+                    self._pending[key] += delta
+            return 0
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def start(self):
+        """Start the periodic background flush thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="counter-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and flush everything still pending"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+
+# Shared buffer used by the API routes
+counter_buffer = CounterBuffer()
@@ -2,24 +2,17 @@
 CV Assistant Service - AI-powered CV generation and improvement suggestions
 Uses Gemini AI to generate professional summaries, bullet points, and recommendations
 """
-import os
 import json
 from typing import Dict, List, Optional
 from pathlib import Path
-import google.generativeai as genai
-from dotenv import load_dotenv
+from services.gemini_service import get_model, is_configured
 
-# Load environment variables
-load_dotenv()
+CV_ASSISTANT_MODEL_NAME = 'gemini-2.5-flash'
 
-# Configure Gemini AI
-api_key = os.getenv("GEMINI_API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
-    # Use gemini-1.5-flash for better rate limits and stability
-    model = genai.GenerativeModel('gemini-2.5-flash')
-else:
-    model = None
+
+def _get_model():
+    """Get the Gemini model on first use, or None if no API key is configured"""
+    return get_model(CV_ASSISTANT_MODEL_NAME) if is_configured() else None
 
 
 class CVAssistantService:
@@ -37,6 +30,7 @@ class CVAssistantService:
         Returns:
             Professional summary text
         """
+        model = _get_model()
         if not model:
             return "AI service not configured. Please set GEMINI_API_KEY."
         
@@ -112,6 +106,7 @@ Return ONLY the summary text, no additional formatting or labels.
         Returns:
             List of improved bullet points
         """
+        model = _get_model()
         if not model:
             return ["AI service not configured. Please set GEMINI_API_KEY."]
         
@@ -175,6 +170,7 @@ Return ONLY the bullet points (one per line, starting with -), no additional tex
         Returns:
             Dict with improved description and bullet points
         """
+        model = _get_model()
         if not model:
             return {
                 "description": "AI service not configured.",
@@ -253,6 +249,7 @@ Return ONLY valid JSON, no additional text.
         Returns:
             Dict with suggestions for different LinkedIn sections
         """
+        model = _get_model()
         if not model:
             return {
                 "headline": "AI service not configured.",
@@ -358,6 +355,7 @@ Return ONLY valid JSON, no additional text.
         Returns:
             Dict with portfolio improvement suggestions
         """
+        model = _get_model()
         if not model:
             return {
                 "structure": "AI service not configured.",
@@ -584,6 +582,7 @@ Return ONLY valid JSON, no additional text.
         Returns:
             List of relevant keywords
         """
+        model = _get_model()
         if not model:
             return ["AI service not configured"]
         
@@ -628,10 +627,10 @@ Return ONLY a comma-separated list, no additional text.
                 
                 response = model.generate_content(
                     prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.7,
-                        max_output_tokens=200,
-                    )
+                    generation_config={
+                        "temperature": 0.7,
+                        "max_output_tokens": 200,
+                    }
                 )
                 keywords = [k.strip() for k in response.text.strip().split(',') if k.strip()]
                 
@@ -1,14 +1,31 @@
 """
 CV Service - Business logic for CV/Resume management
-Includes placeholder functions for future AI-based skill extraction
+Includes local skill extraction and placeholder functions for future AI-based CV parsing
 """
+import hashlib
 import json
+import os
+import tempfile
+from pathlib import Path
 from typing import Optional, List, Dict
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from fastapi import HTTPException, status
-from models import UserResume, Skill, User
+from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from models import UserResume, Skill, User, CVBlob
 from schemas import CVCreate, CVResponse
+from services.user_context_service import bump_context_version
+from services.blob_store import get_blob_store, content_key
+from services.skill_matcher import get_skill_matcher, SKILL_MATCH_MIN_CONFIDENCE
+from services.skill_extractor import get_skill_extractor
+
+# Largest CV PDF accepted by the upload endpoint (bytes)
+CV_PDF_MAX_BYTES = int(os.getenv("CV_PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+# Size of each chunk read from the upload and written to disk (bytes)
+CV_UPLOAD_CHUNK_SIZE = int(os.getenv("CV_UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+
+PDF_MAGIC = b"%PDF-"
 
 
 class CVService:
@@ -43,7 +60,7 @@ class CVService:
             "personal_summary": cv_data.personal_summary,
             "experiences": json.dumps([exp.dict() for exp in (cv_data.experiences or [])]),
             "education": json.dumps([edu.dict() for edu in (cv_data.education or [])]),
-            "skills": json.dumps(cv_data.skills or []),
+            "skills": cv_data.skills or [],
             "tools": json.dumps(cv_data.tools or []),
             "projects": json.dumps([proj.dict() for proj in (cv_data.projects or [])]),
             "raw_cv_text": cv_data.raw_cv_text,
@@ -53,6 +70,7 @@ class CVService:
             # Update existing resume
             for key, value in resume_data.items():
                 setattr(existing_resume, key, value)
+            bump_context_version(db, user_id)
             db.commit()
             db.refresh(existing_resume)
             return existing_resume
@@ -63,6 +81,7 @@ class CVService:
                 **resume_data
             )
             db.add(new_resume)
+            bump_context_version(db, user_id)
             try:
                 db.commit()
                 db.refresh(new_resume)
@@ -76,15 +95,173 @@ class CVService:
     
     @staticmethod
     def delete_resume(db: Session, user_id: int) -> bool:
-        """Delete user's resume"""
+        """Delete user's resume (and release its PDF)"""
         resume = CVService.get_user_resume(db, user_id)
         if not resume:
             return False
         
+        sha256 = resume.cv_pdf_sha256
+        legacy_path = resume.cv_pdf_path if not sha256 else None
+        released_key = CVService._release_pdf_blob(db, sha256)
+        
         db.delete(resume)
+        bump_context_version(db, user_id)
         db.commit()
+        
+        CVService._purge_pdf_blob(db, sha256, released_key)
+        remove_file_quietly(legacy_path)
         return True
     
+    # ==================== PDF Blobs ====================
+    
+    @staticmethod
+    def attach_pdf(db: Session, user_id: int, filename: str, upload: Dict) -> UserResume:
+        """
+        Point the user's resume at an uploaded PDF, deduplicated by content hash
+        
+        Identical bytes are stored once in the blob store; cv_blobs.ref_count
+        counts the resumes using each object. The previously attached PDF is
+        released and deleted when nothing references it any more.
+        Performs blocking storage I/O - call from the threadpool in async routes.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            filename: Original filename of the upload
+            upload: Staged upload as returned by save_pdf_upload
+        """
+        sha256 = upload["sha256"]
+        resume = CVService.get_user_resume(db, user_id)
+        old_sha256 = resume.cv_pdf_sha256 if resume else None
+        legacy_path = resume.cv_pdf_path if resume and not resume.cv_pdf_sha256 else None
+        released_key = None
+        stored_key = None
+        
+        try:
+            if old_sha256 == sha256:
+                # Same file uploaded again; nothing to store
+                remove_file_quietly(upload["path"])
+            else:
+                # Held until commit, so a concurrent purge of this hash cannot delete the object in between
+                CVService._lock_blob(db, sha256)
+                blob = db.query(CVBlob).filter(CVBlob.sha256 == sha256).with_for_update().first()
+                if blob:
+                    blob.ref_count += 1
+                    remove_file_quietly(upload["path"])
+                else:
+                    key = content_key(sha256, "cv_pdfs", ".pdf")
+                    get_blob_store().put_file(key, upload["path"], "application/pdf")
+                    stored_key = key
+                    db.add(CVBlob(
+                        sha256=sha256,
+                        storage_key=key,
+                        size_bytes=upload["size"],
+                        content_type="application/pdf",
+                        ref_count=1
+                    ))
+                released_key = CVService._release_pdf_blob(db, old_sha256)
+            
+            if not resume:
+                # Create new resume record for PDF only
+                resume = UserResume(user_id=user_id)
+                db.add(resume)
+            resume.cv_pdf_filename = filename
+            resume.cv_pdf_path = content_key(sha256, "cv_pdfs", ".pdf")
+            resume.cv_pdf_sha256 = sha256
+            
+            db.commit()
+        except IntegrityError:
+            # A concurrent upload created the same blob or resume first
+            db.rollback()
+            CVService._purge_pdf_blob(db, sha256, stored_key)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="CV upload conflicted with another upload. Please retry."
+            )
+        except Exception:
+            # Nothing references the object stored above unless another upload of the same file committed
+            db.rollback()
+            CVService._purge_pdf_blob(db, sha256, stored_key)
+            raise
+        
+        CVService._purge_pdf_blob(db, old_sha256, released_key)
+        remove_file_quietly(legacy_path)
+        db.refresh(resume)
+        return resume
+    
+    @staticmethod
+    def detach_pdf(db: Session, resume: UserResume):
+        """Remove the PDF from a resume and release its blob"""
+        sha256 = resume.cv_pdf_sha256
+        legacy_path = resume.cv_pdf_path if not sha256 else None
+        released_key = CVService._release_pdf_blob(db, sha256)
+        
+        resume.cv_pdf_filename = None
+        resume.cv_pdf_path = None
+        resume.cv_pdf_sha256 = None
+        db.commit()
+        
+        CVService._purge_pdf_blob(db, sha256, released_key)
+        remove_file_quietly(legacy_path)
+    
+    @staticmethod
+    def get_pdf_blob(db: Session, resume: UserResume) -> Optional[CVBlob]:
+        """Get the blob record for a resume's PDF (None for legacy on-disk PDFs)"""
+        if not resume.cv_pdf_sha256:
+            return None
+        return db.query(CVBlob).filter(CVBlob.sha256 == resume.cv_pdf_sha256).first()
+    
+    @staticmethod
+    def _release_pdf_blob(db: Session, sha256: Optional[str]) -> Optional[str]:
+        """
+        Drop one reference to a blob inside the caller's transaction
+        
+        Returns:
+            Storage key to delete after commit if this was the last reference
+        """
+        if not sha256:
+            return None
+        blob = db.query(CVBlob).filter(CVBlob.sha256 == sha256).with_for_update().first()
+        if not blob:
+            return None
+        if blob.ref_count <= 1:
+            db.delete(blob)
+            return blob.storage_key
+        blob.ref_count -= 1
+        return None
+    
+    @staticmethod
+    def _lock_blob(db: Session, sha256: str):
+        """
+        Serialize storing and purging one content hash until the transaction ends
+        
+        Postgres: a transaction-level advisory lock on the hash. SQLite runs
+        one writer at a time and has no advisory locks, so this is a no-op.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": int(sha256[:15], 16)})
+    
+    @staticmethod
+    def _purge_pdf_blob(db: Session, sha256: Optional[str], key: Optional[str]):
+        """
+        Delete an object once no cv_blobs row references it (own transaction)
+        
+        The blob's advisory lock is held across the check and the delete.
+        An upload of the same file takes that lock before storing the object
+        and inserting its row, so it either commits its row before the check
+        (and the object is kept) or stores the object again after the delete.
+        """
+        if not key:
+            return
+        try:
+            CVService._lock_blob(db, sha256)
+            if not db.query(CVBlob.sha256).filter(CVBlob.sha256 == sha256).first():
+                get_blob_store().delete(key)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error deleting blob {key}: {e}")
+    
     @staticmethod
     def _validate_skill_ids(db: Session, skill_ids: List[int]) -> List[int]:
         """Validate that all skill IDs exist in the database"""
@@ -100,7 +277,7 @@ class CVService:
             "personal_summary": resume.personal_summary,
             "experiences": json.loads(resume.experiences) if resume.experiences else [],
             "education": json.loads(resume.education) if resume.education else [],
-            "skills": json.loads(resume.skills) if resume.skills else [],
+            "skills": resume.skills or [],
             "tools": json.loads(resume.tools) if resume.tools else [],
             "projects": json.loads(resume.projects) if resume.projects else [],
             "raw_cv_text": resume.raw_cv_text,
@@ -111,28 +288,193 @@ class CVService:
         }
 
 
-# ==================== AI/NLP Placeholder Functions ====================
-# These functions are placeholders for future AI-based skill extraction
-# They will be implemented in Phase 2 with NLP/LLM integration
+# ==================== PDF Upload Helpers ====================
+
+def _size_limit_error(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"File size exceeds {max_bytes // (1024 * 1024)}MB limit"
+    )
+
 
-def extract_skills_from_text(raw_text: str) -> List[str]:
+def _not_a_pdf_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="File is not a valid PDF"
+    )
+
+
+def _finalize_upload(out, temp_path: str, destination: Path):
+    """Flush the temp file to disk and atomically move it into place"""
+    out.flush()
+    os.fsync(out.fileno())
+    out.close()
+    os.replace(temp_path, destination)
+
+
+def _discard_upload(out, temp_path: str):
+    """Close and remove a partially written temp file"""
+    if not out.closed:
+        out.close()
+    try:
+        os.unlink(temp_path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_pdf_upload(
+    file: UploadFile,
+    destination: Path,
+    max_bytes: int = CV_PDF_MAX_BYTES,
+    chunk_size: int = CV_UPLOAD_CHUNK_SIZE
+) -> Dict:
     """
-    Placeholder for future AI-based skill extraction from raw CV text
+    Stream an uploaded PDF to `destination` one chunk at a time.
+
+    The upload is written to a temporary file in the destination directory,
+    hashed with SHA-256 and checked for the PDF magic bytes as it streams,
+    and rejected as soon as it passes `max_bytes`. Only a complete, valid
+    file is moved into place (atomically, with os.replace). Disk I/O runs in
+    the threadpool so the event loop is never blocked.
+
+    By the time this runs Starlette has already received and spooled the
+    multipart body, so this check only bounds the staged copy. The request
+    body itself is limited by BodySizeLimitMiddleware (request_limits.py),
+    which answers 413 before an oversized body is read.
+
+    Args:
+        file: Uploaded file from the request
+        destination: Final path of the stored PDF
+        max_bytes: Maximum accepted size in bytes
+        chunk_size: Bytes read and written per iteration
+
+    Returns:
+        Dictionary with path, size (bytes) and sha256 (hex digest)
+
+    Raises:
+        HTTPException: If the file is too large or is not a PDF
+    """
+    # Reject early when the client told us the size up front
+    if file.size is not None and file.size > max_bytes:
+        raise _size_limit_error(max_bytes)
+
+    fd, temp_path = await run_in_threadpool(
+        tempfile.mkstemp, dir=str(destination.parent), prefix=".upload-", suffix=".part"
+    )
+    out = os.fdopen(fd, "wb")
+    digest = hashlib.sha256()
+    header = b""
+    size = 0
+
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+
+            size += len(chunk)
+            if size > max_bytes:
+                raise _size_limit_error(max_bytes)
+
+            if len(header) < len(PDF_MAGIC):
+                header += chunk[:len(PDF_MAGIC) - len(header)]
+                if len(header) == len(PDF_MAGIC) and header != PDF_MAGIC:
+                    raise _not_a_pdf_error()
+
+            digest.update(chunk)
+            await run_in_threadpool(out.write, chunk)
+
+        if header != PDF_MAGIC:
+            raise _not_a_pdf_error()
+
+        await run_in_threadpool(_finalize_upload, out, temp_path, destination)
+    except BaseException:
+        await run_in_threadpool(_discard_upload, out, temp_path)
+        raise
+
+    return {
+        "path": str(destination),
+        "size": size,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def remove_file_quietly(path: Optional[str]):
+    """Delete a stored file if it still exists (safe to call from the threadpool)"""
+    if not path:
+        return
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Error removing file {path}: {e}")
+
+
+# ==================== AI/NLP Functions ====================
+# Skill extraction and matching run locally (services/skill_extractor,
+# services/skill_matcher); the other extraction functions are placeholders
+# for Phase 2 NLP/LLM integration
+
+def extract_skills_from_text(raw_text: str, db: Optional[Session] = None) -> List[Dict]:
+    """
+    Find admin-defined skills mentioned in raw CV text, without an LLM
     
-    Future implementation will:
-    - Use NLP/LLM to analyze raw CV text
-    - Extract skill mentions
-    - Match against admin-defined skills
-    - Return list of matched skill IDs
+    Uses the shared SkillExtractor: every skill name and alias is matched
+    in one pass over the text, on word boundaries ("Java" does not match
+    inside "JavaScript").
     
     Args:
         raw_text: Raw CV/resume text
+        db: Database session (used only to rebuild a stale extractor)
         
     Returns:
-        List of extracted skill names (to be matched against admin skills)
+        [{"skill_id", "name", "count", "mentions": [{"field", "start", "end"}]}],
+        most mentioned first; offsets index into `raw_text`
     """
-    # TODO: Implement AI-based skill extraction
-    return []
+    return get_skill_extractor(db).extract_text(raw_text)
+
+
+def resume_text_fields(user: Optional[User], resume: Optional[UserResume]) -> Dict[str, str]:
+    """
+    Free-text fields of a user's CV, keyed by field name ("raw_cv_text",
+    "experience_description", "projects.<n>.description", "projects.<n>.technologies")
+    """
+    fields = {}
+    if resume is not None and resume.raw_cv_text:
+        fields["raw_cv_text"] = resume.raw_cv_text
+    if user is not None and user.experience_description:
+        fields["experience_description"] = user.experience_description
+
+    projects = []
+    if resume is not None and resume.projects:
+        try:
+            projects = json.loads(resume.projects)
+        except (TypeError, ValueError):
+            projects = []
+    for i, project in enumerate(projects if isinstance(projects, list) else []):
+        if not isinstance(project, dict):
+            continue
+        for key in ("description", "technologies"):
+            value = project.get(key)
+            if isinstance(value, list):
+                value = ", ".join(str(item) for item in value)
+            if value:
+                fields[f"projects.{i}.{key}"] = str(value)
+    return fields
+
+
+def extract_resume_skills(
+    user: Optional[User],
+    resume: Optional[UserResume],
+    db: Optional[Session] = None
+) -> List[Dict]:
+    """
+    Find skills mentioned anywhere in a user's CV text (see resume_text_fields)
+    in a single pass; same result shape as extract_skills_from_text, with
+    each mention tagged with its field
+    """
+    return get_skill_extractor(db).extract(resume_text_fields(user, resume))
 
 
 def extract_experience_from_text(raw_text: str) -> List[Dict]:
@@ -212,22 +554,29 @@ def clean_and_normalize_cv_text(raw_text: str) -> str:
     return raw_text.strip()
 
 
-def match_skills_to_database(skill_names: List[str], db: Session) -> List[int]:
+def match_skills_to_database(
+    skill_names: List[str],
+    db: Session,
+    min_confidence: float = SKILL_MATCH_MIN_CONFIDENCE
+) -> List[int]:
     """
-    Placeholder for matching extracted skill names to database skill IDs
+    Match extracted skill names to admin-defined skill IDs
     
-    Future implementation will:
-    - Match skill names (case-insensitive, fuzzy matching)
-    - Return list of matched skill IDs
-    - Handle partial matches and synonyms
+    Uses the shared SkillMatcher: exact names and aliases (case and
+    punctuation insensitive, "JS" -> JavaScript), then character-trigram
+    similarity for misspellings and variants ("Data visualisation").
     
     Args:
         skill_names: List of extracted skill names
-        db: Database session
+        db: Database session (used only to rebuild a stale matcher)
+        min_confidence: Lowest match confidence (0..1) accepted
         
     Returns:
-        List of matched skill IDs from admin-defined skills
+        List of matched skill IDs from admin-defined skills, without
+        duplicates, in the order of `skill_names`
     """
-    # TODO: Implement skill matching logic
-    return []
+    matches = get_skill_matcher(db).match_many(skill_names)
+    return list(dict.fromkeys(
+        match["skill_id"] for match in matches if match and match["confidence"] >= min_confidence
+    ))
 
@@ -0,0 +1,219 @@
+"""
+Dashboard Stats Service
+Constant-time admin dashboard statistics backed by a rollup table
+
+Counts are computed once with a single aggregate query, stored in
+`dashboard_stat_rollups`, and then kept current by small incremental updates
+issued in the same transaction as signups and course/skill changes. A
+short-TTL in-process cache sits in front of the rollup read.
+
+`active_enrollments` has no incremental hook: the API has no enrollment
+endpoints and enrollment rows only change through cascades, so it is
+refreshed by the periodic full recompute (DASHBOARD_STATS_RECONCILE_SECONDS).
+A code path that starts or completes enrollments should bump it with
+bump_dashboard_stat in its own transaction.
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import User, Course, Skill, DashboardStatRollup, course_enrollments
+
+# How long a computed stats dict is served from memory (seconds)
+DASHBOARD_STATS_TTL = float(os.getenv("DASHBOARD_STATS_TTL_SECONDS", "30"))
+# How often the rollup is fully recomputed to correct any drift (seconds)
+DASHBOARD_STATS_RECONCILE_INTERVAL = float(os.getenv("DASHBOARD_STATS_RECONCILE_SECONDS", "3600"))
+
+TOTAL_METRICS = ("total_users", "total_courses", "total_skills", "active_enrollments")
+MONTHLY_METRICS = ("new_users_this_month", "courses_published_this_month")
+
+_cache: Dict = {"stats": None, "expires_at": 0.0}
+_cache_lock = threading.Lock()
+
+
+def _current_month_start() -> datetime:
+    return datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def compute_dashboard_stats(db: Session) -> Dict[str, int]:
+    """
+    Compute all dashboard counters from the source tables in one query.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Dictionary of metric name to count
+    """
+    month_start = _current_month_start()
+
+    users = select(
+        func.count(User.id).label("total"),
+        func.coalesce(func.sum(case((User.created_at >= month_start, 1), else_=0)), 0).label("this_month"),
+    ).subquery()
+    courses = select(
+        func.count(Course.id).label("total"),
+        func.coalesce(func.sum(case((Course.created_at >= month_start, 1), else_=0)), 0).label("this_month"),
+    ).subquery()
+    skills = select(func.count(Skill.id).label("total")).subquery()
+    enrollments = select(func.count().label("total")).select_from(course_enrollments).where(
+        course_enrollments.c.completed_at.is_(None)
+    ).subquery()
+
+    row = db.execute(
+        select(
+            users.c.total,
+            users.c.this_month,
+            courses.c.total,
+            courses.c.this_month,
+            skills.c.total,
+            enrollments.c.total,
+        )
+    ).one()
+
+    return {
+        "total_users": row[0] or 0,
+        "new_users_this_month": row[1] or 0,
+        "total_courses": row[2] or 0,
+        "courses_published_this_month": row[3] or 0,
+        "total_skills": row[4] or 0,
+        "active_enrollments": row[5] or 0,
+    }
+
+
+def _reseed_rollup(db: Session) -> Dict[str, int]:
+    """Recompute every metric and overwrite the rollup rows"""
+    stats = compute_dashboard_stats(db)
+    now = datetime.utcnow()
+    month_start = _current_month_start()
+
+    for metric, value in stats.items():
+        db.merge(DashboardStatRollup(
+            metric=metric,
+            value=value,
+            period_start=month_start if metric in MONTHLY_METRICS else None,
+            refreshed_at=now,
+        ))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker seeded the table at the same time; its values are as good as ours
+        db.rollback()
+    return stats
+
+
+def get_dashboard_stats(db: Session) -> Dict[str, int]:
+    """
+    Get dashboard statistics (cache -> rollup table -> full recompute).
+
+    Args:
+        db: Database session
+
+    Returns:
+        Dictionary matching the DashboardStats schema
+    """
+    with _cache_lock:
+        if _cache["stats"] is not None and _cache["expires_at"] > time.monotonic():
+            return dict(_cache["stats"])
+
+    rows = {row.metric: row for row in db.query(DashboardStatRollup).all()}
+    oldest_refresh = min((row.refreshed_at for row in rows.values() if row.refreshed_at), default=None)
+
+    needs_reseed = (
+        any(metric not in rows for metric in TOTAL_METRICS + MONTHLY_METRICS)
+        or oldest_refresh is None
+        or (datetime.utcnow() - oldest_refresh).total_seconds() > DASHBOARD_STATS_RECONCILE_INTERVAL
+    )
+
+    if needs_reseed:
+        values = _reseed_rollup(db)
+    else:
+        month_start = _current_month_start()
+        values = {}
+        for metric in TOTAL_METRICS:
+            values[metric] = rows[metric].value or 0
+        for metric in MONTHLY_METRICS:
+            # A value stamped with a previous month means nothing happened yet this month
+            row = rows[metric]
+            values[metric] = (row.value or 0) if row.period_start == month_start else 0
+
+    stats = {
+        "total_users": values["total_users"],
+        "total_courses": values["total_courses"],
+        "total_skills": values["total_skills"],
+        # Jobs feature removed; keep total_jobs as 0 for compatibility
+        "total_jobs": 0,
+        "active_enrollments": values["active_enrollments"],
+        "new_users_this_month": values["new_users_this_month"],
+        "courses_published_this_month": values["courses_published_this_month"],
+    }
+
+    with _cache_lock:
+        _cache["stats"] = stats
+        _cache["expires_at"] = time.monotonic() + DASHBOARD_STATS_TTL
+
+    return dict(stats)
+
+
+def bump_dashboard_stat(db: Session, metric: str, delta: int = 1):
+    """
+    Incrementally adjust one rollup metric inside the caller's transaction.
+
+    Monthly metrics restart from zero when the stored period is not the
+    current month. If the rollup has not been seeded yet this is a no-op;
+    the first dashboard read computes everything from scratch.
+
+    Args:
+        db: Database session (the caller commits)
+        metric: Metric name (see TOTAL_METRICS / MONTHLY_METRICS)
+        delta: Amount to add (negative to decrement)
+    """
+    rollup = DashboardStatRollup.__table__
+    if metric in MONTHLY_METRICS:
+        month_start = _current_month_start()
+        stmt = rollup.update().where(rollup.c.metric == metric).values(
+            value=case(
+                (rollup.c.period_start == month_start, rollup.c.value + delta),
+                else_=max(delta, 0)
+            ),
+            period_start=month_start,
+        )
+    else:
+        stmt = rollup.update().where(rollup.c.metric == metric).values(value=rollup.c.value + delta)
+    db.execute(stmt)
+
+
+def record_user_created(db: Session):
+    """Rollup hook for a new user signup"""
+    bump_dashboard_stat(db, "total_users", 1)
+    bump_dashboard_stat(db, "new_users_this_month", 1)
+
+
+def record_course_created(db: Session):
+    """Rollup hook for a newly created course"""
+    bump_dashboard_stat(db, "total_courses", 1)
+    bump_dashboard_stat(db, "courses_published_this_month", 1)
+
+
+def record_course_deleted(db: Session, created_at: Optional[datetime]):
+    """Rollup hook for a deleted course (enrollments removed by cascade are reconciled later)"""
+    bump_dashboard_stat(db, "total_courses", -1)
+    if created_at and created_at >= _current_month_start():
+        bump_dashboard_stat(db, "courses_published_this_month", -1)
+
+
+def record_skill_created(db: Session):
+    """Rollup hook for a newly created skill"""
+    bump_dashboard_stat(db, "total_skills", 1)
+
+
+def record_skill_deleted(db: Session):
+    """Rollup hook for a deleted skill"""
+    bump_dashboard_stat(db, "total_skills", -1)
+
@@ -1,28 +1,81 @@
 """
 Gemini AI Service
 Handles all interactions with the Google Generative AI API
+
+The google.generativeai SDK is imported and configured lazily, on the first
+AI call, so importing the app stays fast and it can start without an API key.
 """
 import os
-from pathlib import Path
-import google.generativeai as genai
+import threading
 from dotenv import load_dotenv
 import json
 
+from profiling import timer
+
 # Load environment variables
 load_dotenv()
 
-# Configure the Gemini API key
-api_key = os.getenv("GEMINI_API_KEY")
-if not api_key:
-    raise ValueError("GEMINI_API_KEY not found in environment variables.")
-
-genai.configure(api_key=api_key)
-
-# Create generative model instances with fallback options
 # Use gemini-2.5-flash as primary (fast and efficient)
 # Fallback to gemini-2.0-flash if primary fails
-primary_model = genai.GenerativeModel('gemini-2.5-flash')
-fallback_model = genai.GenerativeModel('gemini-2.0-flash')
+PRIMARY_MODEL_NAME = 'gemini-2.5-flash'
+FALLBACK_MODEL_NAME = 'gemini-2.0-flash'
+
+_genai = None
+_models = {}
+_client_lock = threading.Lock()
+
+
+def is_configured() -> bool:
+    """Check whether a Gemini API key is available (does not import the SDK)"""
+    return bool(os.getenv("GEMINI_API_KEY"))
+
+
+def get_genai():
+    """
+    Import and configure the google.generativeai module on first use.
+
+    Raises:
+        ValueError: If GEMINI_API_KEY is not set
+    """
+    global _genai
+    if _genai is None:
+        with _client_lock:
+            if _genai is None:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise ValueError("GEMINI_API_KEY not found in environment variables.")
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                _genai = genai
+    return _genai
+
+
+class _ProfiledModel:
+    """GenerativeModel wrapper that reports generation time to the request profile"""
+
+    def __init__(self, model):
+        self._model = model
+
+    def generate_content(self, *args, **kwargs):
+        with timer("llm"):
+            return self._model.generate_content(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+
+def get_model(name: str = PRIMARY_MODEL_NAME):
+    """Get a cached GenerativeModel instance, creating it on first use"""
+    model = _models.get(name)
+    if model is None:
+        genai = get_genai()
+        with _client_lock:
+            model = _models.get(name)
+            if model is None:
+                model = _ProfiledModel(genai.GenerativeModel(name))
+                _models[name] = model
+    return model
+
 
 def generate_text(prompt: str) -> str:
     """
@@ -36,7 +89,7 @@ def generate_text(prompt: str) -> str:
     """
     # Try primary model first
     try:
-        response = primary_model.generate_content(prompt)
+        response = get_model(PRIMARY_MODEL_NAME).generate_content(prompt)
         return response.text
     except Exception as e:
         error_msg = str(e)
@@ -47,53 +100,44 @@ def generate_text(prompt: str) -> str:
             # Try fallback model
             try:
                 print("Attempting fallback model...")
-                response = fallback_model.generate_content(prompt)
+                response = get_model(FALLBACK_MODEL_NAME).generate_content(prompt)
                 return response.text
             except Exception as fallback_error:
                 print(f"Error generating text with Gemini (fallback model): {fallback_error}")
                 return "I apologize, but I've reached the API rate limit. Please try again in a few minutes."
         
         # For other errors, provide a more helpful message
-        if "api key" in error_msg.lower() or "authentication" in error_msg.lower():
+        if "api key" in error_msg.lower() or "api_key" in error_msg.lower() or "authentication" in error_msg.lower():
             return "I apologize, but there's an authentication issue with the AI service. Please contact support."
         
         # Generic error message
         return "I apologize, but I'm having trouble processing your request right now. Please try again later."
 
-def analyze_cv_pdf(pdf_file_path: str, available_skills: list = None) -> dict:
+def analyze_cv_pdf(pdf_file_path: str) -> dict:
     """
     Analyzes a CV PDF using Gemini and extracts structured data.
 
+    Skill names are returned as written in the CV; callers map them to
+    skill ids locally (cv_service.match_skills_to_database), so the prompt
+    does not grow with the skill catalog.
+
     Args:
         pdf_file_path: The path to the PDF file.
-        available_skills: List of available skill names from the database.
 
     Returns:
         A dictionary containing the extracted CV data.
     """
     try:
-        # Read PDF file
-        pdf_data = Path(pdf_file_path).read_bytes()
+        genai = get_genai()
 
         # Upload the file to Gemini
-        uploaded_file = genai.upload_file(pdf_file_path)
-
-        # Build skill list for the prompt
-        skills_list = ""
-        if available_skills:
-            skills_list = f"""
-        
-AVAILABLE SKILLS IN DATABASE (ONLY use skills from this list):
-{', '.join(available_skills)}
-
-IMPORTANT: For the 'skills' field, ONLY extract skills that are present in the above list. Match them as closely as possible (case-insensitive). If you find a skill not in the list, try to map it to the closest match from the available skills.
-        """
+        with timer("llm"):
+            uploaded_file = genai.upload_file(pdf_file_path)
 
         # The prompt to guide the model
-        prompt = f"""
+        prompt = """
         Analyze the provided CV PDF and extract the following information in a structured JSON format.
         The JSON object should have these keys: 'personal_summary', 'experiences', 'education', 'skills', 'tools', 'projects'.
-        {skills_list}
         - 'personal_summary': A string (professional summary or objective statement).
         - 'experiences': An array of objects, each with these fields:
           * 'title' (string, required): Job title
@@ -109,7 +153,7 @@ IMPORTANT: For the 'skills' field, ONLY extract skills that are present in the a
           * 'field' (string or null): Field of study
           * 'graduation_year' (string or null): Year of graduation
           * 'gpa' (string or null): GPA if mentioned
-        - 'skills': An array of skill name STRINGS. Only include skills from the AVAILABLE SKILLS list above.
+        - 'skills': An array of skill name STRINGS (short names as written in the CV, e.g. "Python", "Project Management").
         - 'tools': An array of strings for tools/technologies (software, frameworks, platforms, etc.)
         - 'projects': An array of objects, each with these fields:
           * 'name' (string, required): Project name
@@ -118,7 +162,7 @@ IMPORTANT: For the 'skills' field, ONLY extract skills that are present in the a
           * 'link' (string or null): Project link if available
         
         IMPORTANT FORMATTING RULES:
-        1. For 'skills': Return skill names as strings, only from the available skills list
+        1. For 'skills': Return skill names as strings, one skill per entry
         2. For 'technologies' in projects: Return as a COMMA-SEPARATED STRING, not an array (e.g., "React, Node.js, MongoDB")
         3. For 'current' field in experiences: Return boolean true/false
         4. For dates: Keep them as strings in whatever format found
@@ -130,13 +174,13 @@ IMPORTANT: For the 'skills' field, ONLY extract skills that are present in the a
         # Generate content using the model with the uploaded file
         # Try primary model first, fallback to secondary if needed
         try:
-            response = primary_model.generate_content([prompt, uploaded_file])
+            response = get_model(PRIMARY_MODEL_NAME).generate_content([prompt, uploaded_file])
         except Exception as e:
             error_msg = str(e)
             print(f"Error with primary model for CV analysis: {error_msg}")
             if "429" in error_msg or "quota" in error_msg.lower():
                 # Try fallback model
-                response = fallback_model.generate_content([prompt, uploaded_file])
+                response = get_model(FALLBACK_MODEL_NAME).generate_content([prompt, uploaded_file])
             else:
                 raise
         
@@ -145,7 +189,8 @@ IMPORTANT: For the 'skills' field, ONLY extract skills that are present in the a
         parsed_data = json.loads(cleaned_response)
         
         # Delete the uploaded file
-        genai.delete_file(uploaded_file.name)
+        with timer("llm"):
+            genai.delete_file(uploaded_file.name)
         
         return parsed_data
 
@@ -2,21 +2,15 @@
 Job Recommendation Service with AI-Powered Matching
 Uses Gemini AI to analyze user profiles and recommend jobs with skill gap analysis
 """
-import google.generativeai as genai
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 import json
-from models import User, Job, Skill, Course
-import os
-from dotenv import load_dotenv
+from models import User, Job
+from services.search_service import find_courses_for_skills
+from services.skill_array_service import skill_names_by_id
+from services.gemini_service import get_model
 
-load_dotenv()
-
-# Configure Gemini
-api_key = os.getenv("GEMINI_API_KEY")
-if api_key:
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-2.0-flash-exp')
+JOB_MATCH_MODEL_NAME = 'gemini-2.0-flash-exp'
 
 
 def get_user_profile_summary(db: Session, user_id: int) -> Dict[str, Any]:
@@ -53,29 +47,14 @@ def get_all_active_jobs(db: Session) -> List[Dict[str, Any]]:
     Get all active jobs with their details
     """
     jobs = db.query(Job).filter(Job.is_active == True).all()
+    # Required skills are skill ID arrays; resolve every name in one query
+    skill_names = skill_names_by_id(db, [job.required_skills for job in jobs])
     
     job_list = []
     for job in jobs:
-        # Parse required skills - could be skill IDs or names
-        required_skills = []
-        if job.required_skills:
-            try:
-                # Try to parse as JSON first (could be array of IDs or names)
-                parsed_skills = json.loads(job.required_skills)
-                
-                # Check if they are integers (skill IDs) or strings (skill names)
-                if parsed_skills and isinstance(parsed_skills[0], int):
-                    # They are skill IDs, convert to names
-                    skill_ids = parsed_skills
-                    skills = db.query(Skill).filter(Skill.id.in_(skill_ids)).all()
-                    required_skills = [skill.name for skill in skills]
-                else:
-                    # They are already skill names
-                    required_skills = [str(s) for s in parsed_skills]
-            except (json.JSONDecodeError, TypeError, IndexError):
-                # Not JSON, try comma-separated string
-                if job.required_skills:
-                    required_skills = [s.strip() for s in str(job.required_skills).split(',') if s.strip()]
+        required_skills = [
+            skill_names[skill_id] for skill_id in (job.required_skills or []) if skill_id in skill_names
+        ]
         
         job_list.append({
             "id": job.id,
@@ -95,33 +74,9 @@ def get_all_active_jobs(db: Session) -> List[Dict[str, Any]]:
 
 def get_relevant_courses_for_skills(db: Session, skill_names: List[str]) -> List[Dict[str, Any]]:
     """
-    Find courses that teach the missing skills
+    Find courses that teach the missing skills (top 5, one indexed query)
     """
-    courses = db.query(Course).filter(Course.is_active == True).all()
-    
-    relevant_courses = []
-    for course in courses:
-        # Check if course teaches any of the missing skills
-        course_relevance = 0
-        for skill in skill_names:
-            skill_lower = skill.lower()
-            if (skill_lower in course.title.lower() or 
-                skill_lower in (course.description or "").lower()):
-                course_relevance += 1
-        
-        if course_relevance > 0:
-            relevant_courses.append({
-                "id": course.id,
-                "title": course.title,
-                "platform": course.platform,
-                "url": course.url,
-                "cost_type": course.cost_type,
-                "relevance_score": course_relevance
-            })
-    
-    # Sort by relevance
-    relevant_courses.sort(key=lambda x: x["relevance_score"], reverse=True)
-    return relevant_courses[:5]  # Top 5 most relevant
+    return find_courses_for_skills(db, skill_names, limit=5)
 
 
 def analyze_job_match_with_ai(
@@ -180,7 +135,7 @@ Return ONLY the JSON object, no additional text.
 """
     
     try:
-        response = model.generate_content(prompt)
+        response = get_model(JOB_MATCH_MODEL_NAME).generate_content(prompt)
         result_text = response.text.strip()
         
         # Clean up response
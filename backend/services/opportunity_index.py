@@ -0,0 +1,265 @@
+"""
+Opportunity Index
+In-memory inverted index for matching local opportunities to a user profile
+
+Required skills and target tracks of every active opportunity are parsed and
+normalized once, when the index is built, into token -> opportunity id
+postings. A recommendation request then only touches the postings of the
+user's own skills and track, scores the candidates and keeps a bounded
+top-K with heapq instead of scanning every opportunity.
+"""
+import heapq
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from models import LocalOpportunity
+
+# Number of opportunities returned (and sent to Gemini) per recommendation
+OPPORTUNITY_TOP_K = int(os.getenv("OPPORTUNITY_TOP_K", "20"))
+# Rebuild the shared index at least this often so changes made by other
+# workers are picked up (local changes invalidate it immediately)
+OPPORTUNITY_INDEX_TTL = float(os.getenv("OPPORTUNITY_INDEX_TTL_SECONDS", "300"))
+
+# Score weights
+SKILL_MATCH_WEIGHT = 3
+TRACK_MATCH_WEIGHT = 2
+# Bonus for opportunities open to all youth (user profiles record no priority
+# group, so opportunities targeting a specific group get no bonus)
+OPEN_TO_ALL_WEIGHT = 1
+
+# Priority groups that mean "open to everyone"
+OPEN_PRIORITY_GROUPS = {"", "all", "all youth", "everyone"}
+
+# Longest user-skill n-gram looked up as a required-skill phrase
+MAX_PHRASE_WORDS = 4
+
+_NON_TOKEN_CHARS = re.compile(r"[^a-z0-9+#.]+")
+
+
+def normalize_phrase(value) -> str:
+    """Lowercase a skill/track name and collapse punctuation and whitespace"""
+    words = _NON_TOKEN_CHARS.sub(" ", str(value).lower()).split()
+    return " ".join(word.strip(".") for word in words if word.strip("."))
+
+
+def parse_required_skills(required_skills: Union[None, str, List]) -> List[str]:
+    """
+    Parse the `required_skills` column (array of skill IDs; names, JSON
+    strings and comma-separated strings are also accepted) into normalized
+    skill phrases. Skill IDs become "id:<n>" tokens.
+    """
+    if not required_skills:
+        return []
+    if isinstance(required_skills, list):
+        values = required_skills
+    else:
+        try:
+            values = json.loads(required_skills)
+            if not isinstance(values, list):
+                values = [values]
+        except (json.JSONDecodeError, TypeError):
+            values = required_skills.split(",")
+
+    phrases = []
+    for value in values:
+        if isinstance(value, int) and not isinstance(value, bool):
+            phrases.append(f"id:{value}")
+        else:
+            phrase = normalize_phrase(value)
+            if phrase:
+                phrases.append(phrase)
+    return phrases
+
+
+def _skill_fields(skill) -> Tuple[Optional[int], str]:
+    """Get (id, name) from a skill model, snapshot dict or plain string"""
+    if isinstance(skill, dict):
+        return skill.get("id"), skill.get("name", "") or ""
+    if hasattr(skill, "name"):
+        return getattr(skill, "id", None), skill.name or ""
+    return None, str(skill)
+
+
+class OpportunityIndex:
+    """
+    Immutable inverted index over active opportunities.
+
+    Postings:
+    - skill phrase ("machine learning", "id:7") -> opportunity ids
+    - skill word ("machine", "learning") -> opportunity ids
+    - track word ("data", "science") -> opportunity ids
+    """
+
+    def __init__(self, opportunities: Iterable):
+        """
+        Args:
+            opportunities: Objects with id, target_track, required_skills,
+                priority_group and is_active attributes (models or rows)
+        """
+        self._skill_phrases: Dict[str, Set[int]] = defaultdict(set)
+        self._skill_words: Dict[str, Set[int]] = defaultdict(set)
+        self._track_words: Dict[str, Set[int]] = defaultdict(set)
+        self._tracks: Dict[int, FrozenSet[str]] = {}
+        self._open_ids: Set[int] = set()
+        self._ids: List[int] = []
+
+        for opp in opportunities:
+            if getattr(opp, "is_active", True) is False:
+                continue
+            self._ids.append(opp.id)
+
+            for phrase in parse_required_skills(opp.required_skills):
+                self._skill_phrases[phrase].add(opp.id)
+                if not phrase.startswith("id:"):
+                    for word in phrase.split():
+                        self._skill_words[word].add(opp.id)
+
+            track_words = frozenset(normalize_phrase(opp.target_track or "").split())
+            if track_words:
+                self._tracks[opp.id] = track_words
+                for word in track_words:
+                    self._track_words[word].add(opp.id)
+
+            if normalize_phrase(opp.priority_group or "") in OPEN_PRIORITY_GROUPS:
+                self._open_ids.add(opp.id)
+
+        # Newest first, used when nothing matches
+        self._ids.sort(reverse=True)
+
+    @property
+    def size(self) -> int:
+        """Number of indexed (active) opportunities"""
+        return len(self._ids)
+
+    def _match_skill(self, skill) -> Set[int]:
+        """Opportunity ids whose required skills match one user skill"""
+        skill_id, name = _skill_fields(skill)
+        words = normalize_phrase(name).split()
+        matched: Set[int] = set()
+
+        if skill_id is not None:
+            matched |= self._skill_phrases.get(f"id:{skill_id}", set())
+        if not words:
+            return matched
+
+        # Required skill contains the user skill ("python" ~ "python programming")
+        postings = [self._skill_words.get(word) for word in words]
+        if all(postings):
+            matched |= set.intersection(*postings)
+
+        # User skill contains the required skill ("sql" ~ "sql databases")
+        for size in range(1, min(len(words), MAX_PHRASE_WORDS) + 1):
+            for start in range(len(words) - size + 1):
+                matched |= self._skill_phrases.get(" ".join(words[start:start + size]), set())
+
+        return matched
+
+    def _match_track(self, track: Optional[str]) -> Set[int]:
+        """Opportunity ids whose target track overlaps the user's track"""
+        track_words = frozenset(normalize_phrase(track or "").split())
+        if not track_words:
+            return set()
+        candidates = set()
+        for word in track_words:
+            candidates |= self._track_words.get(word, set())
+        return {
+            opp_id for opp_id in candidates
+            if track_words <= self._tracks[opp_id] or self._tracks[opp_id] <= track_words
+        }
+
+    def search(
+        self,
+        user_skills: List,
+        user_track: Optional[str] = None,
+        limit: int = OPPORTUNITY_TOP_K
+    ) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Rank opportunities for a user.
+
+        Score = 3 x matched user skills + 2 x track match + 1 if the
+        opportunity is open to all youth.
+        Only opportunities with at least one skill or track match are
+        ranked; if there are none, the newest opportunities are returned.
+
+        Args:
+            user_skills: Skill models, {"id", "name"} dicts or names
+            user_track: User's preferred career track
+            limit: Maximum number of results (top-K)
+
+        Returns:
+            Tuple of ([(opportunity_id, score)] best first, total matched)
+        """
+        skill_counts = Counter()
+        for skill in user_skills or []:
+            skill_counts.update(self._match_skill(skill))
+        track_ids = self._match_track(user_track)
+
+        candidates = track_ids.union(skill_counts)
+        if not candidates:
+            return [(opp_id, 0) for opp_id in self._ids[:limit]], 0
+
+        open_ids = self._open_ids
+
+        def score(opp_id: int) -> int:
+            value = SKILL_MATCH_WEIGHT * skill_counts[opp_id]
+            if opp_id in track_ids:
+                value += TRACK_MATCH_WEIGHT
+            if opp_id in open_ids:
+                value += OPEN_TO_ALL_WEIGHT
+            return value
+
+        # Ties go to the newest opportunity
+        ranked = heapq.nlargest(limit, ((score(opp_id), opp_id) for opp_id in candidates))
+        return [(opp_id, value) for value, opp_id in ranked], len(candidates)
+
+
+_index: Optional[OpportunityIndex] = None
+_built_at = 0.0
+_generation = 0
+_index_lock = threading.Lock()
+
+
+def build_opportunity_index(db: Session) -> OpportunityIndex:
+    """Build an index from the active opportunities (loads only indexed columns)"""
+    rows = db.query(
+        LocalOpportunity.id,
+        LocalOpportunity.target_track,
+        LocalOpportunity.required_skills,
+        LocalOpportunity.priority_group,
+    ).filter(LocalOpportunity.is_active == True).yield_per(1000)
+    return OpportunityIndex(rows)
+
+
+def get_opportunity_index(db: Session) -> OpportunityIndex:
+    """
+    Get the shared index, rebuilding it if it was invalidated or is older
+    than OPPORTUNITY_INDEX_TTL_SECONDS.
+    """
+    global _index, _built_at
+    with _index_lock:
+        if _index is not None and time.monotonic() - _built_at < OPPORTUNITY_INDEX_TTL:
+            return _index
+        generation = _generation
+
+    index = build_opportunity_index(db)
+    with _index_lock:
+        # Don't publish an index that was invalidated while it was being built
+        if generation == _generation:
+            _index = index
+            _built_at = time.monotonic()
+    return index
+
+
+def invalidate_opportunity_index():
+    """Drop the shared index; call after creating, updating or deleting opportunities"""
+    global _index, _generation
+    with _index_lock:
+        _index = None
+        _generation += 1
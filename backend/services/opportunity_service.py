@@ -2,10 +2,24 @@
 Opportunity Service
 Handles AI-powered local opportunity recommendations using Gemini
 """
+import hashlib
 import json
+from datetime import datetime
 from typing import Dict, List, Optional
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from models import OpportunityExplanation
 from services.gemini_service import generate_text
 from services.language_service import detect_language
+from services.opportunity_index import OpportunityIndex, OPPORTUNITY_TOP_K
+
+# Returned instead of an explanation when Gemini fails (never cached)
+OPPORTUNITY_ERROR_MESSAGE = "I apologize, but I'm having trouble processing your request right now. Please try again later."
+
+# Bump when the prompt changes so cached explanations are regenerated
+EXPLANATION_CACHE_VERSION = 2
 
 
 def build_user_context_for_opportunities(
@@ -78,12 +92,13 @@ def build_user_context_for_opportunities(
     }
 
 
-def format_opportunities_for_prompt(opportunities: List) -> str:
+def format_opportunities_for_prompt(opportunities: List, skill_names: Optional[Dict[int, str]] = None) -> str:
     """
     Format opportunities list into a readable string for Gemini prompt.
     
     Args:
         opportunities: List of LocalOpportunity model objects
+        skill_names: Skill names by ID, used to spell out required skills
         
     Returns:
         Formatted string
@@ -91,17 +106,12 @@ def format_opportunities_for_prompt(opportunities: List) -> str:
     if not opportunities:
         return "No opportunities available."
     
+    skill_names = skill_names or {}
     formatted = []
     for idx, opp in enumerate(opportunities, 1):
-        # Parse required_skills if it's JSON
         skills_str = "Not specified"
         if opp.required_skills:
-            try:
-                skills_list = json.loads(opp.required_skills)
-                if isinstance(skills_list, list):
-                    skills_str = ", ".join(str(s) for s in skills_list)
-            except:
-                skills_str = opp.required_skills
+            skills_str = ", ".join(skill_names.get(s, str(s)) for s in opp.required_skills)
         
         opp_text = f"""
 {idx}. {opp.title}
@@ -254,7 +264,8 @@ def clean_opportunity_response(response: str) -> str:
 def generate_opportunity_recommendations(
     user_context: Dict,
     opportunities: List,
-    language: str = "en"
+    language: str = "en",
+    skill_names: Optional[Dict[int, str]] = None
 ) -> str:
     """
     Generate personalized opportunity recommendations using Gemini.
@@ -263,13 +274,14 @@ def generate_opportunity_recommendations(
         user_context: User context dictionary
         opportunities: List of LocalOpportunity model objects
         language: Detected language ("en", "bn", or "mix")
+        skill_names: Skill names by ID for the opportunities' required skills
         
     Returns:
         Gemini-generated explanation text
     """
     try:
         # Format opportunities for prompt
-        opportunities_text = format_opportunities_for_prompt(opportunities)
+        opportunities_text = format_opportunities_for_prompt(opportunities, skill_names)
         
         # Build prompt
         prompt = build_opportunity_prompt(user_context, opportunities_text, language)
@@ -284,81 +296,110 @@ def generate_opportunity_recommendations(
         
     except Exception as e:
         print(f"Error generating opportunity recommendations: {e}")
-        return "I apologize, but I'm having trouble processing your request right now. Please try again later."
+        return OPPORTUNITY_ERROR_MESSAGE
+
+
+def build_explanation_cache_key(
+    user_context: Dict,
+    opportunities: List,
+    language: str
+) -> str:
+    """
+    Hash every input of an explanation into a cache key.
+    
+    Args:
+        user_context: Compact user context (from build_user_context_for_opportunities)
+        opportunities: Selected LocalOpportunity objects, in ranked order
+        language: Detected language
+        
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {
+        "version": EXPLANATION_CACHE_VERSION,
+        "user": user_context,
+        "opportunities": [
+            [opp.id, (opp.updated_at or opp.created_at).isoformat() if (opp.updated_at or opp.created_at) else None]
+            for opp in opportunities
+        ],
+        "language": language,
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_cached_explanation(db: Session, user_id: int, cache_key: str) -> Optional[OpportunityExplanation]:
+    """Get the user's cached explanation if it was generated from the same inputs"""
+    return db.query(OpportunityExplanation).filter(
+        OpportunityExplanation.user_id == user_id,
+        OpportunityExplanation.cache_key == cache_key
+    ).first()
+
+
+def save_explanation(
+    db: Session,
+    user_id: int,
+    cache_key: str,
+    language: str,
+    explanation: str
+) -> OpportunityExplanation:
+    """
+    Store (or replace) the user's cached explanation
+    
+    A single INSERT ... ON CONFLICT (user_id) DO UPDATE, so two concurrent
+    first requests for a user cannot both insert. Caching is best effort:
+    if the write still fails it is logged and the explanation is returned
+    anyway, rather than failing a request that already paid for Gemini.
+    
+    Returns:
+        The stored row's values (not attached to the session)
+    """
+    values = {
+        "user_id": user_id,
+        "cache_key": cache_key,
+        "language": language,
+        "explanation": explanation,
+        "generated_at": datetime.utcnow(),
+    }
+    dialect_insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = dialect_insert(OpportunityExplanation).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[OpportunityExplanation.user_id],
+        set_={column: stmt.excluded[column] for column in values if column != "user_id"}
+    )
+    try:
+        db.execute(stmt)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"Error caching opportunity explanation for user {user_id}: {e}")
+    return OpportunityExplanation(**values)
 
 
 def filter_opportunities_by_user_profile(
     opportunities: List,
     user_skills: List,
-    user_track: Optional[str] = None
+    user_track: Optional[str] = None,
+    limit: int = OPPORTUNITY_TOP_K
 ) -> List:
     """
-    Filter opportunities based on user profile and skills.
+    Filter and rank opportunities based on user profile and skills.
+    
+    Builds a throwaway OpportunityIndex over `opportunities`; request
+    handlers should use the shared index from get_opportunity_index instead.
     
     Args:
-        opportunities: List of all LocalOpportunity objects
+        opportunities: List of LocalOpportunity objects
         user_skills: List of user's skill objects
         user_track: User's preferred career track (optional)
+        limit: Maximum number of opportunities returned
         
     Returns:
-        Filtered list of opportunities
+        Ranked list of at most `limit` opportunities
     """
     if not opportunities:
         return []
     
-    # Extract user skill names
-    user_skill_names = []
-    if user_skills:
-        for skill in user_skills:
-            if hasattr(skill, "name"):
-                user_skill_names.append(skill.name.lower())
-            elif isinstance(skill, dict):
-                user_skill_names.append(skill.get("name", "").lower())
-            else:
-                user_skill_names.append(str(skill).lower())
-    
-    filtered = []
-    
-    for opp in opportunities:
-        if not opp.is_active:
-            continue
-        
-        # Match by track
-        track_match = False
-        if user_track and opp.target_track:
-            track_match = user_track.lower() in opp.target_track.lower() or opp.target_track.lower() in user_track.lower()
-        
-        # Match by skills
-        skill_match = False
-        if opp.required_skills:
-            try:
-                required_skills_list = json.loads(opp.required_skills)
-                if isinstance(required_skills_list, list):
-                    # Check if at least 1-2 skills overlap
-                    overlap_count = 0
-                    for req_skill in required_skills_list:
-                        req_skill_str = str(req_skill).lower()
-                        # Check if any user skill matches
-                        for user_skill in user_skill_names:
-                            if user_skill in req_skill_str or req_skill_str in user_skill:
-                                overlap_count += 1
-                                break
-                    skill_match = overlap_count >= 1
-            except:
-                # If not JSON, try string matching
-                req_skills_str = opp.required_skills.lower()
-                for user_skill in user_skill_names:
-                    if user_skill in req_skills_str:
-                        skill_match = True
-                        break
-        
-        # Include if track matches OR skills match
-        if track_match or skill_match:
-            filtered.append(opp)
-    
-    # If no matches, return all active opportunities (fallback)
-    if not filtered:
-        filtered = [opp for opp in opportunities if opp.is_active]
-    
-    return filtered
-
+    ranked, _ = OpportunityIndex(opportunities).search(user_skills, user_track, limit=limit)
+    by_id = {opp.id: opp for opp in opportunities}
+    return [by_id[opp_id] for opp_id, _ in ranked]
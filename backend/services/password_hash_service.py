@@ -0,0 +1,113 @@
+"""
+Password Hash Service
+bcrypt hashing and verification off the request threads
+
+register, login and admin login used to run bcrypt inline, so a login spike
+filled the threadpool with CPU-bound work and starved every other sync route.
+Hashes are now computed by a process pool sized to the CPU count. At most
+`max_pending` operations may be queued or running; beyond that callers get a
+503 with Retry-After instead of waiting behind the backlog.
+
+`max_pending` is larger than the database pool, so callers release their
+pooled connection (db.close()) before awaiting a hash and check one out
+again (database.reacquire_connection) only to write the result.
+
+Set PASSWORD_HASH_WORKERS=0 to hash in the threadpool instead (the fallback
+whenever the pool is not running, e.g. in scripts without the app lifespan).
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from auth import get_password_hash, verify_and_update_password
+
+# Worker processes (0 = hash in the threadpool)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# Hash operations allowed in flight (queued or running) before shedding with 503;
+# a login waits behind at most 8 hashes per worker
+PASSWORD_HASH_MAX_PENDING = int(
+    os.getenv("PASSWORD_HASH_MAX_PENDING", str(8 * max(PASSWORD_HASH_WORKERS, 1)))
+)
+# Seconds clients are told to wait after a 503
+PASSWORD_HASH_RETRY_AFTER = os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "1")
+
+
+class PasswordHasher:
+    """
+    Bounded front end for bcrypt work.
+
+    `hash()` and `verify()` are coroutines; the CPU work runs in a spawned
+    process pool (spawn, so workers do not inherit the parent's database
+    connections or threads) and the event loop only awaits the result.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self):
+        """Start the worker processes (no-op with workers=0 or if already running)"""
+        if self.workers <= 0 or self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        # Spawn every worker now instead of on the first logins; one submit per
+        # worker while none is idle starts a process each. Not awaited, so
+        # startup does not wait for the interpreters to boot.
+        for _ in range(self.workers):
+            self._executor.submit(os.getpid)
+
+    def stop(self):
+        """Shut down the worker processes, waiting for running hashes"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password for storage"""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password against its stored hash
+
+        Returns:
+            (verified, new_hash) - new_hash is set when the stored hash uses
+            outdated parameters (e.g. BCRYPT_ROUNDS changed) and should be saved
+        """
+        return await self._run(verify_and_update_password, password, hashed_password)
+
+    async def _run(self, func, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many login attempts in progress, please retry shortly",
+                    headers={"Retry-After": PASSWORD_HASH_RETRY_AFTER},
+                )
+            self._pending += 1
+        try:
+            executor = self._executor
+            if executor is None:
+                return await run_in_threadpool(func, *args)
+            return await asyncio.wrap_future(executor.submit(func, *args))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+password_hasher = PasswordHasher()
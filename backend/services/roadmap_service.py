@@ -39,7 +39,7 @@ def build_user_context_for_roadmap(user_profile, user_skills: list, user_cv: Opt
                 "personal_summary": user_cv.personal_summary or "",
                 "experiences": json.loads(user_cv.experiences) if user_cv.experiences else [],
                 "education": json.loads(user_cv.education) if user_cv.education else [],
-                "skills": json.loads(user_cv.skills) if user_cv.skills else [],
+                "skills": user_cv.skills or [],
                 "tools": json.loads(user_cv.tools) if user_cv.tools else [],
                 "projects": json.loads(user_cv.projects) if user_cv.projects else [],
                 "raw_cv_text": user_cv.raw_cv_text or "",
@@ -0,0 +1,272 @@
+"""
+Search Service
+Ranked full-text search over courses, jobs and local opportunities
+
+On Postgres every searchable table has a weighted `search_vector` tsvector
+column (title > organization/platform/track > description), maintained by
+a trigger and indexed with GIN. Queries use websearch_to_tsquery, so users
+can type quoted phrases, OR and -exclusions. Results are ranked with
+ts_rank_cd and highlighted with ts_headline.
+
+On SQLite (development, benchmarks) the same API falls back to
+case-insensitive LIKE matching with the same field weights.
+
+Highlights are HTML: the text is escaped and matches are wrapped in
+<mark>...</mark>, so clients can render them as they are. ts_headline
+marks matches with control-character sentinels, which are swapped for
+<mark> tags after escaping.
+"""
+import html
+import re
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import case, func, literal, or_
+from sqlalchemy.orm import Session
+
+from models import (
+    Course, Job, LocalOpportunity, SEARCH_TEXT_CONFIG,
+    COURSE_SEARCH_FIELDS, JOB_SEARCH_FIELDS, OPPORTUNITY_SEARCH_FIELDS
+)
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+# Longest query term list used by the LIKE fallback
+MAX_FALLBACK_TERMS = 8
+
+# ts_headline match delimiters (ASCII STX/ETX: valid in any encoding, left alone by html.escape)
+START_SEL = "\x02"
+STOP_SEL = "\x03"
+HEADLINE_OPTIONS = f"StartSel={START_SEL}, StopSel={STOP_SEL}, MaxWords=35, MinWords=15, MaxFragments=2"
+TITLE_HEADLINE_OPTIONS = f"StartSel={START_SEL}, StopSel={STOP_SEL}, HighlightAll=true"
+
+# ts_rank default weights for A, B, C, D
+FIELD_WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.2, "D": 0.1}
+
+# kind -> model, indexed fields, subtitle column and the filters it supports
+SEARCH_TARGETS = {
+    "courses": {
+        "model": Course,
+        "fields": COURSE_SEARCH_FIELDS,
+        "subtitle": "platform",
+        "filters": {"cost_type"},
+    },
+    "jobs": {
+        "model": Job,
+        "fields": JOB_SEARCH_FIELDS,
+        "subtitle": "company_name",
+        "filters": set(),
+    },
+    "opportunities": {
+        "model": LocalOpportunity,
+        "fields": OPPORTUNITY_SEARCH_FIELDS,
+        "subtitle": "organization",
+        "filters": {"category", "target_track"},
+    },
+}
+
+
+def uses_full_text_search(db: Session) -> bool:
+    """True when the session is bound to Postgres (tsvector columns available)"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _query_terms(query: str) -> List[str]:
+    """Lowercased words of a search query for the LIKE fallback"""
+    terms = [term for term in re.findall(r"[\w+#.]+", query.lower()) if len(term) > 1 or term.isdigit()]
+    return list(dict.fromkeys(terms))[:MAX_FALLBACK_TERMS]
+
+
+def _mark_headline(headline: Optional[str]) -> str:
+    """HTML-escape a ts_headline result and turn its sentinel delimiters into <mark> tags"""
+    if not headline:
+        return ""
+    return html.escape(headline).replace(START_SEL, "<mark>").replace(STOP_SEL, "</mark>")
+
+
+def _highlight(text: Optional[str], terms: Sequence[str], max_chars: int = 240) -> str:
+    """HTML-escape a fragment around the first match of `terms`, wrapping matches in <mark>"""
+    if not text:
+        return ""
+    if not terms:
+        return html.escape(text[:max_chars])
+    pattern = re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    match = pattern.search(text)
+    start = max(0, match.start() - max_chars // 3) if match else 0
+    fragment = text[start:start + max_chars]
+
+    parts, position = [], 0
+    for found in pattern.finditer(fragment):
+        parts.append(html.escape(fragment[position:found.start()]))
+        parts.append(f"<mark>{html.escape(found.group(0))}</mark>")
+        position = found.end()
+    parts.append(html.escape(fragment[position:]))
+    return ("..." if start > 0 else "") + "".join(parts) + ("..." if start + max_chars < len(text) else "")
+
+
+def _apply_filters(query, model, filters: Dict):
+    for name, value in filters.items():
+        if value is None:
+            continue
+        column = getattr(model, name)
+        if name == "is_active":
+            query = query.filter(column == value)
+        else:
+            query = query.filter(func.lower(column) == value.lower())
+    return query
+
+
+def _search_postgres(db: Session, kind: str, target: Dict, query_text: str, filters: Dict, limit: int) -> List[Dict]:
+    model = target["model"]
+    ts_query = func.websearch_to_tsquery(SEARCH_TEXT_CONFIG, query_text)
+    rank = func.ts_rank_cd(model.search_vector, ts_query)
+
+    # Rank and limit on the GIN index first, then build headlines for the page only
+    ranked = _apply_filters(
+        db.query(model.id.label("id"), rank.label("rank")).filter(model.search_vector.op("@@")(ts_query)),
+        model, filters
+    ).order_by(rank.desc(), model.id.desc()).limit(limit).subquery()
+
+    # Drop sentinel characters from the stored text, so every one in a headline is a delimiter
+    title = func.translate(model.title, START_SEL + STOP_SEL, "")
+    description = func.translate(func.coalesce(model.description, ""), START_SEL + STOP_SEL, "")
+    subtitle = getattr(model, target["subtitle"])
+    rows = db.query(
+        model.id,
+        func.ts_headline(SEARCH_TEXT_CONFIG, title, ts_query, TITLE_HEADLINE_OPTIONS),
+        subtitle,
+        func.ts_headline(SEARCH_TEXT_CONFIG, description, ts_query, HEADLINE_OPTIONS),
+        ranked.c.rank,
+    ).join(ranked, ranked.c.id == model.id).order_by(ranked.c.rank.desc(), model.id.desc()).all()
+
+    return [
+        {
+            "kind": kind, "id": row[0], "title": _mark_headline(row[1]), "subtitle": row[2],
+            "headline": _mark_headline(row[3]), "rank": float(row[4]),
+        }
+        for row in rows
+    ]
+
+
+def _search_fallback(db: Session, kind: str, target: Dict, query_text: str, filters: Dict, limit: int) -> List[Dict]:
+    model = target["model"]
+    terms = _query_terms(query_text)
+    if not terms:
+        return []
+
+    rank = literal(0.0)
+    for column_name, weight in target["fields"]:
+        column = func.lower(func.coalesce(getattr(model, column_name), ""))
+        for term in terms:
+            rank = rank + case((column.contains(term, autoescape=True), FIELD_WEIGHTS[weight]), else_=0.0)
+
+    subtitle = getattr(model, target["subtitle"])
+    rows = _apply_filters(
+        db.query(model.id, model.title, subtitle, model.description, rank.label("rank")).filter(rank > 0),
+        model, filters
+    ).order_by(rank.desc(), model.id.desc()).limit(limit).all()
+
+    return [
+        {
+            "kind": kind, "id": row[0], "title": _highlight(row[1], terms), "subtitle": row[2],
+            "headline": _highlight(row[3], terms), "rank": float(row[4]),
+        }
+        for row in rows
+    ]
+
+
+def search_catalog(
+    db: Session,
+    query_text: str,
+    kinds: Optional[Sequence[str]] = None,
+    category: Optional[str] = None,
+    target_track: Optional[str] = None,
+    cost_type: Optional[str] = None,
+    is_active: Optional[bool] = True,
+    limit: int = SEARCH_DEFAULT_LIMIT
+) -> List[Dict]:
+    """
+    Search courses, jobs and local opportunities.
+
+    A filter only applies to the kinds that have that field (cost_type:
+    courses; category and target_track: opportunities), and kinds that lack
+    a requested filter are left out of the results.
+
+    Args:
+        db: Database session
+        query_text: User query (websearch syntax on Postgres)
+        kinds: Subset of SEARCH_TARGETS to search (all when empty)
+        category: Opportunity category
+        target_track: Opportunity target track
+        cost_type: Course cost type ("free"/"paid")
+        is_active: Only active (True) or inactive (False) entries; None for both
+        limit: Maximum number of results overall
+
+    Returns:
+        Results ordered by rank: [{"kind", "id", "title", "subtitle", "headline", "rank"}]
+    """
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    requested = {"category": category, "target_track": target_track, "cost_type": cost_type}
+    requested = {name: value for name, value in requested.items() if value}
+    search = _search_postgres if uses_full_text_search(db) else _search_fallback
+
+    results = []
+    for kind in kinds or SEARCH_TARGETS:
+        target = SEARCH_TARGETS[kind]
+        if not set(requested) <= target["filters"]:
+            continue
+        results.extend(search(db, kind, target, query_text, {**requested, "is_active": is_active}, limit))
+
+    results.sort(key=lambda result: result["rank"], reverse=True)
+    return results[:limit]
+
+
+def find_courses_for_skills(db: Session, skill_names: Sequence[str], limit: int = 5) -> List[Dict]:
+    """
+    Find active courses that teach any of `skill_names`, best matches first.
+
+    One indexed query: relevance is the number of skills a course matches
+    (full-text on Postgres, substring on SQLite), ties broken by text rank.
+
+    Returns:
+        [{"id", "title", "platform", "url", "cost_type", "relevance_score"}]
+    """
+    skill_names = [name.strip() for name in skill_names if name and name.strip()]
+    if not skill_names:
+        return []
+
+    if uses_full_text_search(db):
+        skill_queries = [func.plainto_tsquery(SEARCH_TEXT_CONFIG, name) for name in skill_names]
+        matches = [Course.search_vector.op("@@")(skill_query) for skill_query in skill_queries]
+        any_skill = skill_queries[0]
+        for skill_query in skill_queries[1:]:
+            any_skill = any_skill.op("||")(skill_query)
+        tie_break = func.ts_rank_cd(Course.search_vector, any_skill)
+    else:
+        matches = [
+            or_(
+                func.lower(Course.title).contains(name.lower(), autoescape=True),
+                func.lower(func.coalesce(Course.description, "")).contains(name.lower(), autoescape=True),
+            )
+            for name in skill_names
+        ]
+        tie_break = literal(0)
+
+    relevance = sum((case((match, 1), else_=0) for match in matches), literal(0))
+    rows = db.query(
+        Course.id, Course.title, Course.platform, Course.url, Course.cost_type, relevance.label("relevance")
+    ).filter(
+        Course.is_active == True,
+        or_(*matches)
+    ).order_by(relevance.desc(), tie_break.desc(), Course.id).limit(limit).all()
+
+    return [
+        {
+            "id": row[0],
+            "title": row[1],
+            "platform": row[2],
+            "url": row[3],
+            "cost_type": row[4],
+            "relevance_score": row[5],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,76 @@
+"""
+Skill Aliases
+Normalization and synonym groups for skill names
+
+Skills are admin-defined, so synonyms are kept as groups of normalized
+phrases rather than per skill: a skill whose name normalizes to one phrase
+of a group is also known by every other phrase of that group (a
+"Kubernetes" skill matches "k8s", an "AWS" skill matches "amazon web services").
+"""
+from typing import Dict, FrozenSet, Tuple
+
+from services.opportunity_index import normalize_phrase
+
+# Each tuple is one group of interchangeable phrases, already normalized
+SKILL_SYNONYM_GROUPS: Tuple[Tuple[str, ...], ...] = (
+    ("javascript", "js", "ecmascript"),
+    ("typescript", "ts"),
+    ("python", "py", "python3"),
+    ("node.js", "nodejs", "node"),
+    ("react", "react.js", "reactjs"),
+    ("react native", "reactnative"),
+    ("vue.js", "vue", "vuejs"),
+    ("angular", "angularjs", "angular.js"),
+    ("next.js", "nextjs"),
+    ("c++", "cpp"),
+    ("c#", "csharp", "c sharp"),
+    ("golang", "go"),
+    ("html", "html5"),
+    ("css", "css3"),
+    ("postgresql", "postgres", "psql"),
+    ("mongodb", "mongo"),
+    ("microsoft sql server", "sql server", "mssql"),
+    ("machine learning", "ml"),
+    ("artificial intelligence", "ai"),
+    ("deep learning", "dl"),
+    ("natural language processing", "nlp"),
+    ("large language models", "llm", "llms"),
+    ("scikit learn", "sklearn"),
+    ("kubernetes", "k8s"),
+    ("amazon web services", "aws"),
+    ("google cloud platform", "gcp", "google cloud"),
+    ("microsoft azure", "azure"),
+    ("continuous integration", "ci cd", "ci"),
+    ("rest api", "rest apis", "restful api", "restful apis"),
+    ("object oriented programming", "oop"),
+    ("data structures and algorithms", "dsa"),
+    ("user experience design", "ux design", "ux"),
+    ("user interface design", "ui design", "ui"),
+    ("ui ux design", "ux ui design", "ui ux"),
+    ("search engine optimization", "seo"),
+    ("microsoft excel", "excel", "ms excel"),
+    ("power bi", "powerbi"),
+    ("adobe photoshop", "photoshop"),
+    ("adobe illustrator", "illustrator"),
+)
+
+
+def _build_alias_map() -> Dict[str, FrozenSet[str]]:
+    aliases: Dict[str, FrozenSet[str]] = {}
+    for group in SKILL_SYNONYM_GROUPS:
+        for phrase in group:
+            aliases[phrase] = frozenset(group) - {phrase}
+    return aliases
+
+
+_ALIASES = _build_alias_map()
+
+
+def normalize_skill_name(value) -> str:
+    """Lowercase a skill name and collapse punctuation and whitespace ("Node.js " -> "node.js")"""
+    return normalize_phrase(value)
+
+
+def skill_aliases(name: str) -> FrozenSet[str]:
+    """Other normalized phrases that refer to the skill called `name`"""
+    return _ALIASES.get(normalize_skill_name(name), frozenset())
@@ -0,0 +1,139 @@
+"""
+Skill Array Service
+Normalization and database-side matching for skill id lists
+
+`Job.required_skills`, `Course.related_skills`, `LocalOpportunity.required_skills`
+and `UserResume.skills` hold JSON arrays of skill ids (JSONB with a GIN
+index on Postgres). Writers normalize incoming values with
+`resolve_skill_ids`; readers filter with `has_any_skill` / `has_all_skills`
+instead of loading rows and parsing them in Python.
+"""
+import json
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, distinct, exists, false, func, literal, or_, select, true
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from models import Skill
+
+SkillValues = Union[None, str, Sequence[Union[int, str]]]
+
+
+def split_skill_values(values: SkillValues) -> Tuple[List[int], List[str]]:
+    """
+    Split a skill list into ids and names.
+
+    Accepts a list, a JSON array string or a comma-separated string; numeric
+    strings count as ids. Duplicates are dropped, order is kept.
+
+    Returns:
+        (skill_ids, skill_names)
+    """
+    if values is None:
+        return [], []
+    if isinstance(values, str):
+        try:
+            parsed = json.loads(values)
+            values = parsed if isinstance(parsed, list) else [parsed]
+        except (json.JSONDecodeError, TypeError):
+            values = values.split(",")
+
+    ids, names = [], []
+    for value in values:
+        if isinstance(value, bool) or value is None:
+            continue
+        if isinstance(value, int):
+            ids.append(value)
+            continue
+        value = str(value).strip()
+        if value.isdigit():
+            ids.append(int(value))
+        elif value:
+            names.append(value)
+    return list(dict.fromkeys(ids)), list(dict.fromkeys(names))
+
+
+def resolve_skill_ids(db: Session, values: SkillValues) -> Optional[List[int]]:
+    """
+    Normalize a skill list to ids of existing skills (names match case-insensitively).
+
+    Args:
+        db: Database session
+        values: List, JSON array string or comma-separated string of ids and/or names
+
+    Returns:
+        Skill ids in the given order, or None when `values` is None
+
+    Raises:
+        HTTPException 400: Unknown skill ids or names
+    """
+    if values is None:
+        return None
+    ids, names = split_skill_values(values)
+
+    ids_by_name = {}
+    if names:
+        rows = db.query(Skill.id, Skill.name).filter(func.lower(Skill.name).in_([n.lower() for n in names])).all()
+        ids_by_name = {name.lower(): skill_id for skill_id, name in rows}
+    unknown = [name for name in names if name.lower() not in ids_by_name]
+
+    if ids:
+        known_ids = {row[0] for row in db.query(Skill.id).filter(Skill.id.in_(ids)).all()}
+        unknown = [str(skill_id) for skill_id in ids if skill_id not in known_ids] + unknown
+
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown skills: {', '.join(unknown)}. Skills must be selected from admin-defined skills."
+        )
+    return list(dict.fromkeys(ids + [ids_by_name[name.lower()] for name in names]))
+
+
+def skill_names_by_id(db: Session, skill_id_lists: Iterable[Optional[List[int]]]) -> Dict[int, str]:
+    """Look up the names of every skill referenced by `skill_id_lists` in one query"""
+    skill_ids = {skill_id for skill_ids in skill_id_lists for skill_id in (skill_ids or [])}
+    if not skill_ids:
+        return {}
+    return dict(db.query(Skill.id, Skill.name).filter(Skill.id.in_(skill_ids)).all())
+
+
+# ==================== Query helpers ====================
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _json_each_values(column):
+    return func.json_each(column).table_valued("value").c.value
+
+
+def has_any_skill(db: Session, column, skill_ids: Sequence[int]):
+    """
+    Filter clause: the skill id array `column` contains at least one of `skill_ids`.
+
+    On Postgres this is an OR of `@>` containment checks, which the GIN
+    index answers with a bitmap scan.
+    """
+    skill_ids = list(dict.fromkeys(skill_ids))
+    if not skill_ids:
+        return false()
+    if _is_postgres(db):
+        return or_(*(column.op("@>")(literal([skill_id], JSONB)) for skill_id in skill_ids))
+
+    value = _json_each_values(column)
+    return exists(select(1).where(value.in_(skill_ids)))
+
+
+def has_all_skills(db: Session, column, skill_ids: Sequence[int]):
+    """Filter clause: the skill id array `column` contains every one of `skill_ids`"""
+    skill_ids = list(dict.fromkeys(skill_ids))
+    if not skill_ids:
+        return true()
+    if _is_postgres(db):
+        return column.op("@>")(literal(skill_ids, JSONB))
+
+    value = _json_each_values(column)
+    matched = select(func.count(distinct(value))).where(value.in_(skill_ids)).scalar_subquery()
+    return and_(column.isnot(None), matched == len(skill_ids))
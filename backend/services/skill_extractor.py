@@ -0,0 +1,202 @@
+"""
+Skill Extractor
+Finds mentions of catalog skills in free text (CV text, experience and project descriptions)
+
+Every skill name and alias (see skill_aliases) is compiled once into an
+Aho-Corasick automaton over words. Text is split into words with the same
+normalization as skill names ("Node.js" stays one word, "UI/UX" becomes
+"ui ux"), and the automaton walks the words in a single pass, so scanning
+costs the same however many skills the catalog has. Overlapping mentions
+resolve to the leftmost, longest one ("Machine Learning", not "Learning").
+
+Names and aliases of at most two characters ("Go", "AI", "R") are common
+words or initials, so they only count when written as in the skill name or
+in capitals ("Go" or "GO" for the Go skill, "AI" for the "ai" alias).
+"""
+import re
+import threading
+from collections import deque
+from itertools import accumulate
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from services.skill_aliases import normalize_skill_name, skill_aliases
+from services.skill_index import SkillIndex, get_skill_index
+
+# A word: token characters with dots only inside ("node.js", "c++", "3.10").
+# Captured, so re.split returns separators and words alternately
+_WORD = re.compile(r"([a-z0-9+#]+(?:\.[a-z0-9+#]+)*)")
+
+# Patterns this short must match one of their accepted spellings
+SHORT_PATTERN_CHARS = 2
+
+
+def _lowercase(text: str) -> str:
+    """text.lower() with the same length as `text`, so offsets stay valid"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters lowercase to two ("İ" -> "i̇"); blank them out
+    return "".join(char if len(char) == 1 else " " for char in (c.lower() for c in text))
+
+
+def tokenize(text: str) -> Tuple[List[str], List[int]]:
+    """
+    Normalized words of `text` and their offsets: word i spans
+    offsets[2 * i]..offsets[2 * i + 1] in `text`
+    """
+    parts = _WORD.split(_lowercase(text))
+    # Cumulative part lengths: each separator ends where the next word starts
+    return parts[1::2], list(accumulate(map(len, parts)))
+
+
+class SkillExtractor:
+    """Immutable word-level Aho-Corasick automaton over skill names and aliases"""
+
+    def __init__(self, skills: Iterable):
+        """
+        Args:
+            skills: Objects or dicts with id and name (models, rows or SkillIndex.skills)
+        """
+        self._names: Dict[int, str] = {}
+        # Pattern words -> (skill id, accepted spellings or None)
+        patterns: Dict[Tuple[str, ...], Tuple[int, Optional[FrozenSet[str]]]] = {}
+        aliases = []
+
+        for skill in skills:
+            skill_id, name = (skill["id"], skill["name"]) if isinstance(skill, dict) else (skill.id, skill.name)
+            normalized = normalize_skill_name(name or "")
+            if not normalized:
+                continue
+            self._names[skill_id] = name
+            # Names win over aliases of another skill
+            patterns[tuple(normalized.split())] = (skill_id, self._spellings(normalized, name))
+            aliases.extend((alias, skill_id) for alias in sorted(skill_aliases(normalized)))
+
+        for alias, skill_id in aliases:
+            patterns.setdefault(tuple(alias.split()), (skill_id, self._spellings(alias, None)))
+
+        self._build(patterns)
+
+    @staticmethod
+    def _spellings(pattern: str, name: Optional[str]) -> Optional[FrozenSet[str]]:
+        if len(pattern) > SHORT_PATTERN_CHARS:
+            return None
+        spellings = {pattern.upper()}
+        if name:
+            spellings.add(name.strip())
+        return frozenset(spellings)
+
+    def _build(self, patterns: Dict[Tuple[str, ...], Tuple[int, Optional[FrozenSet[str]]]]):
+        # State 0 is the root; outputs are (pattern length in words, skill id, spellings)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int, Optional[FrozenSet[str]]]]] = [[]]
+
+        for words, (skill_id, spellings) in patterns.items():
+            state = 0
+            for word in words:
+                next_state = self._goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][word] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append((len(words), skill_id, spellings))
+
+        # Breadth-first: failure links point to the longest proper suffix that is a prefix of a pattern
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    @property
+    def size(self) -> int:
+        """Number of indexed skills"""
+        return len(self._names)
+
+    def extract(self, fields: Dict[str, Optional[str]]) -> List[Dict]:
+        """
+        Find skill mentions in one or more texts (one linear pass over each)
+
+        Args:
+            fields: Text per field name, e.g. {"raw_cv_text": ..., "projects.0.description": ...}
+                (None and empty values are skipped)
+
+        Returns:
+            [{"skill_id", "name", "count", "mentions": [{"field", "start", "end"}]}],
+            most mentioned first; offsets index into the field's text
+        """
+        mentions: Dict[int, List[Dict]] = {}
+        for field, text in fields.items():
+            if text:
+                self._scan(field, text, mentions)
+
+        found = [
+            {"skill_id": skill_id, "name": self._names[skill_id], "count": len(found_mentions), "mentions": found_mentions}
+            for skill_id, found_mentions in mentions.items()
+        ]
+        found.sort(key=lambda item: -item["count"])
+        return found
+
+    def _scan(self, field: str, text: str, mentions: Dict[int, List[Dict]]):
+        """Add the mentions in one text to `mentions` (skill id -> mentions)"""
+        words, offsets = tokenize(text)
+        goto, fail, out = self._goto, self._fail, self._out
+
+        candidates = []
+        state = 0
+        for position, word in enumerate(words):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if out[state]:
+                for length, skill_id, spellings in out[state]:
+                    candidates.append((position - length + 1, position, skill_id, spellings))
+
+        # Leftmost-longest, non-overlapping
+        candidates.sort(key=lambda candidate: (candidate[0], candidate[0] - candidate[1]))
+        next_free = 0
+        for first, last, skill_id, spellings in candidates:
+            if first < next_free:
+                continue
+            start, end = offsets[2 * first], offsets[2 * last + 1]
+            if spellings is not None and text[start:end] not in spellings:
+                continue
+            mentions.setdefault(skill_id, []).append({"field": field, "start": start, "end": end})
+            next_free = last + 1
+
+    def extract_text(self, text: Optional[str]) -> List[Dict]:
+        """extract() for a single text; mentions are tagged with the field "text\""""
+        return self.extract({"text": text})
+
+
+_extractor: Optional[SkillExtractor] = None
+_extractor_index: Optional[SkillIndex] = None
+_extractor_lock = threading.Lock()
+
+
+def get_skill_extractor(db: Optional[Session] = None) -> SkillExtractor:
+    """
+    Get an extractor over the same active skills as the shared skill index;
+    it is recompiled whenever that index is rebuilt
+    """
+    global _extractor, _extractor_index
+    index = get_skill_index(db)
+    with _extractor_lock:
+        if _extractor_index is index:
+            return _extractor
+    extractor = SkillExtractor(index.skills)
+    with _extractor_lock:
+        _extractor, _extractor_index = extractor, index
+    return extractor
@@ -0,0 +1,199 @@
+"""
+Skill Index
+In-memory prefix index for skill autocomplete
+
+Every active skill is indexed under its normalized name, each later word of
+its name ("learning" for "Machine Learning") and its aliases (see
+skill_aliases). The keys are kept in one sorted array, so a typeahead query
+is a binary search for the prefix followed by a scan of the matching run,
+without touching the database. Short prefixes match long runs ("d" matches
+every "data ..." skill), so prefixes with more than HOT_PREFIX_ENTRIES
+entries get their ranked results computed once, when the index is built.
+"""
+import heapq
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import Skill
+from services.skill_aliases import normalize_skill_name, skill_aliases
+
+# Rebuild the shared index at least this often so skills created by other
+# workers show up (local changes invalidate it immediately)
+SKILL_INDEX_TTL = float(os.getenv("SKILL_INDEX_TTL_SECONDS", "300"))
+
+# Match kinds, best first; results are ranked by kind, then by shorter name
+EXACT_MATCH = 0
+NAME_PREFIX = 1
+ALIAS_PREFIX = 2
+WORD_PREFIX = 3
+
+# Prefixes matching more index entries than this have their results precomputed
+HOT_PREFIX_ENTRIES = 64
+# Results precomputed per hot prefix (and the most the endpoint returns)
+MAX_RESULTS = 50
+
+# Sorts after every character, so keys starting with P are < P + _KEY_END
+_KEY_END = "\U0010ffff"
+
+
+class SkillIndex:
+    """Immutable sorted prefix array over skill names, name words and aliases"""
+
+    def __init__(self, skills: Iterable):
+        """
+        Args:
+            skills: Objects with id, name, slug and category attributes (models or rows)
+        """
+        self._skills: Dict[int, Dict] = {}
+        self._exact: Dict[str, int] = {}
+        entries: List[Tuple[str, int, int, Optional[str]]] = []
+
+        for skill in skills:
+            name = normalize_skill_name(skill.name or "")
+            if not name:
+                continue
+            self._skills[skill.id] = {
+                "id": skill.id, "name": skill.name, "slug": skill.slug, "category": skill.category
+            }
+            entries.append((name, NAME_PREFIX, skill.id, None))
+            words = name.split()
+            for i in range(1, len(words)):
+                entries.append((" ".join(words[i:]), WORD_PREFIX, skill.id, None))
+            for alias in skill_aliases(name):
+                entries.append((alias, ALIAS_PREFIX, skill.id, alias))
+
+        entries.sort()
+        self._keys = [entry[0] for entry in entries]
+        self._entries = entries
+        self._order = {
+            skill_id: (len(skill["name"]), skill["name"].lower()) for skill_id, skill in self._skills.items()
+        }
+
+        # Exact lookups: names win over aliases of another skill
+        for key, kind, skill_id, _ in entries:
+            if kind != WORD_PREFIX and (key not in self._exact or kind == NAME_PREFIX):
+                self._exact[key] = skill_id
+
+        self._hot: Dict[str, List[Tuple[int, Optional[str]]]] = {}
+        self._precompute_hot_prefixes()
+
+    def _precompute_hot_prefixes(self):
+        """Rank the results of every prefix whose run has more than HOT_PREFIX_ENTRIES entries"""
+        # Ranges of entries sharing their first `depth` characters, split one character deeper
+        stack = [(0, len(self._keys), 0)]
+        while stack:
+            lo, hi, depth = stack.pop()
+            i = lo
+            while i < hi:
+                key = self._keys[i]
+                if len(key) <= depth:
+                    i += 1
+                    continue
+                prefix = key[:depth + 1]
+                end = bisect_left(self._keys, prefix + _KEY_END, i, hi)
+                if end - i > HOT_PREFIX_ENTRIES:
+                    self._hot[prefix] = self._rank(prefix, i, end, MAX_RESULTS)
+                    stack.append((i, end, depth + 1))
+                i = end
+
+    def _rank(self, prefix: str, lo: int, hi: int, limit: int) -> List[Tuple[int, Optional[str]]]:
+        """Best `limit` skills among entries lo..hi (all starting with `prefix`) as (skill id, alias)"""
+        best: Dict[int, Tuple[int, Optional[str]]] = {}
+        for key, kind, skill_id, alias in self._entries[lo:hi]:
+            if key == prefix and kind != WORD_PREFIX:
+                kind = EXACT_MATCH
+            if skill_id not in best or kind < best[skill_id][0]:
+                best[skill_id] = (kind, alias)
+
+        ranked = heapq.nsmallest(limit, best.items(), key=lambda item: (item[1][0], self._order[item[0]]))
+        return [(skill_id, alias) for skill_id, (_, alias) in ranked]
+
+    @property
+    def size(self) -> int:
+        """Number of indexed (active) skills"""
+        return len(self._skills)
+
+    @property
+    def skills(self) -> List[Dict]:
+        """Indexed skills as {"id", "name", "slug", "category"}"""
+        return list(self._skills.values())
+
+    def find(self, name: str) -> Optional[int]:
+        """Id of the skill whose name or alias is exactly `name` (case and punctuation insensitive)"""
+        return self._exact.get(normalize_skill_name(name))
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Skills matching a typed prefix, best first.
+
+        Exact name/alias matches rank first, then name prefixes, alias
+        prefixes and matches on a later word of the name; ties go to the
+        shorter name.
+
+        Returns:
+            [{"id", "name", "slug", "category", "matched_alias"}], where
+            matched_alias is the alias that matched (None for name matches)
+        """
+        prefix = normalize_skill_name(query)
+        if not prefix or limit <= 0:
+            return []
+
+        ranked = self._hot.get(prefix) if limit <= MAX_RESULTS else None
+        if ranked is None:
+            lo = bisect_left(self._keys, prefix)
+            ranked = self._rank(prefix, lo, bisect_left(self._keys, prefix + _KEY_END, lo), limit)
+        return [{**self._skills[skill_id], "matched_alias": alias} for skill_id, alias in ranked[:limit]]
+
+
+_index: Optional[SkillIndex] = None
+_built_at = 0.0
+_generation = 0
+_index_lock = threading.Lock()
+
+
+def build_skill_index(db: Optional[Session] = None) -> SkillIndex:
+    """Build an index from the active skills (loads only indexed columns)"""
+    session = db or SessionLocal()
+    try:
+        rows = session.query(Skill.id, Skill.name, Skill.slug, Skill.category).filter(Skill.is_active == True).all()
+    finally:
+        if db is None:
+            session.close()
+    return SkillIndex(rows)
+
+
+def get_skill_index(db: Optional[Session] = None) -> SkillIndex:
+    """
+    Get the shared index, rebuilding it if it was invalidated or is older
+    than SKILL_INDEX_TTL_SECONDS.
+
+    Args:
+        db: Session to rebuild with (default: a short-lived session of its own)
+    """
+    global _index, _built_at
+    with _index_lock:
+        if _index is not None and time.monotonic() - _built_at < SKILL_INDEX_TTL:
+            return _index
+        generation = _generation
+
+    index = build_skill_index(db)
+    with _index_lock:
+        # Don't publish an index that was invalidated while it was being built
+        if generation == _generation:
+            _index = index
+            _built_at = time.monotonic()
+    return index
+
+
+def invalidate_skill_index():
+    """Drop the shared index; call after committing created or deleted skills"""
+    global _index, _generation
+    with _index_lock:
+        _index = None
+        _generation += 1
@@ -0,0 +1,171 @@
+"""
+Skill Matcher
+Maps free-form skill strings (from CVs, LLM output or user input) to skill ids
+
+Each skill is indexed under its normalized name and aliases (see
+skill_aliases), and every such phrase under its character trigrams. A
+string matches exactly when its normalized form is a name or alias, or
+when the two agree after removing spaces ("My SQL" -> "MySQL") or filler
+words ("Python programming" -> "Python", "android" -> "Android Development").
+Otherwise candidates are the phrases sharing trigrams with it, scored by
+trigram similarity (shared / total distinct trigrams, as in pg_trgm).
+"""
+import os
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from services.skill_aliases import normalize_skill_name, skill_aliases
+from services.skill_index import SkillIndex, get_skill_index
+
+# Lowest confidence accepted by match_skills_to_database
+SKILL_MATCH_MIN_CONFIDENCE = float(os.getenv("SKILL_MATCH_MIN_CONFIDENCE", "0.6"))
+
+# Confidence of an exact match after removing spaces / filler words
+COMPACT_MATCH_CONFIDENCE = 0.95
+FILLER_MATCH_CONFIDENCE = 0.9
+
+# Words that qualify a skill without changing which skill it is
+FILLER_WORDS = frozenset({
+    "programming", "language", "languages", "framework", "frameworks", "library", "libraries", "basics", "basic",
+    "fundamentals", "advanced", "intermediate", "beginner", "proficient", "proficiency",
+    "skills", "skill", "knowledge", "experience", "development", "developer",
+})
+
+
+def trigrams(phrase: str) -> FrozenSet[str]:
+    """Character trigrams of each word, padded like pg_trgm ("go" -> "  g", " go", "go ")"""
+    grams = set()
+    for word in phrase.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _strip_fillers(phrase: str) -> str:
+    words = [word for word in phrase.split() if word not in FILLER_WORDS]
+    return " ".join(words)
+
+
+def _compact(phrase: str) -> str:
+    return phrase.replace(" ", "")
+
+
+class SkillMatcher:
+    """Immutable exact + trigram index over skill names and aliases"""
+
+    def __init__(self, skills: Iterable):
+        """
+        Args:
+            skills: Objects or dicts with id and name (models, rows or SkillIndex.skills)
+        """
+        self._names: Dict[int, str] = {}
+        self._exact: Dict[str, int] = {}
+        self._compact: Dict[str, int] = {}
+        self._stripped: Dict[str, int] = {}
+        self._phrases: List[str] = []
+        self._phrase_skill: List[int] = []
+        self._phrase_grams: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+
+        for skill in skills:
+            skill_id, name = (skill["id"], skill["name"]) if isinstance(skill, dict) else (skill.id, skill.name)
+            normalized = normalize_skill_name(name or "")
+            if not normalized:
+                continue
+            self._names[skill_id] = name
+            # Names win over aliases of another skill
+            self._exact[normalized] = skill_id
+            for phrase in (normalized, *sorted(skill_aliases(normalized))):
+                self._add_phrase(phrase, skill_id)
+
+        for phrase, skill_id in zip(self._phrases, self._phrase_skill):
+            self._exact.setdefault(phrase, skill_id)
+            self._compact.setdefault(_compact(phrase), skill_id)
+            stripped = _strip_fillers(phrase)
+            if stripped:
+                self._stripped.setdefault(stripped, skill_id)
+
+    def _add_phrase(self, phrase: str, skill_id: int):
+        grams = trigrams(phrase)
+        position = len(self._phrases)
+        self._phrases.append(phrase)
+        self._phrase_skill.append(skill_id)
+        self._phrase_grams.append(len(grams))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(position)
+
+    @property
+    def size(self) -> int:
+        """Number of indexed skills"""
+        return len(self._names)
+
+    def match(self, value: str) -> Optional[Dict]:
+        """
+        Best skill for one free-form string
+
+        Returns:
+            {"query", "skill_id", "name", "confidence"} (confidence in 0..1,
+            1.0 for an exact name or alias), or None when nothing shares a trigram
+        """
+        normalized = normalize_skill_name(value or "")
+        if not normalized:
+            return None
+
+        stripped = _strip_fillers(normalized)
+        for skill_id, confidence in (
+            (self._exact.get(normalized), 1.0),
+            (self._compact.get(_compact(normalized)), COMPACT_MATCH_CONFIDENCE),
+            (self._stripped.get(stripped), FILLER_MATCH_CONFIDENCE),
+        ):
+            if skill_id is not None:
+                break
+        else:
+            # Only filler words ("programming") never match fuzzily
+            skill_id, confidence = self._fuzzy(stripped) if stripped else (None, 0.0)
+        if skill_id is None:
+            return None
+        return {"query": value, "skill_id": skill_id, "name": self._names[skill_id], "confidence": round(confidence, 3)}
+
+    def match_many(self, values: Sequence[str]) -> List[Optional[Dict]]:
+        """Match a batch of strings (one result per input, in order); repeated strings are scored once"""
+        results: Dict[str, Optional[Dict]] = {}
+        for value in values:
+            if value not in results:
+                results[value] = self.match(value)
+        return [results[value] for value in values]
+
+    def _fuzzy(self, phrase: str):
+        grams = trigrams(phrase)
+        shared = Counter(position for gram in grams for position in self._postings.get(gram, ()))
+        best_id, best_score = None, 0.0
+        for position, count in shared.items():
+            score = count / (len(grams) + self._phrase_grams[position] - count)
+            skill_id = self._phrase_skill[position]
+            # Ties go to the lower skill id so results are deterministic
+            if score > best_score or (score == best_score and best_id is not None and skill_id < best_id):
+                best_id, best_score = skill_id, score
+        return best_id, best_score
+
+
+_matcher: Optional[SkillMatcher] = None
+_matcher_index: Optional[SkillIndex] = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher(db: Optional[Session] = None) -> SkillMatcher:
+    """
+    Get a matcher over the same active skills as the shared skill index; it
+    is rebuilt whenever that index is (see skill_index.invalidate_skill_index)
+    """
+    global _matcher, _matcher_index
+    index = get_skill_index(db)
+    with _matcher_lock:
+        if _matcher_index is index:
+            return _matcher
+    matcher = SkillMatcher(index.skills)
+    with _matcher_lock:
+        _matcher, _matcher_index = matcher, index
+    return matcher
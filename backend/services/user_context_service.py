@@ -0,0 +1,149 @@
+"""
+User Context Service
+Versioned, cached snapshot of the profile data every AI feature needs
+
+CareerBot, roadmaps, opportunity recommendations and the CV assistant all
+need the user's profile, skills and parsed CV. The snapshot is built with a
+single joined query and cached in-process keyed by (user_id, context_version).
+Any code that changes profile, skills or CV calls `bump_context_version` in
+the same transaction, which makes every worker rebuild on next use.
+"""
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import User, Skill, UserResume, user_skills
+
+# Maximum number of users whose snapshot is kept in memory
+USER_CONTEXT_CACHE_SIZE = int(os.getenv("USER_CONTEXT_CACHE_SIZE", "1024"))
+
+_cache: "OrderedDict[int, tuple]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def bump_context_version(db: Session, user_id: int):
+    """
+    Invalidate a user's cached context snapshot.
+
+    Must be called inside the transaction that changes the user's profile,
+    skills or CV; the caller commits.
+
+    Args:
+        db: Database session
+        user_id: User ID
+    """
+    db.query(User).filter(User.id == user_id).update(
+        {User.context_version: func.coalesce(User.context_version, 0) + 1},
+        synchronize_session=False
+    )
+
+
+def _load_json_list(value: Optional[str]) -> List:
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+        return parsed if isinstance(parsed, list) else []
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+def _build_snapshot(db: Session, user: User) -> Dict:
+    """Load skills and CV with one joined query and parse everything once"""
+    rows = db.query(Skill.id, Skill.name, UserResume).select_from(User).outerjoin(
+        user_skills, user_skills.c.user_id == User.id
+    ).outerjoin(
+        Skill, Skill.id == user_skills.c.skill_id
+    ).outerjoin(
+        UserResume, UserResume.user_id == User.id
+    ).filter(User.id == user.id).all()
+
+    skills = []
+    seen_skill_ids = set()
+    resume = None
+    for skill_id, skill_name, row_resume in rows:
+        resume = resume or row_resume
+        if skill_id is not None and skill_id not in seen_skill_ids:
+            seen_skill_ids.add(skill_id)
+            skills.append({"id": skill_id, "name": skill_name})
+
+    cv = None
+    cv_skills = []
+    if resume is not None:
+        cv = {
+            "personal_summary": resume.personal_summary or "",
+            "experiences": _load_json_list(resume.experiences),
+            "education": _load_json_list(resume.education),
+            "skills": resume.skills or [],
+            "tools": _load_json_list(resume.tools),
+            "projects": _load_json_list(resume.projects),
+            "raw_cv_text": resume.raw_cv_text or "",
+        }
+        # CV skills are normally also profile skills; only look up the rest
+        names_by_id = {skill["id"]: skill["name"] for skill in skills}
+        missing_ids = [skill_id for skill_id in cv["skills"] if skill_id not in names_by_id]
+        if missing_ids:
+            for skill_id, skill_name in db.query(Skill.id, Skill.name).filter(Skill.id.in_(missing_ids)).all():
+                names_by_id[skill_id] = skill_name
+        cv_skills = [
+            {"id": skill_id, "name": names_by_id[skill_id]}
+            for skill_id in cv["skills"] if skill_id in names_by_id
+        ]
+
+    profile = {
+        "name": user.full_name or "",
+        "full_name": user.full_name or "",
+        "bio": user.bio or "",
+        "education_level": getattr(user, "education_level", None) or "",
+        "experience_level": getattr(user, "experience_level", None) or "",
+        "preferred_career_track": getattr(user, "preferred_career_track", None) or "",
+        "career_interests": _load_json_list(user.career_interests),
+        "experience_description": user.experience_description or "",
+    }
+
+    return {
+        "user_id": user.id,
+        "version": user.context_version or 0,
+        "profile": profile,
+        "skills": skills,
+        "cv": cv,
+        "cv_skills": cv_skills,
+    }
+
+
+def get_user_context(db: Session, user: User) -> Dict:
+    """
+    Get the context snapshot for an already-loaded user.
+
+    Args:
+        db: Database session
+        user: User model object (e.g. from get_current_user)
+
+    Returns:
+        Dictionary with keys: user_id, version, profile, skills
+        (list of {"id", "name"}), cv (parsed dict or None) and cv_skills.
+        The result is a private copy and may be modified by the caller.
+    """
+    version = user.context_version or 0
+
+    with _cache_lock:
+        cached = _cache.get(user.id)
+        if cached and cached[0] == version:
+            _cache.move_to_end(user.id)
+            return copy.deepcopy(cached[1])
+
+    snapshot = _build_snapshot(db, user)
+
+    with _cache_lock:
+        _cache[user.id] = (version, snapshot)
+        _cache.move_to_end(user.id)
+        while len(_cache) > USER_CONTEXT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return copy.deepcopy(snapshot)
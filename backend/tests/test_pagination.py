@@ -0,0 +1,68 @@
+"""
+Keyset pagination helpers (pagination.py), on an in-memory SQLite table
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+from pagination import paginate
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    start = datetime(2026, 1, 1)
+    with Session(engine) as session:
+        # Pairs of rows share a created_at, so the id has to break ties
+        session.add_all(Item(id=i, created_at=start + timedelta(minutes=i // 2)) for i in range(1, 8))
+        session.commit()
+        yield session
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_limit_below_one_is_rejected(db, limit):
+    with pytest.raises(HTTPException) as error:
+        paginate(db.query(Item), (Item.id,), limit=limit)
+    assert error.value.status_code == 400
+
+
+def test_cursor_round_trip(db):
+    query = db.query(Item)
+    sort = (Item.created_at, Item.id)
+
+    pages, cursor = [], None
+    while True:
+        rows, cursor = paginate(query, sort, cursor, limit=3, descending=True)
+        pages.append([row.id for row in rows])
+        if cursor is None:
+            break
+
+    assert pages == [[7, 6, 5], [4, 3, 2], [1]]
+
+
+def test_skip_is_ignored_with_a_cursor(db):
+    rows, cursor = paginate(db.query(Item), (Item.id,), limit=2, skip=1)
+    assert [row.id for row in rows] == [2, 3]
+
+    rows, _ = paginate(db.query(Item), (Item.id,), cursor, limit=2, skip=1)
+    assert [row.id for row in rows] == [4, 5]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "WzFd", "eyJhIjoxfQ"])
+def test_malformed_cursor_is_rejected(db, cursor):
+    # "WzFd" is [1]: valid, but one value short for a (created_at, id) key
+    with pytest.raises(HTTPException) as error:
+        paginate(db.query(Item), (Item.created_at, Item.id), cursor, limit=3)
+    assert error.value.status_code == 400
@@ -0,0 +1,63 @@
+"""
+Hot queries must use the indexes created by the Alembic migrations
+(see benchmarks/query_plans.py).
+
+Runs on a scratch SQLite file, or on the database in QUERY_PLANS_DATABASE_URL
+(all of its tables are dropped first). Only Postgres has the partial and GIN
+indexes and runs the full-text and skill-array queries.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from benchmarks import fixtures
+
+DATABASE_URL = os.getenv("QUERY_PLANS_DATABASE_URL") or (
+    f"sqlite:///{Path(tempfile.mkdtemp(prefix='skillsync_plans_')) / 'query_plans.db'}"
+)
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    # The engine is created from DATABASE_URL when `database` is first imported
+    fixtures.configure_environment(DATABASE_URL)
+    fixtures.reset_database(DATABASE_URL)
+
+    from benchmarks.query_plans import migrate_database
+    from database import SessionLocal
+
+    migrate_database()
+    accounts = fixtures.seed(20)
+    db = SessionLocal()
+    try:
+        yield db, accounts
+    finally:
+        db.rollback()
+        db.close()
+
+
+def test_hot_queries_use_migrated_indexes(seeded):
+    from benchmarks.query_plans import check_plans, format_report
+
+    db, accounts = seeded
+    report = check_plans(db, accounts)
+    db.rollback()
+
+    failures = [entry["query"] for entry in report if not entry["ok"]]
+    assert not failures, f"Sequential scan, sort or unexpected index in: {', '.join(failures)}\n" + format_report(
+        report, verbose=True
+    )
+
+
+def test_user_skills_rejects_duplicates(seeded):
+    from sqlalchemy.exc import IntegrityError
+    from models import user_skills
+
+    db, accounts = seeded
+    skill_id = db.query(user_skills.c.skill_id).filter(user_skills.c.user_id == accounts[0]["id"]).first()[0]
+    with pytest.raises(IntegrityError):
+        db.execute(user_skills.insert().values(user_id=accounts[0]["id"], skill_id=skill_id))
+        db.flush()
+    db.rollback()
@@ -7,7 +7,11 @@ from fastapi import HTTPException, status
 from datetime import datetime
 from models import User, UserRole, ExperienceLevel
 from schemas import UserRegister, UserUpdate, UserProfile
-from auth import verify_password, get_password_hash, create_access_token
+from auth import create_access_token
+from database import reacquire_connection
+from services.dashboard_stats_service import record_user_created
+from services.password_hash_service import password_hasher
+from services.user_context_service import bump_context_version
 import json
 
 
@@ -15,7 +19,7 @@ class UserService:
     """User management service"""
     
     @staticmethod
-    def register_user(db: Session, user_data: UserRegister) -> User:
+    async def register_user(db: Session, user_data: UserRegister) -> User:
         """
         Register a new user
         
@@ -27,8 +31,15 @@ class UserService:
             Created user object
         
         Raises:
-            HTTPException: If email already exists or validation fails
+            HTTPException: If email already exists or validation fails,
+                or 503 when the password hasher is saturated
         """
+        # Hash first, without holding a pooled connection; the uniqueness checks
+        # and the insert then run back to back
+        db.close()
+        hashed_password = await password_hasher.hash(user_data.password)
+        await reacquire_connection(db)
+        
         # Check if email already exists
         existing_user = db.query(User).filter(User.email == user_data.email).first()
         if existing_user:
@@ -50,8 +61,6 @@ class UserService:
             username = f"{username}{counter}"
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
-        
         new_user = User(
             email=user_data.email,
             username=username,
@@ -64,13 +73,14 @@ class UserService:
         )
         
         db.add(new_user)
+        record_user_created(db)
         db.commit()
         db.refresh(new_user)
         
         return new_user
     
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> User:
+    async def authenticate_user(db: Session, email: str, password: str) -> User:
         """
         Authenticate a user by email and password
         
@@ -83,7 +93,8 @@ class UserService:
             User object if authenticated
         
         Raises:
-            HTTPException: If credentials are invalid
+            HTTPException: If credentials are invalid, or 503 when the
+                password hasher is saturated
         """
         # Find user by email
         user = db.query(User).filter(User.email == email).first()
@@ -94,8 +105,10 @@ class UserService:
                 detail="Invalid email or password"
             )
         
-        # Verify password
-        if not verify_password(password, user.hashed_password):
+        # Verify password with the pooled connection released (user stays loaded, detached)
+        db.close()
+        verified, new_hash = await password_hasher.verify(password, user.hashed_password)
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
@@ -108,6 +121,13 @@ class UserService:
                 detail="Account is inactive"
             )
         
+        await reacquire_connection(db)
+        db.add(user)
+        
+        # Upgrade hashes made with outdated cost parameters
+        if new_hash:
+            user.hashed_password = new_hash
+        
         # Update last login
         user.last_login = datetime.utcnow()
         db.commit()
@@ -164,6 +184,7 @@ class UserService:
                 setattr(user, field, value)
         
         user.updated_at = datetime.utcnow()
+        bump_context_version(db, user_id)
         db.commit()
         db.refresh(user)
         
@@ -197,6 +218,7 @@ class UserService:
             skills.append(skill)
             user.skills = json.dumps(skills)
             user.updated_at = datetime.utcnow()
+            bump_context_version(db, user_id)
             db.commit()
             db.refresh(user)
         
@@ -229,6 +251,7 @@ class UserService:
         skills = [s for s in skills if s.lower() != skill.lower()]
         user.skills = json.dumps(skills) if skills else None
         user.updated_at = datetime.utcnow()
+        bump_context_version(db, user_id)
         db.commit()
         db.refresh(user)
         
@@ -272,6 +295,7 @@ class UserService:
         user = UserService.get_user_profile(db, user_id)
         user.cv_text = cv_text
         user.updated_at = datetime.utcnow()
+        bump_context_version(db, user_id)
         db.commit()
         db.refresh(user)
         return user
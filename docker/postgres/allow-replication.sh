@@ -0,0 +1,7 @@
+#!/bin/bash
+# Let the db-replica service (docker compose --profile replica) stream WAL from
+# the primary. Init scripts only run when the data volume is created; for an
+# existing volume run this once with `docker compose exec db bash /docker-entrypoint-initdb.d/10-allow-replication.sh`
+set -e
+grep -q "^host replication" "$PGDATA/pg_hba.conf" || echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" -c "SELECT pg_reload_conf()"
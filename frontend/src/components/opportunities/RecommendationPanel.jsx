@@ -25,7 +25,7 @@ const RecommendationPanel = ({
         {!recommendations && (
           <button
             className="recommendation-btn-get"
-            onClick={onGetRecommendations}
+            onClick={() => onGetRecommendations()}
             disabled={loading}
           >
             {loading ? (
@@ -94,9 +94,19 @@ const RecommendationPanel = ({
                 />
               </svg>
             </button>
+            {recommendations.generated_at && (
+              <span className="recommendation-generated-at">
+                Generated{" "}
+                {new Date(
+                  recommendations.generated_at.endsWith("Z")
+                    ? recommendations.generated_at
+                    : `${recommendations.generated_at}Z`
+                ).toLocaleString()}
+              </span>
+            )}
             <button
               className="recommendation-btn-refresh"
-              onClick={onGetRecommendations}
+              onClick={() => onGetRecommendations(true)}
               disabled={loading}
             >
               <svg width="16" height="16" viewBox="0 0 24 24" fill="none">
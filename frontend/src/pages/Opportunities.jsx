@@ -67,11 +67,11 @@ const Opportunities = () => {
     }
   };
 
-  const handleGetRecommendations = async () => {
+  const handleGetRecommendations = async (refresh = false) => {
     try {
       setLoadingRecommendations(true);
       setRecommendationError(null);
-      const data = await opportunityAPI.getRecommendations();
+      const data = await opportunityAPI.getRecommendations(refresh);
       setRecommendations(data);
 
       // Also update opportunities list with recommended ones
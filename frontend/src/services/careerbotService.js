@@ -21,14 +21,24 @@ const careerbotAPI = {
   /**
    * Get conversation history for a specific session
    * Returns messages in chronological order (oldest first)
+   * The endpoint is cursor-paginated (newest page first); older pages are
+   * followed through the X-Before-Cursor header until the start of the chat.
    * @param {number} sessionId - Session ID
    * @returns {Promise<Array>} - Array of message objects with role, message, language, timestamp
    */
   getHistory: async (sessionId) => {
-    const response = await api.get(
-      `/careerbot/history?session_id=${sessionId}`
-    );
-    return response.data;
+    let messages = [];
+    let before = null;
+    do {
+      const params = { session_id: sessionId, limit: 200 };
+      if (before) {
+        params.before = before;
+      }
+      const response = await api.get("/careerbot/history", { params });
+      messages = [...response.data, ...messages];
+      before = response.headers["x-before-cursor"] || null;
+    } while (before);
+    return messages;
   },
 
   /**
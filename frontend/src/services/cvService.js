@@ -14,6 +14,15 @@ const cvAPI = {
     return response.data;
   },
 
+  /**
+   * Get skills mentioned in current user's CV text, experience and projects
+   * @returns {Promise<Array>} [{skill_id, name, count, mentions, in_resume}], most mentioned first
+   */
+  getDetectedSkills: async () => {
+    const response = await api.get("/cv/me/detected-skills");
+    return response.data;
+  },
+
   /**
    * Create or update current user's CV/resume
    * @param {Object} cvData - CV data object
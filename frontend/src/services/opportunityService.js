@@ -4,10 +4,13 @@ import api from "./api";
 const opportunityAPI = {
   /**
    * Get personalized opportunity recommendations
-   * @returns {Promise} Response with explanation and opportunities
+   * @param {boolean} refresh - Regenerate the explanation instead of using the cached one
+   * @returns {Promise} Response with explanation, opportunities and generated_at
    */
-  getRecommendations: async () => {
-    const response = await api.get("/opportunities/recommend");
+  getRecommendations: async (refresh = false) => {
+    const response = await api.get("/opportunities/recommend", {
+      params: refresh ? { refresh: true } : {},
+    });
     return response.data;
   },
 
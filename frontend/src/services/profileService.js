@@ -48,6 +48,14 @@ const profileAPI = {
     return response.data;
   },
 
+  // Typeahead over skill names and aliases, best matches first
+  searchSkills: async (query, limit = 10) => {
+    const response = await api.get("/skills/autocomplete", {
+      params: { q: query, limit },
+    });
+    return response.data;
+  },
+
   // Career interests endpoints
   getCareerInterests: async () => {
     const response = await api.get("/users/me/career-interests");